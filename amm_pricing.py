@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Constant-product AMM pricing for the Flash Arbitrage Engine
+Pool state for Raydium/Orca style pools, the closed-form optimal input for
+two-pool round trips and curve-derived depth for mixed AMM/order-book legs
+"""
+
+from dataclasses import dataclass
+from typing import Tuple
+
+import numpy as np
+
+from order_book import PRICE, SIZE
+
+@dataclass
+class PoolState:
+    """Reserves and fee tier of an x*y=k pool (base/quote)"""
+    reserve_base: float
+    reserve_quote: float
+    fee: float
+
+    @property
+    def mid_price(self) -> float:
+        return self.reserve_quote / self.reserve_base
+
+def optimal_round_trip(buy_base: np.ndarray, buy_quote: np.ndarray, buy_fee: np.ndarray,
+                       sell_base: np.ndarray, sell_quote: np.ndarray, sell_fee: np.ndarray,
+                       max_base: float = np.inf,
+                       cost_per_unit: float = 0.0) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Profit-maximizing quote input for buy-in-pool-A, sell-in-pool-B, vectorized
+
+    With g = 1 - fee, spending x quote in pool A buys
+        y = gA * A_base * x / (A_quote + gA * x)
+    and selling y in pool B returns
+        z = gB * B_quote * y / (B_base + gB * y)
+    which composes to z = K x / (C + D x) with
+        K = gA gB A_base B_quote,  C = A_quote B_base,  D = gA (B_base + gB A_base).
+    z - x is concave and peaks where dz/dx = 1:
+        x* = (sqrt(K C) - C) / D,  profitable only when K > C.
+
+    A per-unit cost c on the base traded (gas) has no closed form: profit
+    z - x - c y is still concave in y, so the optimum is bisected below the
+    cost-free one, where its slope in y falls to zero.
+
+    Args:
+        max_base: Cap on the base amount bought, scalar or per round trip
+        cost_per_unit: Cost per unit of base traded, in quote
+
+    Returns:
+        Tuple of (quote in, base amount, quote out), each (n,); zero where unprofitable
+    """
+    g_buy = 1.0 - buy_fee
+    g_sell = 1.0 - sell_fee
+    k = g_buy * g_sell * buy_base * sell_quote
+    c = buy_quote * sell_base
+    d = g_buy * (sell_base + g_sell * buy_base)
+
+    quote_in = np.maximum(0.0, (np.sqrt(k * c) - c) / d)
+
+    if cost_per_unit > 0:
+        low = np.zeros_like(quote_in)
+        high = g_buy * buy_base * quote_in / (buy_quote + g_buy * quote_in)
+        for _ in range(60):
+            mid = (low + high) / 2
+            slope = (g_sell * sell_quote * sell_base / (sell_base + g_sell * mid) ** 2
+                     - buy_quote * buy_base / (g_buy * (buy_base - mid) ** 2) - cost_per_unit)
+            low = np.where(slope > 0, mid, low)
+            high = np.where(slope > 0, high, mid)
+        quote_in = buy_quote * low / (g_buy * (buy_base - low))
+
+    # Concave profit: clipping to the size limit keeps the constrained optimum
+    max_base = np.broadcast_to(np.asarray(max_base, dtype=float), quote_in.shape)
+    capped = max_base < buy_base
+    with np.errstate(divide='ignore', invalid='ignore'):
+        quote_cap = np.where(
+            capped, buy_quote * max_base / (g_buy * (buy_base - max_base)), np.inf
+        )
+    quote_in = np.minimum(quote_in, quote_cap)
+
+    base_amount = g_buy * buy_base * quote_in / (buy_quote + g_buy * quote_in)
+    quote_out = g_sell * sell_quote * base_amount / (sell_base + g_sell * base_amount)
+    return quote_in, base_amount, quote_out
+
+def slippage_limited_base(buy_base: np.ndarray, sell_base: np.ndarray,
+                          max_slippage: float) -> np.ndarray:
+    """Largest base amount that moves neither pool's price more than max_slippage
+
+    Buying y from a pool scales its price by (B / (B - y))^2 and selling y
+    into one scales it by (B / (B + y))^2.
+    """
+    buy_limit = buy_base * (1.0 - 1.0 / np.sqrt(1.0 + max_slippage))
+    if max_slippage >= 1.0:
+        return buy_limit
+    sell_limit = sell_base * (1.0 / np.sqrt(1.0 - max_slippage) - 1.0)
+    return np.minimum(buy_limit, sell_limit)
+
+def pool_depth(reserve_base: np.ndarray, reserve_quote: np.ndarray, levels: int,
+               max_fraction: float = 0.05) -> Tuple[np.ndarray, np.ndarray]:
+    """Discretize each pool's curve into (n, 2, levels) bid and ask depth
+
+    Level prices are fee-exclusive averages over equal base slices up to
+    max_fraction of the base reserve, so order-book sizing can trade
+    against an AMM leg and charge the venue fee separately.
+    """
+    slices = np.linspace(0.0, max_fraction, levels + 1)[None, :] * reserve_base[:, None]
+    step = slices[:, 1:] - slices[:, :-1]
+    base = reserve_base[:, None]
+    quote = reserve_quote[:, None]
+
+    # Quote paid to buy q base, and quote received for selling q base
+    paid = quote * slices / (base - slices)
+    received = quote * slices / (base + slices)
+
+    asks = np.empty((len(reserve_base), 2, levels))
+    bids = np.empty((len(reserve_base), 2, levels))
+    asks[:, PRICE] = np.diff(paid, axis=1) / step
+    bids[:, PRICE] = np.diff(received, axis=1) / step
+    asks[:, SIZE] = step
+    bids[:, SIZE] = step
+    return bids, asks
@@ -10,11 +10,19 @@ import asyncio
 import threading
 import json
 import time
-from arbitrage_engine import create_engine, get_engine
-from arbitrage_wrapper import ArbitrageEngine as CppEngine
+import sys
 from config import get_config, get_wallet_address, update_wallet_address, update_exchange_api_key
+from config_service import ConfigService
+from trade_journal import TradeJournal
+from profiler import get_profiler, to_collapsed, to_flamegraph
+from opportunity_feed import OpportunityFeed, route_id
+import hmac
 import os
 
+# The engine (numpy, solana) and the C++ wrapper are imported when the bot
+# first starts, so the web app itself comes up fast
+STARTED_AT = time.time()
+
 app = Flask(__name__)
 CORS(app)
 
@@ -22,12 +30,42 @@ CORS(app)
 bot_thread = None
 bot_running = False
 cpp_engine = None
+native_bridge = None
+
+# Change log over the C++ engine's opportunity list, for ?since= polling
+CPP_OPPORTUNITY_FIELDS = ('profit_potential', 'net_profit')
+cpp_feed = OpportunityFeed(CPP_OPPORTUNITY_FIELDS, as_dicts=True)
+
+# Cached configuration; bot_config.json edits are picked up without a restart
+config_service = ConfigService()
+config_service.start_watching()
+
+def get_engine():
+    """The current engine, or None; never imports the engine module itself"""
+    engine_module = sys.modules.get('arbitrage_engine')
+    return engine_module.get_engine() if engine_module else None
+
+def get_engines():
+    """Every wallet engine by name, feed engine first; empty before the bot starts"""
+    engine_module = sys.modules.get('arbitrage_engine')
+    return engine_module.get_engines() if engine_module else {}
 
 @app.route('/')
 def index():
     """Main dashboard page"""
     return render_template('index.html')
 
+@app.route('/api/health')
+def health():
+    """Liveness check that works before the engine has been loaded"""
+    engine = get_engine()
+    return jsonify({
+        'status': 'ok',
+        'uptime': time.time() - STARTED_AT,
+        'engine_loaded': 'arbitrage_engine' in sys.modules,
+        'engine_running': bool(engine and engine.running)
+    })
+
 @app.route('/api/status')
 def get_status():
     """Get bot status"""
@@ -40,19 +78,111 @@ def get_status():
         })
     return jsonify({'status': 'stopped', 'statistics': {}})
 
+# Query parameters that select the filtered, paginated form of /api/opportunities
+OPPORTUNITY_QUERY_ARGS = ('pair', 'token', 'venue', 'min_profit', 'min_confidence', 'max_risk',
+                          'sort', 'order', 'offset', 'limit')
+
+def _list_arg(name: str):
+    """Comma-separated query parameter as a list, or None"""
+    value = request.args.get(name)
+    return [item.strip() for item in value.split(',') if item.strip()] if value else None
+
 @app.route('/api/opportunities')
 def get_opportunities():
-    """Get current arbitrage opportunities"""
+    """Get current arbitrage opportunities
+    
+    With ?since=<seq>, only the adds, updates and removals after that seq,
+    or a full snapshot when the client is too far behind. With any filter,
+    sort or paging parameter, one page of the matching opportunities.
+    """
     engine = get_engine()
+    if 'since' in request.args:
+        since = request.args.get('since', type=int)
+        if engine:
+            return jsonify(engine.get_opportunity_changes(since))
+        return jsonify({'seq': 0, 'snapshot': True, 'opportunities': []})
+    
+    if any(name in request.args for name in OPPORTUNITY_QUERY_ARGS):
+        if not engine:
+            return jsonify({'seq': 0, 'total': 0, 'opportunities': [], 'next_offset': None})
+        args = request.args
+        try:
+            page = engine.query_opportunities(
+                pairs=_list_arg('pair'),
+                tokens=_list_arg('token'),
+                venues=_list_arg('venue'),
+                min_net_profit=args.get('min_profit', type=float),
+                min_confidence=args.get('min_confidence', type=float),
+                max_risk=args.get('max_risk', type=float),
+                sort=args.get('sort', 'net_profit'),
+                descending=args.get('order', 'desc').lower() != 'asc',
+                offset=max(0, args.get('offset', 0, type=int)),
+                limit=max(1, min(args.get('limit', 10, type=int), 500))
+            )
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        return jsonify(page)
+    
     if engine:
         opportunities = engine.get_opportunities()
         return jsonify({'opportunities': opportunities})
     return jsonify({'opportunities': []})
 
+@app.route('/api/trades')
+def get_trades():
+    """Page through journaled execution attempts, newest first (?wallet=<name> for another wallet)"""
+    wallet = request.args.get('wallet')
+    engine = get_engines().get(wallet) if wallet else get_engine()
+    if wallet and not engine:
+        return jsonify({'error': f'Unknown wallet {wallet}'}), 404
+    journal = engine.trade_journal if engine else TradeJournal()
+    
+    try:
+        success = request.args.get('success')
+        trades = journal.query(
+            pair=request.args.get('pair'),
+            venue=request.args.get('venue'),
+            success=None if success is None else success.lower() in ('1', 'true', 'yes'),
+            since=request.args.get('since', type=float),
+            until=request.args.get('until', type=float),
+            before_id=request.args.get('before', type=int),
+            limit=max(1, min(request.args.get('limit', 50, type=int), 500))
+        )
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+    
+    # Cursor for the next page
+    next_before = trades[-1]['id'] if trades else None
+    return jsonify({'trades': trades, 'next_before': next_before})
+
+@app.route('/api/simulate')
+def simulate_opportunities():
+    """Monte Carlo PnL distribution of the current opportunities under given gates"""
+    engine = get_engine()
+    if not engine or not engine.opportunities:
+        return jsonify({'error': 'No opportunities to simulate'}), 400
+    from montecarlo import ExecutionModel, opportunity_arrays, simulate
+    
+    args = request.args
+    gates = {
+        'min_confidence': args.get('min_confidence', engine.min_execution_confidence, type=float),
+        'max_risk': args.get('max_risk', engine.max_execution_risk, type=float),
+        'min_profit': args.get('min_profit', engine.min_execution_profit, type=float),
+    }
+    model = ExecutionModel(
+        latency_mean=args.get('latency', ExecutionModel.latency_mean, type=float),
+        edge_halflife=args.get('halflife', ExecutionModel.edge_halflife, type=float),
+        slippage_std=args.get('slippage', ExecutionModel.slippage_std, type=float),
+    )
+    paths = max(1, min(args.get('paths', 10000, type=int), 100000))
+    report = simulate(opportunity_arrays(list(engine.opportunities)), paths, model, gates,
+                      seed=args.get('seed', 0, type=int))
+    return jsonify(report)
+
 @app.route('/api/start', methods=['POST'])
 def start_bot():
     """Start the arbitrage bot"""
-    global bot_thread, bot_running, cpp_engine
+    global bot_thread, bot_running, cpp_engine, native_bridge
     
     if bot_running:
         return jsonify({'error': 'Bot is already running'}), 400
@@ -61,26 +191,40 @@ def start_bot():
         # Get configuration from request or use defaults
         config = request.json or {}
         
-        # Load default configuration from config.py
-        default_config = get_config()
+        # Start from the cached configuration
+        default_config = dict(config_service.get())
         default_config.update(config)  # Override with any provided values
         
         # Create engines
+        from arbitrage_engine import create_engine
+        from arbitrage_wrapper import ArbitrageEngine as CppEngine, MarketDataBridge
+        from loop_monitor import run as run_loop
+        for previous in get_engines().values():
+            config_service.unsubscribe(previous.apply_config)
         engine = create_engine(default_config)
+        for wallet_engine in get_engines().values():
+            config_service.subscribe(wallet_engine.apply_config)
         cpp_engine = CppEngine()
+        # The C++ engine reads the Python collectors' quotes off the market bus
+        if native_bridge:
+            native_bridge.stop()
+        native_bridge = MarketDataBridge(
+            cpp_engine, engine.market_bus.subscribe('native-engine', ('quote',)),
+            max_quote_age=default_config.get('max_quote_age', 10.0)
+        ).start()
         
         # Start bot in separate thread
         def run_bot():
             global bot_running
             bot_running = True
             try:
-                asyncio.run(engine.start())
+                run_loop(engine.start(), loop=default_config.get('event_loop', 'auto'))
             except Exception as e:
                 print(f"Bot error: {e}")
             finally:
                 bot_running = False
         
-        bot_thread = threading.Thread(target=run_bot)
+        bot_thread = threading.Thread(target=run_bot, name='arbitrage-engine')
         bot_thread.daemon = True
         bot_thread.start()
         
@@ -92,12 +236,18 @@ def start_bot():
 @app.route('/api/stop', methods=['POST'])
 def stop_bot():
     """Stop the arbitrage bot"""
-    global bot_running, cpp_engine
+    global bot_running, cpp_engine, native_bridge
     
     engine = get_engine()
     if engine:
         asyncio.run(engine.stop())
     
+    if native_bridge:
+        native_bridge.stop()
+        if engine:
+            engine.market_bus.unsubscribe(native_bridge.subscription)
+        native_bridge = None
+    
     if cpp_engine:
         cpp_engine.stop()
     
@@ -111,27 +261,65 @@ def handle_config():
         # Return current configuration
         engine = get_engine()
         if engine:
-            return jsonify({
-                'min_profit_threshold': engine.min_profit_threshold,
-                'max_gas_cost': engine.max_gas_cost,
-                'max_slippage': engine.max_slippage,
-                'max_position_size': engine.max_position_size
-            })
-        return jsonify({})
+            return jsonify(engine.get_settings())
+        from arbitrage_engine import FlashArbitrageEngine
+        config = config_service.get()
+        return jsonify({name: config.get(name) for name in FlashArbitrageEngine.TUNABLE_SETTINGS})
     
     elif request.method == 'POST':
-        # Update configuration
-        config = request.json
-        engine = get_engine()
-        if engine:
-            engine.min_profit_threshold = config.get('min_profit_threshold', engine.min_profit_threshold)
-            engine.max_gas_cost = config.get('max_gas_cost', engine.max_gas_cost)
-            engine.max_slippage = config.get('max_slippage', engine.max_slippage)
-            engine.max_position_size = config.get('max_position_size', engine.max_position_size)
-            
-            return jsonify({'message': 'Configuration updated successfully'})
+        # Validate, persist and hand the whole update to the engine at once
+        config = request.json or {}
+        success, errors = config_service.update(config)
+        if not success:
+            return jsonify({'error': 'Invalid configuration', 'details': errors}), 400
         
-        return jsonify({'error': 'Bot not initialized'}), 400
+        return jsonify({'message': 'Configuration updated successfully'})
+
+@app.route('/api/profile')
+def capture_profile():
+    """Sample every thread's stack for a few seconds
+    
+    Requires the X-Profile-Token header to match profiling_token (or the
+    FLASH_ARB_PROFILE_TOKEN environment variable); disabled when neither is set.
+    """
+    token = config_service.get().get('profiling_token') or os.environ.get('FLASH_ARB_PROFILE_TOKEN')
+    if not token:
+        return jsonify({'error': 'Profiling is disabled'}), 404
+    if not hmac.compare_digest(request.headers.get('X-Profile-Token', ''), token):
+        return jsonify({'error': 'Invalid profile token'}), 403
+    
+    seconds = max(0.1, min(request.args.get('seconds', 5.0, type=float), 60.0))
+    output = request.args.get('format', 'collapsed')
+    try:
+        stacks = get_profiler().capture(seconds)
+    except RuntimeError as e:
+        return jsonify({'error': str(e)}), 409
+    
+    if output == 'collapsed':
+        return to_collapsed(stacks), 200, {'Content-Type': 'text/plain; charset=utf-8'}
+    
+    engine = get_engine()
+    return jsonify({
+        'seconds': seconds,
+        'samples': sum(stacks.values()),
+        'flamegraph': to_flamegraph(stacks),
+        'stages': engine.stage_timings.get_statistics() if engine else {}
+    })
+
+@app.route('/api/wallets')
+def get_wallets():
+    """Results, limits and settings of every wallet trading off the shared feed"""
+    return jsonify({'wallets': [engine.get_wallet_statistics() for engine in get_engines().values()]})
+
+@app.route('/api/risk/reset', methods=['POST'])
+def reset_stop_loss():
+    """Re-arm trading after the stop loss halted it (?wallet=<name> for another wallet)"""
+    wallet = request.args.get('wallet')
+    engine = get_engines().get(wallet) if wallet else get_engine()
+    if not engine:
+        return jsonify({'error': 'Bot is not running' if not wallet else f'Unknown wallet {wallet}'}), 400
+    engine.risk_limits.reset_stop_loss()
+    return jsonify(engine.risk_limits.get_statistics())
 
 @app.route('/api/cpp/status')
 def get_cpp_status():
@@ -158,6 +346,12 @@ def get_cpp_opportunities():
     if cpp_engine:
         try:
             opportunities = cpp_engine.get_all_opportunities()
+            if 'since' in request.args:
+                for opportunity in opportunities:
+                    opportunity['id'] = route_id(opportunity['token_pair'], opportunity['exchange_a'],
+                                                 opportunity['exchange_b'])
+                cpp_feed.publish(opportunities)
+                return jsonify(cpp_feed.changes_since(request.args.get('since', type=int)))
             return jsonify({'opportunities': opportunities})
         except Exception as e:
             return jsonify({'error': str(e)}), 500
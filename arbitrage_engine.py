@@ -4,27 +4,35 @@ Flash Arbitrage Bot - Enhanced Solana Arbitrage Engine
 Based on the original implementation with unlimited profit potential
 """
 
+from __future__ import annotations  # Annotations name numpy types without importing numpy
+
 import asyncio
 import json
 import time
 import logging
 from typing import Dict, List, Optional, Tuple
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, replace
+from pathlib import Path
 from decimal import Decimal
-import websockets
-import aiohttp
-from solana.rpc.async_api import AsyncClient
-from solana.rpc.commitment import Commitment
-from solana.publickey import PublicKey
-from solana.transaction import Transaction
-import numpy as np
 
 # Import configuration
-from config import get_config, get_wallet_address
+from config import get_config, get_wallet_address, is_local_rpc
+from quote_expiry import QuoteExpiryIndex
+from trade_journal import JOURNAL_FILE, TradeJournal
+from checkpoint import CHECKPOINT_FILE, EngineCheckpoint
+from logging_setup import ThrottledLogger, configure_logging, get_logging_statistics
+from profiler import StageTimings
+from clock import RealClock
+from risk_limits import RiskLimits
+from opportunity_feed import OpportunityFeed, route_id
+from market_bus import MarketDataBus
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+# numpy and the numeric modules are imported where they are used, so importing
+# this module (for its dataclasses, or the app checking for an engine) stays
+# within its startup budget; see startup_budget.py
 logger = logging.getLogger(__name__)
+# Hot-loop messages: each template at most once per interval (from each engine's config)
+hot_logger = ThrottledLogger(logger)
 
 @dataclass
 class ArbitrageOpportunity:
@@ -42,6 +50,8 @@ class ArbitrageOpportunity:
     timestamp: float
     confidence: float
     risk_score: float
+    id: str = ''  # Stable per route: pair:buy exchange:sell exchange
+    buy_cost: float = 0.0  # Quote spent on the buy leg at the fill's average price, fees included
 
 @dataclass
 class MarketData:
@@ -53,223 +63,700 @@ class MarketData:
     volume: float
     timestamp: float
     liquidity: float
+    bid_depth: Optional[np.ndarray] = None  # (2, levels): prices, sizes
+    ask_depth: Optional[np.ndarray] = None
+    pool: Optional[PoolState] = None        # Set for constant-product AMM venues
+    market_id: int = -1                     # Row in quote history and rolling stats
+    pair_id: int = -1                       # Interned universe pair id; scanners group by it
 
 class FlashArbitrageEngine:
-    """Enhanced Flash Arbitrage Engine with unlimited profit potential"""
+    """Enhanced Flash Arbitrage Engine with unlimited profit potential
+    
+    An engine built with feed=<another engine> trades a further wallet off
+    that engine's market data: it shares the feed's quote store, history,
+    statistics and opportunity list (the same objects, never copied) and
+    runs only its own execution loop, with its own thresholds, risk limits,
+    journal and statistics. Collection, scanning and valuation run once in
+    the feed engine however many wallets follow it.
+    """
+    
+    # Settings that can be hot-swapped while the engine is running
+    TUNABLE_SETTINGS = ('min_profit_threshold', 'max_gas_cost', 'max_slippage', 'max_position_size',
+                        'min_execution_confidence', 'max_execution_risk', 'min_execution_profit')
     
-    def __init__(self, config: Dict = None):
+    # Gas model: base cost plus a per-unit volume cost, in SOL
+    BASE_GAS_COST = 0.001
+    GAS_COST_PER_UNIT = 0.00001
+    
+    def __init__(self, config: Dict = None, clock=None, feed: 'FlashArbitrageEngine' = None,
+                 wallet: Dict = None):
         # Use provided config or load from config.py
         if config is None:
             config = get_config()
         
+        # Records are formatted and written by a background listener
+        configure_logging(config.get('log_level', 'INFO'), use_queue=config.get('log_queue', True))
+        hot_logger.interval = config.get('log_throttle_interval', 5.0)
+        
+        from scanner_backends import create_backend
+        from token_universe import UNIVERSE_FILE
+        from quote_history import QuoteHistory
+        from market_stats import RollingMarketStats
+        from loop_monitor import LoopLagMonitor
+        
+        # Per-wallet overrides stay on top of every later config update
+        self.wallet_overrides = dict(wallet or {})
+        config = {**config, **self.wallet_overrides}
         self.config = config
-        self.wallet_address = get_wallet_address()
-        self.opportunities = []
-        self.market_data = {}
+        self.name = config.get('name', 'primary')
+        self.feed = feed
+        self.followers: List['FlashArbitrageEngine'] = []
+        # All engine time and sleeps go through the clock (virtual in backtests)
+        self.clock = feed.clock if feed else clock or RealClock()
+        self.wallet_address = config.get('wallet_address') if feed else get_wallet_address()
+        self._opportunities = []
+        self.market_data = feed.market_data if feed else {}
         self.running = False
         self.total_profit = 0.0
         self.successful_trades = 0
         self.failed_trades = 0
         
-        logger.info(f"Initializing Flash Arbitrage Engine for wallet: {self.wallet_address}")
+        logger.info(f"Initializing Flash Arbitrage Engine for wallet: {self.wallet_address}"
+                    + (f" ({self.name}, following {feed.name})" if feed else ""))
         
         # Enhanced configuration for unlimited profit
         self.min_profit_threshold = config.get('min_profit_threshold', 0.0005)  # 0.05% minimum
         self.max_gas_cost = config.get('max_gas_cost', 0.02)  # 0.02 SOL max gas
         self.max_slippage = config.get('max_slippage', 0.03)  # 3% max slippage
         self.max_position_size = config.get('max_position_size', 5000.0)  # Max position size
+        self.book_depth_levels = config.get('book_depth_levels', 5)  # 0 = top of book only
+        
+        # Execution gates: only opportunities passing all three are traded
+        self.min_execution_confidence = config.get('min_execution_confidence', 0.7)
+        self.max_execution_risk = config.get('max_execution_risk', 0.5)
+        self.min_execution_profit = config.get('min_execution_profit', 0.01)  # SOL
         
-        # Solana RPC client
-        self.solana_client = AsyncClient(
-            config.get('solana_rpc_url', 'https://api.mainnet-beta.solana.com')
+        # Rolling daily trade, daily loss and stop-loss limits
+        self.risk_limits = RiskLimits(
+            max_trades=config.get('max_daily_trades', 1000),
+            max_loss=config.get('max_daily_loss', 10.0),
+            stop_loss_pct=config.get('stop_loss_percentage', 0.05),
+            capital=config.get('trading_capital', 100.0)
         )
+        self._pending_settings = None
+        
+        # Solana RPC client, created on first use
+        self.solana_rpc_url = config.get('solana_rpc_url', 'https://api.mainnet-beta.solana.com')
+        self._solana_client = None
+        
+        # Flash-loan transactions: 'simulated' builds and signs them but never
+        # sends, 'rpc' sends them to solana_rpc_url (requires private_key).
+        # Their layouts are stand-ins, so 'rpc' only sends to a local server
+        self.execution_mode = config.get('execution_mode', 'simulated')
+        if self.execution_mode not in ('simulated', 'rpc'):
+            raise ValueError(f"Unknown execution_mode {self.execution_mode}; choose 'simulated' or 'rpc'")
+        if self.execution_mode == 'rpc' and not is_local_rpc(self.solana_rpc_url):
+            raise ValueError(f"execution_mode 'rpc' only sends to a local stand-in RPC until the transaction "
+                             f"layouts match the real programs; {self.solana_rpc_url} is not local")
+        self.blockhash_refresh_interval = config.get('blockhash_refresh_interval', 10.0)
+        self.recent_blockhash = None
+        self.last_valid_block_height = None  # Sent transactions expire past this height
+        self.flash_loan_fee = config.get('flash_loan_fee', 0.0009)  # Fraction of the loan, repaid with it
+        self._transaction_builder = None
         
         # Exchange configurations
         self.exchanges = {
             'raydium': {
                 'name': 'Raydium',
                 'api_url': 'https://api.raydium.io/v2',
+                'type': 'amm',
                 'websocket_url': 'wss://api.raydium.io/v2/ws',
                 'fee': 0.0025  # 0.25%
             },
             'orca': {
                 'name': 'Orca',
                 'api_url': 'https://api.orca.so/v1',
+                'type': 'amm',
                 'websocket_url': 'wss://api.orca.so/v1/ws',
                 'fee': 0.003   # 0.3%
             },
             'serum': {
                 'name': 'Serum',
                 'api_url': 'https://api.projectserum.com/v1',
+                'type': 'orderbook',
                 'websocket_url': 'wss://api.projectserum.com/v1/ws',
                 'fee': 0.0022  # 0.22%
             },
             'jupiter': {
                 'name': 'Jupiter',
                 'api_url': 'https://quote-api.jup.ag/v6',
+                'type': 'orderbook',
                 'websocket_url': 'wss://quote-api.jup.ag/v6/ws',
                 'fee': 0.001   # 0.1%
             }
         }
         
-        # Token pairs to monitor
-        self.token_pairs = [
-            'SOL/USDC', 'SOL/USDT', 'RAY/SOL', 'SRM/SOL',
-            'ORCA/SOL', 'MNGO/SOL', 'STEP/SOL', 'COPE/SOL',
-            'MEDIA/SOL', 'ROPE/SOL', 'TULIP/SOL', 'SLIM/SOL'
-        ]
+        # Token pairs to monitor, with venue listings and reference prices
+        self.universe = feed.universe if feed else \
+            self.load_universe(config.get('token_universe_file') or UNIVERSE_FILE)
+        self.token_pairs = self.universe.pair_names
+        
+        # Fee and gas tables per (buy venue, sell venue), rebuilt when fees or limits change
+        self.route_costs = self.build_route_costs()
+        
+        # Opportunity detection backend ('python', 'numpy', 'native' or 'auto')
+        self.scanner_backend_name = config.get('scanner_backend', 'python')
+        self.scanner = create_backend(
+            'python' if self.scanner_backend_name == 'auto' else self.scanner_backend_name
+        )
+        self.scanner.configure(self.max_gas_cost, self.max_slippage)
+        
+        # Bounded per-market quote history (market id = venue id * pairs + pair id)
+        self.quote_history = feed.quote_history if feed else QuoteHistory(
+            len(self.universe.venue_names) * self.universe.n_pairs,
+            capacity=config.get('history_length', 256),
+            max_bytes=int(config.get('history_memory_mb', 64) * 1024 * 1024)
+        )
+        
+        # Incremental volatility, spread and update-rate statistics per market
+        self.market_stats = feed.market_stats if feed else RollingMarketStats(
+            len(self.universe.venue_names) * self.universe.n_pairs,
+            halflife=config.get('stats_halflife_ticks', 20.0)
+        )
+        self.volatility_scale = config.get('volatility_scale', 0.005)  # Per-tick std treated as fully unstable
+        self.spread_scale = config.get('spread_scale', 0.01)  # Mean relative spread treated as fully unstable
+        self.active_update_rate = config.get('active_update_rate', 1.0)  # Updates per second treated as active
+        
+        # Quotes older than their venue's max age are evicted before each scan
+        self.quote_expiry = feed.quote_expiry if feed else QuoteExpiryIndex(
+            config.get('max_quote_age', 10.0), config.get('venue_max_quote_age')
+        )
+        
+        # Sharded mode: scan in worker processes over a shared-memory quote matrix
+        self.scan_workers = config.get('scan_workers', 0)
+        self.sharded_scanner = None
+        
+        # Every execution attempt is journaled off the event loop
+        self.trade_journal = TradeJournal(config.get('trade_journal_file') or JOURNAL_FILE)
+        
+        # Periodic checkpoints for warm restarts (interval 0 disables them)
+        self.checkpoint_interval = config.get('checkpoint_interval', 5.0)
+        self.checkpointer = EngineCheckpoint(config.get('checkpoint_file') or CHECKPOINT_FILE)
+        
+        # How far the event loop runs behind its schedule
+        self.loop_monitor = LoopLagMonitor(config.get('loop_lag_interval', 0.05))
+        
+        # Wall time spent in collection, scanning, valuation and execution
+        self.stage_timings = StageTimings()
+        
+        # Where collectors get quotes: (exchange, pair_ids) -> (bids, asks, volumes, liquidity)
+        self.quote_source = self.simulate_quotes
+        # Called as listener(opportunity, success) after every execution attempt
+        self.trade_listeners = []
+        
+        # Sequence-numbered changes to the opportunity list for delta polling
+        self.opportunity_feed = feed.opportunity_feed if feed else OpportunityFeed()
+        
+        # Quote and opportunity events for consumers slower than the feed
+        self.market_bus = feed.market_bus if feed else MarketDataBus()
+        
+        # One follower per configured further wallet
+        if feed is None:
+            for wallet_config in config.get('wallet_strategies') or []:
+                self.add_follower(wallet_config)
+    
+    @property
+    def opportunities(self) -> List[ArbitrageOpportunity]:
+        """Current opportunities, best first; a follower reads its feed's list"""
+        return self.feed._opportunities if self.feed else self._opportunities
+    
+    @opportunities.setter
+    def opportunities(self, opportunities: List[ArbitrageOpportunity]):
+        self._opportunities = opportunities
+    
+    def add_follower(self, wallet: Dict) -> 'FlashArbitrageEngine':
+        """Trade a further wallet off this engine's market data
+        
+        wallet holds a name, a wallet_address and any settings that differ
+        for it (thresholds, execution gates, capital and daily limits). Its
+        journal and checkpoint files default to this engine's with the
+        wallet name appended.
+        """
+        wallet = dict(wallet)
+        for key, default in (('trade_journal_file', JOURNAL_FILE), ('checkpoint_file', CHECKPOINT_FILE)):
+            if not wallet.get(key):
+                path = Path(self.config.get(key) or default)
+                wallet[key] = path.with_name(f"{path.stem}-{wallet['name']}{path.suffix}")
+        follower = FlashArbitrageEngine(self.config, feed=self, wallet=wallet)
+        self.followers.append(follower)
+        return follower
+    
+    @property
+    def scan_threshold(self) -> float:
+        """Scan at the loosest profit threshold of this engine and its followers"""
+        if not self.followers:
+            return self.min_profit_threshold
+        return min(self.min_profit_threshold, *(f.min_profit_threshold for f in self.followers))
+    
+    @property
+    def solana_client(self):
+        """Solana RPC client; the solana package is only imported when first needed"""
+        if self._solana_client is None:
+            from solana.rpc.async_api import AsyncClient
+            self._solana_client = AsyncClient(self.solana_rpc_url)
+        return self._solana_client
+    
+    @property
+    def transaction_builder(self):
+        """Per-route transaction templates for this wallet, created on first trade
+        
+        Signs with this wallet's private_key; a simulated engine without one
+        signs with a throwaway key, since its transactions are never sent.
+        """
+        if self._transaction_builder is None:
+            from solders.address_lookup_table_account import AddressLookupTableAccount
+            from solders.keypair import Keypair
+            from solders.pubkey import Pubkey
+            from tx_builder import TransactionBuilder
+            
+            # A follower never signs with the key it would inherit from its feed
+            private_key = (self.wallet_overrides if self.feed else self.config).get('private_key')
+            if private_key:
+                keypair = Keypair.from_base58_string(private_key)
+            elif self.execution_mode == 'rpc':
+                raise ValueError(f"execution_mode 'rpc' needs a private_key for wallet {self.name}")
+            else:
+                keypair = Keypair()
+            lookup_tables = [
+                AddressLookupTableAccount(Pubkey.from_string(table), [Pubkey.from_string(a) for a in addresses])
+                for table, addresses in (self.config.get('lookup_tables') or {}).items()
+            ]
+            self._transaction_builder = TransactionBuilder(
+                keypair, self.universe, self.config.get('solana_addresses'), lookup_tables, self.max_slippage,
+                flash_loan_fee=self.flash_loan_fee, min_profit=self.min_execution_profit
+            )
+        return self._transaction_builder
+    
+    async def refresh_blockhash(self):
+        """Fetch the latest blockhash transactions are built against"""
+        response = await self.solana_client.get_latest_blockhash()
+        self.recent_blockhash = response.value.blockhash
+        self.last_valid_block_height = response.value.last_valid_block_height
+    
+    async def blockhash_loop(self):
+        """Keep recent_blockhash fresh; a blockhash expires after ~150 slots (~60 s)"""
+        while self.running:
+            await asyncio.sleep(self.blockhash_refresh_interval)
+            try:
+                await self.refresh_blockhash()
+            except Exception as e:
+                logger.error(f"Error refreshing blockhash: {e}")
     
     async def start(self):
         """Start the arbitrage engine"""
+        if self.feed is not None:
+            return await self.start_follower()
+        
         logger.info("Starting Flash Arbitrage Engine...")
         self.running = True
         
+        if self.scanner_backend_name == 'auto':
+            # Micro-benchmark every backend on the configured universe size
+            from scanner_backends import select_backend
+            self.scanner = select_backend(
+                list(self.exchanges.keys()), self.token_pairs, self.scan_threshold,
+                max_gas_cost=self.max_gas_cost, max_slippage=self.max_slippage
+            )
+        
+        if self.scan_workers > 0:
+            from sharded_scanner import ShardedScanner
+            self.sharded_scanner = ShardedScanner(
+                list(self.exchanges.keys()), self.token_pairs, n_workers=self.scan_workers
+            ).start(self.scan_threshold)
+        
+        self.trade_journal.start()
+        
+        if self.checkpoint_interval > 0:
+            self.restore_checkpoint()
+        
+        # Sent transactions need a signing key and a live blockhash before the first trade
+        senders = [wallet for wallet in [self] + self.followers if wallet.execution_mode == 'rpc']
+        for wallet in senders:
+            wallet.transaction_builder  # Raises without a private_key
+        if senders:
+            await self.refresh_blockhash()
+        
         # Start market data collection
         tasks = []
         for exchange in self.exchanges.keys():
-            tasks.append(self.collect_market_data(exchange))
+            tasks.append(self.clock.track(self.collect_market_data(exchange)))
         
         # Start opportunity scanning
-        tasks.append(self.scan_opportunities_loop())
+        tasks.append(self.clock.track(self.scan_opportunities_loop()))
         
         # Start trade execution
-        tasks.append(self.execute_trades_loop())
+        tasks.append(self.clock.track(self.execute_trades_loop()))
+        
+        # Wall-clock housekeeping has no meaning under a virtual clock
+        if self.clock.realtime:
+            if self.checkpoint_interval > 0:
+                tasks.append(self.checkpoint_loop())
+            tasks.append(self.monitor_loop_lag())
+            if self.recent_blockhash is not None:
+                tasks.append(self.blockhash_loop())
+        
+        # Further wallets trade off the same quotes and scans
+        for follower in self.followers:
+            tasks.append(follower.start())
         
         await asyncio.gather(*tasks)
     
+    async def start_follower(self):
+        """Run only the execution side, off the feed engine's opportunities"""
+        logger.info(f"Starting wallet {self.name} on {self.feed.name} market data...")
+        self.running = True
+        self.trade_journal.start()
+        
+        if self.checkpoint_interval > 0:
+            self.restore_checkpoint()
+        
+        tasks = [self.clock.track(self.execute_trades_loop())]
+        if self.clock.realtime and self.checkpoint_interval > 0:
+            tasks.append(self.checkpoint_loop())
+        await asyncio.gather(*tasks)
+    
     async def collect_market_data(self, exchange: str):
         """Collect real-time market data from exchange"""
+        from amm_pricing import PoolState, pool_depth
+        from order_book import make_depth
+        
         while self.running:
             try:
+                stage_start = time.perf_counter()
                 exchange_config = self.exchanges[exchange]
                 
-                # Simulate market data collection (replace with real API calls)
-                for pair in self.token_pairs:
-                    # Generate realistic market data with some randomness
-                    base_price = self.get_base_price(pair)
-                    spread = base_price * 0.001  # 0.1% spread
-                    
-                    bid_price = base_price - (spread / 2) + np.random.normal(0, spread * 0.1)
-                    ask_price = base_price + (spread / 2) + np.random.normal(0, spread * 0.1)
-                    volume = np.random.uniform(1000, 10000)
-                    liquidity = np.random.uniform(50000, 500000)
-                    
-                    market_data = MarketData(
+                # Only pairs this venue lists that are also quoted elsewhere
+                venue_id = self.universe.venue_ids[exchange]
+                pair_ids = self.universe.venue_scan_pairs[venue_id]
+                n = len(pair_ids)
+                
+                bid_prices, ask_prices, volumes, liquidity = self.quote_source(exchange, pair_ids)
+                timestamp = self.clock.time()
+                levels = max(1, self.book_depth_levels)
+                
+                if exchange_config.get('type') == 'amm':
+                    # Pool reserves around the mid; quotes and depth follow the curve
+                    mids = (bid_prices + ask_prices) / 2
+                    reserve_quote = liquidity / 2
+                    reserve_base = reserve_quote / mids
+                    bid_depths, ask_depths = pool_depth(reserve_base, reserve_quote, levels)
+                    # Top of book is the fee-exclusive marginal price at zero size
+                    bid_prices = ask_prices = mids
+                    fee = exchange_config['fee']
+                    pools = [PoolState(b, q, fee) for b, q in
+                             zip(reserve_base.tolist(), reserve_quote.tolist())]
+                else:
+                    if self.book_depth_levels > 0:
+                        spreads = (bid_prices + ask_prices) * 0.0005  # Level step: 0.1% of mid
+                        bid_depths = make_depth(bid_prices, volumes, spreads, levels, -1)
+                        ask_depths = make_depth(ask_prices, volumes, spreads, levels, +1)
+                    else:
+                        bid_depths = ask_depths = [None] * n
+                    pools = [None] * n
+                
+                # Store market data under precomputed keys
+                market_data = self.market_data
+                market_keys = self.universe.venue_market_keys[venue_id]
+                market_ids = self.universe.venue_market_ids[venue_id]
+                for key, market_id, pair_id, pair, bid_price, ask_price, volume, pool_liquidity, bid_depth, ask_depth, pool in zip(
+                        market_keys, market_ids.tolist(), pair_ids.tolist(),
+                        self.universe.venue_pair_names[venue_id],
+                        bid_prices.tolist(), ask_prices.tolist(),
+                        volumes.tolist(), liquidity.tolist(),
+                        bid_depths, ask_depths, pools):
+                    market_data[key] = MarketData(
                         exchange=exchange,
                         token_pair=pair,
-                        bid_price=max(0, bid_price),
-                        ask_price=max(bid_price, ask_price),
+                        bid_price=bid_price,
+                        ask_price=ask_price,
                         volume=volume,
-                        timestamp=time.time(),
-                        liquidity=liquidity
+                        timestamp=timestamp,
+                        liquidity=pool_liquidity,
+                        bid_depth=bid_depth,
+                        ask_depth=ask_depth,
+                        pool=pool,
+                        market_id=market_id,
+                        pair_id=pair_id
                     )
-                    
-                    # Store market data
-                    key = f"{exchange}:{pair}"
-                    self.market_data[key] = market_data
+                self.quote_expiry.touch_batch(exchange, market_keys, timestamp)
+                if self.market_bus.has_subscribers('quote'):
+                    self.market_bus.publish_batch('quote', market_keys, [market_data[key] for key in market_keys])
+                self.quote_history.append_batch(market_ids, timestamp, bid_prices, ask_prices, volumes)
+                self.market_stats.update_batch(market_ids, timestamp, bid_prices, ask_prices)
+                
+                if self.sharded_scanner is not None:
+                    # This collector is the only writer of its exchange row
+                    self.sharded_scanner.publish_row(exchange, bid_prices, ask_prices, volumes,
+                                                     liquidity, timestamp, pair_ids)
+                self.stage_timings.record('collect', time.perf_counter() - stage_start)
                 
-                await asyncio.sleep(0.1)  # 100ms update interval
+                await self.clock.sleep(0.1)  # 100ms update interval
                 
             except Exception as e:
-                logger.error(f"Error collecting market data from {exchange}: {e}")
-                await asyncio.sleep(1)
+                hot_logger.error("Error collecting market data from %s: %s", exchange, e)
+                await self.clock.sleep(1)
+    
+    def simulate_quotes(self, exchange: str, pair_ids: np.ndarray) -> Tuple[np.ndarray, ...]:
+        """Simulated (bids, asks, volumes, liquidity) around reference prices
+        
+        AMM venues quote their pool mid on both sides. Replace with real API
+        calls, or swap self.quote_source for recorded data.
+        """
+        import numpy as np
+        
+        n = len(pair_ids)
+        base_prices = self.universe.reference_prices[pair_ids]
+        spreads = base_prices * 0.001  # 0.1% spread
+        volumes = np.random.uniform(1000, 10000, n)
+        liquidity = np.random.uniform(50000, 500000, n)
+        
+        if self.exchanges[exchange].get('type') == 'amm':
+            mids = base_prices + np.random.normal(0, spreads * 0.1)
+            return mids, mids, volumes, liquidity
+        
+        bid_prices = base_prices - (spreads / 2) + np.random.normal(0, spreads * 0.1)
+        ask_prices = base_prices + (spreads / 2) + np.random.normal(0, spreads * 0.1)
+        ask_prices = np.maximum(bid_prices, ask_prices)
+        bid_prices = np.maximum(0, bid_prices)
+        return bid_prices, ask_prices, volumes, liquidity
+    
+    def load_universe(self, path) -> TokenUniverse:
+        """Load the token universe, falling back to the built-in pairs"""
+        from token_universe import TokenUniverse
+        
+        try:
+            universe = TokenUniverse.load(path, venues=list(self.exchanges.keys()))
+        except FileNotFoundError:
+            logger.warning(f"Token universe file {path} not found, using built-in pairs")
+            universe = TokenUniverse.default(list(self.exchanges.keys()))
+        logger.info(f"Loaded token universe: {universe.n_pairs} pairs, "
+                    f"{int(universe.multi_venue.sum())} listed on 2+ venues")
+        return universe
     
     def get_base_price(self, pair: str) -> float:
         """Get base price for token pair"""
-        base_prices = {
-            'SOL/USDC': 100.0,
-            'SOL/USDT': 100.0,
-            'RAY/SOL': 0.5,
-            'SRM/SOL': 0.1,
-            'ORCA/SOL': 0.3,
-            'MNGO/SOL': 0.05,
-            'STEP/SOL': 0.02,
-            'COPE/SOL': 0.01,
-            'MEDIA/SOL': 0.15,
-            'ROPE/SOL': 0.001,
-            'TULIP/SOL': 0.08,
-            'SLIM/SOL': 0.003
-        }
-        return base_prices.get(pair, 1.0)
+        return self.universe.reference_price(pair)
     
     async def scan_opportunities_loop(self):
         """Continuously scan for arbitrage opportunities"""
         while self.running:
             try:
+                self.swap_pending_settings()
+                for follower in self.followers:
+                    follower.swap_pending_settings()
                 await self.scan_opportunities()
-                await asyncio.sleep(0.05)  # 50ms scan interval
+                await self.clock.sleep(0.05)  # 50ms scan interval
             except Exception as e:
-                logger.error(f"Error scanning opportunities: {e}")
-                await asyncio.sleep(0.1)
+                hot_logger.error("Error scanning opportunities: %s", e)
+                await self.clock.sleep(0.1)
     
     async def scan_opportunities(self):
         """Scan for arbitrage opportunities across exchanges"""
         opportunities = []
+        stage_start = time.perf_counter()
         
-        # Group market data by token pair
-        pairs_data = {}
-        for key, data in self.market_data.items():
-            pair = data.token_pair
-            if pair not in pairs_data:
-                pairs_data[pair] = []
-            pairs_data[pair].append(data)
-        
-        # Find arbitrage opportunities
-        for pair, data_list in pairs_data.items():
-            if len(data_list) < 2:
-                continue
-            
-            # Compare all exchange combinations
-            for i in range(len(data_list)):
-                for j in range(i + 1, len(data_list)):
-                    data_a = data_list[i]
-                    data_b = data_list[j]
-                    
-                    # Calculate potential profit
-                    if data_a.ask_price < data_b.bid_price:
-                        # Buy on A, sell on B
-                        price_diff = data_b.bid_price - data_a.ask_price
-                        profit_pct = price_diff / data_a.ask_price
-                        
-                        if profit_pct > self.min_profit_threshold:
-                            opportunity = await self.create_opportunity(
-                                data_a, data_b, price_diff, profit_pct, 'buy_a_sell_b'
-                            )
-                            if opportunity:
-                                opportunities.append(opportunity)
-                    
-                    elif data_b.ask_price < data_a.bid_price:
-                        # Buy on B, sell on A
-                        price_diff = data_a.bid_price - data_b.ask_price
-                        profit_pct = price_diff / data_b.ask_price
-                        
-                        if profit_pct > self.min_profit_threshold:
-                            opportunity = await self.create_opportunity(
-                                data_b, data_a, price_diff, profit_pct, 'buy_b_sell_a'
-                            )
-                            if opportunity:
-                                opportunities.append(opportunity)
+        # Stale quotes never reach detection or valuation
+        self.quote_expiry.evict(self.market_data, self.clock.time())
+        
+        if self.sharded_scanner is not None:
+            candidates = self.collect_sharded_candidates()
+        else:
+            candidates = self.scanner.scan(list(self.market_data.values()), self.scan_threshold)
+        # Routes whose spread cannot pay fees and gas at any size are never valued
+        candidates, fee_rates = self.screen_candidates(candidates)
+        scanned = time.perf_counter()
+        self.stage_timings.record('scan', scanned - stage_start)
+        
+        # Size every candidate against both books in one pass
+        fills = self.size_candidates(candidates, fee_rates)
+        for candidate, fill, candidate_fees in zip(candidates, fills, fee_rates):
+            opportunity = await self.create_opportunity(
+                candidate.buy, candidate.sell, candidate.price_diff,
+                candidate.profit_pct, candidate.direction, fill, candidate_fees
+            )
+            if opportunity:
+                opportunities.append(opportunity)
         
         # Sort opportunities by profit potential
         opportunities.sort(key=lambda x: x.net_profit, reverse=True)
         self.opportunities = opportunities[:50]  # Keep top 50 opportunities
+        self.opportunity_feed.publish(self.opportunities)
+        self.market_bus.publish('opportunities', 'top', self.opportunities)
+        self.stage_timings.record('valuation', time.perf_counter() - scanned)
+    
+    def collect_sharded_candidates(self) -> List[ScanCandidate]:
+        """Turn the latest worker candidates into ScanCandidates over current quotes"""
+        from scanner_backends import ScanCandidate
+        
+        scan_threshold = self.scan_threshold
+        self.sharded_scanner.set_min_profit_threshold(scan_threshold)
+        exchanges = self.sharded_scanner.exchanges
+        
+        candidates = []
+        for pair_idx, buy_idx, sell_idx, _, _, _ in self.sharded_scanner.drain().tolist():
+            pair = self.token_pairs[int(pair_idx)]
+            buy_data = self.market_data.get(f"{exchanges[int(buy_idx)]}:{pair}")
+            sell_data = self.market_data.get(f"{exchanges[int(sell_idx)]}:{pair}")
+            if buy_data is None or sell_data is None:
+                continue
+            
+            # Workers saw a snapshot; only keep dislocations that still hold
+            if buy_data.ask_price < sell_data.bid_price:
+                price_diff = sell_data.bid_price - buy_data.ask_price
+                profit_pct = price_diff / buy_data.ask_price
+                if profit_pct > scan_threshold:
+                    direction = 'buy_a_sell_b' if buy_idx < sell_idx else 'buy_b_sell_a'
+                    candidates.append(ScanCandidate(
+                        buy_data, sell_data, price_diff, profit_pct, direction
+                    ))
+        return candidates
+    
+    def max_trade_size(self) -> float:
+        """Largest size within max_position_size whose gas still clears the max_gas_cost gate"""
+        gas_limited_size = (self.max_gas_cost - self.BASE_GAS_COST) / self.GAS_COST_PER_UNIT
+        return max(0.0, min(self.max_position_size, gas_limited_size * (1 - 1e-9)))
+    
+    def build_route_costs(self) -> RouteCosts:
+        """Route cost tables for the current exchange and flash loan fees, gas model and size limits"""
+        from route_costs import RouteCosts
+        
+        return RouteCosts.build(self.exchanges, self.universe.venue_names, self.BASE_GAS_COST,
+                                self.GAS_COST_PER_UNIT, self.max_trade_size(), self.flash_loan_fee)
+    
+    def update_fees(self, fees: Dict[str, float]):
+        """Change venue fee rates; cost tables are rebuilt and swapped in whole"""
+        for exchange, fee in fees.items():
+            self.exchanges[exchange]['fee'] = fee
+        self.route_costs = self.build_route_costs()
+    
+    def screen_candidates(self, candidates: List[ScanCandidate]) -> Tuple[List[ScanCandidate], List[Tuple[float, float]]]:
+        """Drop candidates at or below their route's break-even spread
+        
+        Returns:
+            The surviving candidates and their (buy, sell) venue fee rates
+        """
+        if not candidates:
+            return candidates, []
+        import numpy as np
+        
+        route_costs = self.route_costs
+        n_pairs = self.universe.n_pairs
+        buy_ids = np.array([c.buy.market_id for c in candidates]) // n_pairs
+        sell_ids = np.array([c.sell.market_id for c in candidates]) // n_pairs
+        viable = route_costs.screen(
+            buy_ids, sell_ids,
+            np.array([c.buy.ask_price for c in candidates]),
+            np.array([c.profit_pct for c in candidates])
+        )
+        kept = np.flatnonzero(viable).tolist()
+        fees = route_costs.fees
+        return ([candidates[i] for i in kept],
+                list(zip(fees[buy_ids[kept]].tolist(), fees[sell_ids[kept]].tolist())))
+    
+    def size_candidates(self, candidates: List[ScanCandidate],
+                        fee_rates: List[Tuple[float, float]] = None) -> List[Optional[Fill]]:
+        """Profit-maximizing fills for every candidate, vectorized per model
+        
+        AMM-to-AMM round trips use the closed-form constant-product optimum.
+        Other candidates with depth on both legs walk both books within
+        max_slippage. Anything else gets None and falls back to top-of-book
+        sizing in create_opportunity.
+        """
+        import numpy as np
+        from amm_pricing import optimal_round_trip, slippage_limited_base
+        from order_book import Fill, solve_optimal_sizes
+        
+        fills = [None] * len(candidates)
+        max_size = self.max_trade_size()
+        if fee_rates is None:
+            fee_rates = [(self.exchanges[c.buy.exchange]['fee'], self.exchanges[c.sell.exchange]['fee'])
+                         for c in candidates]
+        
+        pooled, sized = [], []
+        for i, c in enumerate(candidates):
+            if c.buy.pool is not None and c.sell.pool is not None:
+                pooled.append(i)
+            elif c.buy.ask_depth is not None and c.sell.bid_depth is not None:
+                sized.append(i)
+        
+        if pooled:
+            buy_pools = [candidates[i].buy.pool for i in pooled]
+            sell_pools = [candidates[i].sell.pool for i in pooled]
+            buy_base = np.array([p.reserve_base for p in buy_pools])
+            sell_base = np.array([p.reserve_base for p in sell_pools])
+            quote_in, base_amount, quote_out = optimal_round_trip(
+                buy_base,
+                np.array([p.reserve_quote for p in buy_pools]),
+                np.array([p.fee for p in buy_pools]),
+                sell_base,
+                np.array([p.reserve_quote for p in sell_pools]),
+                np.array([p.fee for p in sell_pools]),
+                np.minimum(max_size, slippage_limited_base(buy_base, sell_base, self.max_slippage)),
+                self.GAS_COST_PER_UNIT
+            )
+            for i, x, y, z in zip(pooled, quote_in.tolist(), base_amount.tolist(), quote_out.tolist()):
+                fills[i] = Fill(y, x / y, z / y, fees_included=True) if y > 0 else Fill(0.0, 0.0, 0.0)
+        
+        if sized:
+            asks = np.stack([candidates[i].buy.ask_depth for i in sized])
+            bids = np.stack([candidates[i].sell.bid_depth for i in sized])
+            buy_fees = np.array([fee_rates[i][0] for i in sized])
+            sell_fees = np.array([fee_rates[i][1] for i in sized])
+            
+            sizes, buy_prices, sell_prices = solve_optimal_sizes(
+                asks, bids, buy_fees, sell_fees, self.max_slippage,
+                max_size, self.GAS_COST_PER_UNIT
+            )
+            for i, volume, buy_price, sell_price in zip(sized, sizes.tolist(),
+                                                        buy_prices.tolist(), sell_prices.tolist()):
+                fills[i] = Fill(volume, buy_price, sell_price)
+        return fills
     
     async def create_opportunity(self, buy_data: MarketData, sell_data: MarketData, 
-                               price_diff: float, profit_pct: float, direction: str) -> Optional[ArbitrageOpportunity]:
+                               price_diff: float, profit_pct: float, direction: str,
+                               fill: Optional[Fill] = None,
+                               fee_rates: Optional[Tuple[float, float]] = None) -> Optional[ArbitrageOpportunity]:
         """Create an arbitrage opportunity object"""
         try:
-            # Calculate optimal volume
-            max_volume = min(buy_data.volume, sell_data.volume)
-            optimal_volume = min(max_volume, self.max_position_size)
+            if fill is not None:
+                # Depth-aware size and average execution prices
+                if fill.volume <= 0:
+                    return None
+                optimal_volume = fill.volume
+                buy_price, sell_price = fill.buy_price, fill.sell_price
+            else:
+                # Top of book only
+                max_volume = min(buy_data.volume, sell_data.volume)
+                optimal_volume = min(max_volume, self.max_position_size)
+                buy_price, sell_price = buy_data.ask_price, sell_data.bid_price
             
-            # Calculate costs
-            buy_fee = optimal_volume * buy_data.ask_price * self.exchanges[buy_data.exchange]['fee']
-            sell_fee = optimal_volume * sell_data.bid_price * self.exchanges[sell_data.exchange]['fee']
+            # Calculate costs (AMM round trips already pay fees inside the pools)
+            if fill is not None and fill.fees_included:
+                buy_fee = sell_fee = 0.0
+            else:
+                if fee_rates is None:
+                    fee_rates = (self.route_costs.fee_by_venue[buy_data.exchange],
+                                 self.route_costs.fee_by_venue[sell_data.exchange])
+                buy_fee = optimal_volume * buy_price * fee_rates[0]
+                sell_fee = optimal_volume * sell_price * fee_rates[1]
             gas_cost = self.estimate_gas_cost(optimal_volume)
+            # The flash loan funds the whole buy leg and charges a fee on it
+            buy_cost = optimal_volume * buy_price + buy_fee
+            loan_fee = buy_cost * self.flash_loan_fee
             
             # Calculate net profit
-            gross_profit = optimal_volume * price_diff
-            total_costs = buy_fee + sell_fee + gas_cost
+            gross_profit = optimal_volume * (sell_price - buy_price)
+            total_costs = buy_fee + sell_fee + gas_cost + loan_fee
             net_profit = gross_profit - total_costs
             
             # Risk assessment
@@ -288,20 +775,22 @@ class FlashArbitrageEngine:
                     volume=optimal_volume,
                     gas_cost=gas_cost,
                     net_profit=net_profit,
-                    timestamp=time.time(),
+                    timestamp=self.clock.time(),
                     confidence=confidence,
-                    risk_score=risk_score
+                    risk_score=risk_score,
+                    id=route_id(buy_data.token_pair, buy_data.exchange, sell_data.exchange),
+                    buy_cost=buy_cost
                 )
         except Exception as e:
-            logger.error(f"Error creating opportunity: {e}")
+            hot_logger.error("Error creating opportunity: %s", e)
         
         return None
     
     def estimate_gas_cost(self, volume: float) -> float:
         """Estimate gas cost for the arbitrage transaction"""
         # Base gas cost + volume-dependent cost
-        base_cost = 0.001  # 0.001 SOL base cost
-        volume_cost = volume * 0.00001  # 0.00001 SOL per unit volume
+        base_cost = self.BASE_GAS_COST  # 0.001 SOL base cost
+        volume_cost = volume * self.GAS_COST_PER_UNIT  # 0.00001 SOL per unit volume
         return base_cost + volume_cost
     
     def calculate_confidence(self, buy_data: MarketData, sell_data: MarketData) -> float:
@@ -311,12 +800,21 @@ class FlashArbitrageEngine:
         volume_score = min(1.0, (buy_data.volume + sell_data.volume) / 10000)
         
         # Time freshness
-        current_time = time.time()
+        current_time = self.clock.time()
         age_a = current_time - buy_data.timestamp
         age_b = current_time - sell_data.timestamp
         freshness_score = max(0, 1.0 - max(age_a, age_b) / 10.0)  # 10 second decay
         
-        return (liquidity_score + volume_score + freshness_score) / 3.0
+        # Price stability from the rolling volatility of both markets
+        stability_score = max(0, 1.0 - self.get_volatility(buy_data, sell_data) / self.volatility_scale)
+        
+        # Quote quality from the rolling spread and update rate of both markets
+        spread, update_rate = self.get_spread_and_rate(buy_data, sell_data)
+        spread_score = max(0, 1.0 - spread / self.spread_scale)
+        activity_score = min(1.0, update_rate / self.active_update_rate)
+        
+        return (liquidity_score + volume_score + freshness_score + stability_score
+                + spread_score + activity_score) / 6.0
     
     def calculate_risk_score(self, buy_data: MarketData, sell_data: MarketData, volume: float) -> float:
         """Calculate risk score for the opportunity"""
@@ -332,64 +830,266 @@ class FlashArbitrageEngine:
         # Exchange risk (some exchanges are riskier)
         exchange_risk = 0.1  # Base exchange risk
         
-        return (volume_risk + liquidity_risk + exchange_risk) / 3.0
+        # Volatility risk (prices may move before both legs fill)
+        volatility_risk = min(1.0, self.get_volatility(buy_data, sell_data) / self.volatility_scale)
+        
+        # Spread and staleness risk (wide, rarely updated quotes may already be gone)
+        spread, update_rate = self.get_spread_and_rate(buy_data, sell_data)
+        spread_risk = min(1.0, spread / self.spread_scale)
+        staleness_risk = max(0, 1.0 - update_rate / self.active_update_rate)
+        
+        return (volume_risk + liquidity_risk + exchange_risk + volatility_risk
+                + spread_risk + staleness_risk) / 6.0
+    
+    def get_volatility(self, buy_data: MarketData, sell_data: MarketData) -> float:
+        """Larger rolling per-tick volatility of the two legs"""
+        variance = self.market_stats.variance
+        var_a = variance[buy_data.market_id] if buy_data.market_id >= 0 else 0.0
+        var_b = variance[sell_data.market_id] if sell_data.market_id >= 0 else 0.0
+        return float(max(var_a, var_b)) ** 0.5
+    
+    def get_spread_and_rate(self, buy_data: MarketData, sell_data: MarketData) -> Tuple[float, float]:
+        """Wider rolling relative spread and slower update rate of the two legs
+        
+        A leg without statistics yet counts as tight and active, as it
+        counts as calm in get_volatility.
+        """
+        stats = self.market_stats
+        spread, update_rate = 0.0, self.active_update_rate
+        for data in (buy_data, sell_data):
+            if data.market_id >= 0 and stats.count[data.market_id] > 0:
+                spread = max(spread, float(stats.mean_spread[data.market_id]))
+                if stats.count[data.market_id] > 1:
+                    update_rate = min(update_rate, float(stats.update_rate[data.market_id]))
+        return spread, update_rate
     
     async def execute_trades_loop(self):
         """Execute profitable trades"""
-        while self.running:
+        feed = self.feed
+        while self.running and (feed is None or feed.running):
             try:
-                if self.opportunities:
-                    # Execute the best opportunity
-                    best_opportunity = self.opportunities[0]
+                opportunities = self.opportunities
+                if opportunities:
+                    # Execute the best opportunity, within this wallet's position size
+                    best_opportunity = self.fit_position(opportunities[0])
                     
-                    # Risk check
-                    if (best_opportunity.confidence > 0.7 and 
-                        best_opportunity.risk_score < 0.5 and
-                        best_opportunity.net_profit > 0.01):  # Minimum 0.01 SOL profit
+                    # Risk check (the scan may run at a follower's looser threshold)
+                    if (best_opportunity.confidence > self.min_execution_confidence and 
+                        best_opportunity.risk_score < self.max_execution_risk and
+                        best_opportunity.net_profit > self.min_execution_profit and
+                        best_opportunity.profit_potential > self.min_profit_threshold and
+                        best_opportunity.gas_cost < self.max_gas_cost and
+                        self.risk_limits.allowed(self.clock.time())):
                         
+                        started_at = self.clock.time()
+                        stage_start = time.perf_counter()
                         success = await self.execute_arbitrage(best_opportunity)
+                        self.stage_timings.record('execute', time.perf_counter() - stage_start)
+                        self.trade_journal.record(best_opportunity, started_at, self.clock.time(), success)
+                        # A failed attempt still burns its gas
+                        self.risk_limits.record(self.clock.time(), best_opportunity.net_profit
+                                                if success else -best_opportunity.gas_cost)
+                        for listener in self.trade_listeners:
+                            listener(best_opportunity, success)
                         if success:
                             self.successful_trades += 1
                             self.total_profit += best_opportunity.net_profit
-                            logger.info(f"Successful arbitrage: {best_opportunity.net_profit:.4f} SOL profit")
+                            hot_logger.info("Successful arbitrage: %.4f SOL profit", best_opportunity.net_profit,
+                                            fields={'pair': best_opportunity.token_pair,
+                                                    'trades': self.successful_trades})
                         else:
                             self.failed_trades += 1
-                            logger.warning(f"Failed arbitrage attempt")
+                            hot_logger.warning("Failed arbitrage attempt",
+                                               fields={'pair': best_opportunity.token_pair,
+                                                       'failed': self.failed_trades})
                 
-                await asyncio.sleep(0.1)  # 100ms execution interval
+                await self.clock.sleep(0.1)  # 100ms execution interval
                 
             except Exception as e:
-                logger.error(f"Error in trade execution loop: {e}")
-                await asyncio.sleep(1)
+                hot_logger.error("Error in trade execution loop: %s", e)
+                await self.clock.sleep(1)
+    
+    def fit_position(self, opportunity: ArbitrageOpportunity) -> ArbitrageOpportunity:
+        """The opportunity cut down to this engine's max_position_size
+        
+        Opportunities are sized once, by the feed engine. A wallet with a
+        smaller limit trades part of the size: edge and fees scale with
+        volume and gas is re-estimated. Smaller fills walk less of the book
+        or curve, so the scaled profit is a lower bound.
+        """
+        if opportunity.volume <= self.max_position_size:
+            return opportunity
+        scale = self.max_position_size / opportunity.volume
+        gas_cost = self.estimate_gas_cost(self.max_position_size)
+        return replace(opportunity, volume=self.max_position_size, gas_cost=gas_cost,
+                       net_profit=(opportunity.net_profit + opportunity.gas_cost) * scale - gas_cost,
+                       buy_cost=opportunity.buy_cost * scale)
     
     async def execute_arbitrage(self, opportunity: ArbitrageOpportunity) -> bool:
         """Execute flash arbitrage trade"""
         try:
-            logger.info(f"Executing arbitrage: {opportunity.token_pair} "
-                       f"({opportunity.exchange_a} -> {opportunity.exchange_b}) "
-                       f"Profit: {opportunity.net_profit:.4f} SOL")
+            hot_logger.info("Executing arbitrage: %s (%s -> %s)", opportunity.token_pair,
+                            opportunity.exchange_a, opportunity.exchange_b,
+                            fields={'net_profit': opportunity.net_profit, 'volume': opportunity.volume,
+                                    'confidence': opportunity.confidence, 'risk': opportunity.risk_score})
             
-            # Simulate flash loan execution
-            # In real implementation, this would:
-            # 1. Request flash loan
-            # 2. Buy on exchange A
-            # 3. Sell on exchange B
-            # 4. Repay flash loan
-            # 5. Keep profit
+            # One transaction: flash borrow, buy on exchange A, sell on exchange B,
+            # repay; built from the route's cached template
+            stage_start = time.perf_counter()
+            transaction = self.transaction_builder.build(opportunity, (self.feed or self).recent_blockhash)
+            self.stage_timings.record('build', time.perf_counter() - stage_start)
+            
+            if self.execution_mode == 'rpc':
+                response = await self.solana_client.send_raw_transaction(transaction)
+                # Acceptance by the node is not landing: book only what the cluster confirms
+                return await self.confirm_landed(response.value)
             
             # Simulate execution time and success rate
-            await asyncio.sleep(0.05)  # 50ms execution time
+            await self.clock.sleep(0.05)  # 50ms execution time
             
             # Success rate based on confidence and risk
+            import numpy as np
             success_probability = opportunity.confidence * (1 - opportunity.risk_score)
             success = np.random.random() < success_probability
             
             return success
             
         except Exception as e:
-            logger.error(f"Error executing arbitrage: {e}")
+            hot_logger.error("Error executing arbitrage: %s", e)
             return False
     
+    async def confirm_landed(self, signature) -> bool:
+        """Wait until a sent transaction is confirmed; False if it failed on chain
+
+        Raises once the block height passes the blockhash's last valid
+        height without confirmation: the transaction can no longer land.
+        """
+        response = await self.solana_client.confirm_transaction(
+            signature, 'confirmed', last_valid_block_height=(self.feed or self).last_valid_block_height
+        )
+        status = response.value[0]
+        if status.err is not None:
+            hot_logger.warning("Transaction failed on chain: %s", status.err)
+            return False
+        return True
+    
+    async def monitor_loop_lag(self):
+        """Probe event-loop lag while the engine runs"""
+        while self.running:
+            await self.loop_monitor.probe()
+    
+    async def checkpoint_loop(self):
+        """Snapshot state on the loop, write it from an executor thread"""
+        loop = asyncio.get_running_loop()
+        while self.running:
+            await asyncio.sleep(self.checkpoint_interval)
+            if not self.running:
+                break  # stop() writes the final checkpoint
+            try:
+                taken_at = time.monotonic()
+                await loop.run_in_executor(None, self.checkpointer.save, self.checkpoint_state(), taken_at)
+            except Exception as e:
+                logger.error(f"Error writing checkpoint: {e}")
+    
+    def checkpoint_state(self) -> Dict:
+        """State worth keeping across restarts
+        
+        Quotes are replaced, never mutated, so a shallow copy of market_data
+        is a consistent snapshot.
+        """
+        state = {
+            'total_profit': self.total_profit,
+            'successful_trades': self.successful_trades,
+            'failed_trades': self.failed_trades,
+            'risk_limits': self.risk_limits.get_state(),
+        }
+        if self.feed is None:
+            # Market state belongs to the feed engine's checkpoint
+            state.update({
+                'markets': (self.universe.venue_names, self.universe.pair_names),
+                'market_data': dict(self.market_data),
+                'market_stats': self.market_stats.get_state(),
+            })
+        return state
+    
+    def restore_checkpoint(self) -> bool:
+        """Warm start from the last checkpoint
+        
+        Counters are always restored. Quotes and rolling statistics are only
+        restored for an unchanged universe, and quotes past their venue's max
+        age are dropped, so the first scan sees only quotes it could have
+        seen before the restart.
+        """
+        state = self.checkpointer.load()
+        if state is None:
+            return False
+        
+        self.total_profit = state['total_profit']
+        self.successful_trades = state['successful_trades']
+        self.failed_trades = state['failed_trades']
+        if 'risk_limits' in state:
+            self.risk_limits.set_state(state['risk_limits'])
+        
+        restored = 0
+        if self.feed is None and 'markets' in state and \
+                tuple(map(tuple, state['markets'])) == (tuple(self.universe.venue_names),
+                                                        tuple(self.universe.pair_names)):
+            self.market_stats.set_state(state['market_stats'])
+            
+            now = self.clock.time()
+            # Oldest first keeps every venue's expiry deque in deadline order
+            for key, quote in sorted(state['market_data'].items(), key=lambda item: item[1].timestamp):
+                if quote.exchange in self.exchanges and now - quote.timestamp < self.quote_expiry.max_age(quote.exchange):
+                    # Quotes checkpointed before pair ids were stored
+                    quote.pair_id = self.universe.pair_ids[quote.token_pair]
+                    self.market_data[key] = quote
+                    self.quote_expiry.touch(quote.exchange, key, quote.timestamp)
+                    restored += 1
+        
+        logger.info(f"Restored checkpoint from {time.time() - state['saved_at']:.1f}s ago: "
+                    f"{restored} live quotes, {self.successful_trades + self.failed_trades} trades")
+        return True
+    
+    def apply_config(self, config: Dict):
+        """Stage new settings; they take effect together before the next scan
+        
+        Safe to call from other threads (e.g. Flask or the config watcher):
+        only a single reference is published here.
+        """
+        config = {**config, **self.wallet_overrides}
+        self._pending_settings = {
+            name: config[name] for name in self.TUNABLE_SETTINGS if name in config
+        }
+    
+    def swap_pending_settings(self):
+        """Apply staged settings in one step between scans"""
+        pending, self._pending_settings = self._pending_settings, None
+        if not pending:
+            return
+        for name, value in pending.items():
+            setattr(self, name, value)
+        self.config = {**self.config, **pending}
+        self.route_costs = self.build_route_costs()
+        self.scanner.configure(self.max_gas_cost, self.max_slippage)
+        if self._transaction_builder is not None:
+            self._transaction_builder.max_slippage = self.max_slippage
+            self._transaction_builder.min_profit = self.min_execution_profit
+        logger.info(f"Applied configuration update: {pending}")
+    
+    def get_settings(self) -> Dict:
+        """Current values of the tunable settings"""
+        return {name: getattr(self, name) for name in self.TUNABLE_SETTINGS}
+    
+    def get_quote_history(self, exchange: str, pair: str, n: int = None) -> np.ndarray:
+        """Zero-copy view of the last n (timestamp, bid, ask, volume) rows for a market"""
+        market_id = self.universe.venue_ids[exchange] * self.universe.n_pairs + self.universe.pair_ids[pair]
+        return self.quote_history.window(market_id, n)
+    
+    def get_market_stats(self, exchange: str, pair: str) -> Dict:
+        """Rolling volatility, mean spread and update rate for a market"""
+        market_id = self.universe.venue_ids[exchange] * self.universe.n_pairs + self.universe.pair_ids[pair]
+        return self.market_stats.snapshot(market_id)
+    
     def get_statistics(self) -> Dict:
         """Get engine statistics"""
         return {
@@ -398,36 +1098,99 @@ class FlashArbitrageEngine:
             'failed_trades': self.failed_trades,
             'success_rate': self.successful_trades / max(1, self.successful_trades + self.failed_trades),
             'opportunities_count': len(self.opportunities),
+            'live_quotes': len(self.market_data),
+            'expired_quotes': self.quote_expiry.evicted,
+            'history_capacity': self.quote_history.capacity,
+            'history_memory_bytes': self.quote_history.nbytes,
+            'scanner_backend': 'sharded' if self.sharded_scanner else self.scanner.name,
+            'sharded_scanner': self.sharded_scanner.get_statistics() if self.sharded_scanner else None,
+            'trade_journal': self.trade_journal.get_statistics(),
+            'checkpoint': self.checkpointer.get_statistics() if self.checkpoint_interval > 0 else None,
+            'logging': get_logging_statistics(),
+            'loop_lag': self.loop_monitor.get_statistics(),
+            'stages': self.stage_timings.get_statistics(),
+            'risk_limits': self.risk_limits.get_statistics(),
+            'opportunity_feed': self.opportunity_feed.get_statistics(),
+            'market_bus': self.market_bus.get_statistics(),
+            'route_costs': self.route_costs.get_statistics(),
+            'wallets': [self.get_wallet_statistics()] + [f.get_wallet_statistics() for f in self.followers],
+            'running': self.running,
+            'timestamp': self.clock.time()
+        }
+    
+    def get_wallet_statistics(self) -> Dict:
+        """Trading results, limits and settings of this engine's wallet alone"""
+        trades = self.successful_trades + self.failed_trades
+        return {
+            'name': self.name,
+            'wallet_address': self.wallet_address,
+            'feed': self.feed.name if self.feed else None,
+            'total_profit': self.total_profit,
+            'successful_trades': self.successful_trades,
+            'failed_trades': self.failed_trades,
+            'success_rate': self.successful_trades / max(1, trades),
+            'risk_limits': self.risk_limits.get_statistics(),
+            'settings': self.get_settings(),
+            'execution_mode': self.execution_mode,
+            'transactions': self._transaction_builder.get_statistics() if self._transaction_builder else None,
             'running': self.running,
-            'timestamp': time.time()
         }
     
     def get_opportunities(self) -> List[Dict]:
         """Get current opportunities"""
         return [asdict(opp) for opp in self.opportunities[:10]]  # Top 10 opportunities
     
+    def query_opportunities(self, **filters) -> Dict:
+        """Filtered, sorted page of the current opportunities (see OpportunityFeed.query)"""
+        return self.opportunity_feed.query(**filters)
+    
+    def get_opportunity_changes(self, since: Optional[int] = None) -> Dict:
+        """Opportunity adds, updates and removals after seq since (snapshot if too far behind)"""
+        return self.opportunity_feed.changes_since(since)
+    
     async def stop(self):
         """Stop the arbitrage engine"""
-        logger.info("Stopping Flash Arbitrage Engine...")
+        logger.info(f"Stopping Flash Arbitrage Engine ({self.name})...")
         self.running = False
-        await self.solana_client.close()
+        for follower in self.followers:
+            await follower.stop()
+        if self.sharded_scanner is not None:
+            self.sharded_scanner.stop()
+            self.sharded_scanner = None
+        self.trade_journal.stop()
+        if self.checkpoint_interval > 0:
+            # Waits for a periodic write in progress, possibly from another loop's executor,
+            # and supersedes one still queued
+            self.checkpointer.save(self.checkpoint_state())
+        if self._solana_client is not None:
+            await self._solana_client.close()
+            self._solana_client = None
 
-# Global engine instance
+# Global engine instance, and every wallet trading off its market data by name
 engine = None
+engines: Dict[str, FlashArbitrageEngine] = {}
 
 def create_engine(config: Dict) -> FlashArbitrageEngine:
-    """Create and configure the arbitrage engine"""
+    """Create and configure the arbitrage engine and its configured followers"""
     global engine
     engine = FlashArbitrageEngine(config)
+    engines.clear()
+    engines.update({e.name: e for e in [engine] + engine.followers})
     return engine
 
 def get_engine() -> Optional[FlashArbitrageEngine]:
     """Get the global engine instance"""
     return engine
 
+def get_engines() -> Dict[str, FlashArbitrageEngine]:
+    """Every wallet engine by name, the feed engine first"""
+    return engines
+
 if __name__ == "__main__":
     # Load configuration from config.py
     config = get_config()
+    configure_logging(config.get('log_level', 'INFO'), use_queue=config.get('log_queue', True))
+    from loop_monitor import run
     
     logger.info(f"Starting Flash Arbitrage Bot for wallet: {get_wallet_address()}")
     logger.info(f"Configuration: Min Profit: {config['min_profit_threshold']*100:.3f}%, Max Position: {config['max_position_size']} SOL")
@@ -436,7 +1199,7 @@ if __name__ == "__main__":
     arbitrage_engine = create_engine(config)
     
     try:
-        asyncio.run(arbitrage_engine.start())
+        run(arbitrage_engine.start(), loop=config.get('event_loop', 'auto'))
     except KeyboardInterrupt:
         logger.info("Shutting down...")
         asyncio.run(arbitrage_engine.stop())
@@ -5,7 +5,9 @@ Python wrapper for the Flash Arbitrage Engine shared library
 
 import ctypes
 import os
-from typing import Optional, Tuple, List
+import threading
+import time
+from typing import Dict, Optional, Tuple, List
 
 class ArbitrageEngine:
     """Python wrapper for the C++ arbitrage engine"""
@@ -21,6 +23,12 @@ class ArbitrageEngine:
         
         self.lib = ctypes.CDLL(lib_path)
         
+        # Held around reset() and reads of the opportunity list, which a
+        # reset frees; callers hold it to reset, load and scan as one step
+        self.lock = threading.RLock()
+        self._config = None                # Last set_config() arguments, re-applied after a reset
+        self._carried = (0.0, 0, 0)        # Trade results from before the last reset
+        
         # Define function signatures
         self._setup_function_signatures()
         
@@ -96,6 +104,32 @@ class ArbitrageEngine:
             ctypes.c_double(volume)
         )
     
+    def add_quotes(self, rows):
+        """Add many quotes at once
+        
+        Args:
+            rows: (exchange, token_pair, bid_price, ask_price, volume) tuples
+                with exchange and token_pair already UTF-8 encoded
+        """
+        add = self.lib.add_market_data
+        for exchange, token_pair, bid_price, ask_price, volume in rows:
+            add(exchange, token_pair, bid_price, ask_price, volume)
+    
+    def reset(self):
+        """Drop all market data and opportunities the engine has accumulated
+        
+        The library is reinitialized; the last set_config() and the trade
+        results so far are kept.
+        """
+        with self.lock:
+            total_profit, successful, failed, _ = self.get_statistics()
+            self._carried = (total_profit, successful, failed)
+            self.lib.cleanup_engine()
+            if not self.lib.init_arbitrage_engine():
+                raise RuntimeError("Failed to reinitialize arbitrage engine")
+            if self._config is not None:
+                self.lib.set_engine_config(*self._config)
+    
     def scan_opportunities(self) -> int:
         """Scan for arbitrage opportunities
         
@@ -113,7 +147,8 @@ class ArbitrageEngine:
         Returns:
             True if trade was successful, False otherwise
         """
-        return self.lib.execute_trade(ctypes.c_int(opportunity_index))
+        with self.lock:
+            return self.lib.execute_trade(ctypes.c_int(opportunity_index))
     
     def get_statistics(self) -> Tuple[float, int, int, int]:
         """Get engine statistics
@@ -133,10 +168,11 @@ class ArbitrageEngine:
             ctypes.byref(opportunities_count)
         )
         
+        carried_profit, carried_successful, carried_failed = self._carried
         return (
-            total_profit.value,
-            successful_trades.value,
-            failed_trades.value,
+            carried_profit + total_profit.value,
+            carried_successful + successful_trades.value,
+            carried_failed + failed_trades.value,
             opportunities_count.value
         )
     
@@ -174,19 +210,39 @@ class ArbitrageEngine:
             }
         return None
     
+    def get_opportunity_routes(self) -> List[Tuple[bytes, bytes, bytes]]:
+        """(token_pair, exchange_a, exchange_b) of every current opportunity
+        
+        Names are returned UTF-8 encoded, read through one reused set of
+        buffers, for callers that only need the routes.
+        """
+        token_pair = ctypes.create_string_buffer(256)
+        exchange_a = ctypes.create_string_buffer(256)
+        exchange_b = ctypes.create_string_buffer(256)
+        value = ctypes.c_double()
+        details = self.lib.get_opportunity_details
+        
+        routes = []
+        with self.lock:
+            _, _, _, count = self.get_statistics()
+            for i in range(count):
+                if details(i, token_pair, ctypes.byref(value), exchange_a, exchange_b, ctypes.byref(value)):
+                    routes.append((token_pair.value, exchange_a.value, exchange_b.value))
+        return routes
+    
     def get_all_opportunities(self) -> List[dict]:
         """Get details of all current opportunities
         
         Returns:
             List of opportunity dictionaries
         """
-        _, _, _, count = self.get_statistics()
         opportunities = []
-        
-        for i in range(count):
-            opp = self.get_opportunity_details(i)
-            if opp:
-                opportunities.append(opp)
+        with self.lock:
+            _, _, _, count = self.get_statistics()
+            for i in range(count):
+                opp = self.get_opportunity_details(i)
+                if opp:
+                    opportunities.append(opp)
         
         return opportunities
     
@@ -199,11 +255,8 @@ class ArbitrageEngine:
             max_gas: Maximum gas cost in SOL (default 0.005)
             max_slippage: Maximum slippage tolerance (default 2%)
         """
-        self.lib.set_engine_config(
-            ctypes.c_double(min_profit),
-            ctypes.c_double(max_gas),
-            ctypes.c_double(max_slippage)
-        )
+        self._config = (ctypes.c_double(min_profit), ctypes.c_double(max_gas), ctypes.c_double(max_slippage))
+        self.lib.set_engine_config(*self._config)
     
     def stop(self):
         """Stop the arbitrage engine"""
@@ -221,6 +274,72 @@ class ArbitrageEngine:
             pass
 
 
+class MarketDataBridge:
+    """Feeds quotes from a market-bus subscription into the C++ engine
+    
+    Runs on its own thread: whenever quotes are pending it folds them into
+    the latest quote per market, resets the library (which otherwise keeps
+    every quote it was ever given and prices old quotes against new ones)
+    and rescans that set alone. Quotes older than max_quote_age are left
+    out, as the engine's expiry leaves them out of its own scans. If the
+    native side is slower than the collectors, intermediate quotes are
+    conflated in the subscription rather than queued.
+    """
+    
+    def __init__(self, engine: ArbitrageEngine, subscription, interval: float = 0.1,
+                 max_quote_age: float = 10.0):
+        self.engine = engine
+        self.subscription = subscription
+        self.interval = interval
+        self.max_quote_age = max_quote_age
+        self.batches = 0
+        self.quotes = 0
+        # Latest (timestamp, library row) per market key, and its UTF-8 names
+        self._latest: Dict[str, Tuple[float, tuple]] = {}
+        self._names: Dict[str, Tuple[bytes, bytes]] = {}
+        self._stop_event = threading.Event()
+        self._thread = None
+    
+    def start(self) -> 'MarketDataBridge':
+        self._thread = threading.Thread(target=self._run, name='native-bridge', daemon=True)
+        self._thread.start()
+        return self
+    
+    def _run(self):
+        while not self._stop_event.is_set():
+            if not self.subscription.wait(self.interval):
+                continue
+            events = self.subscription.drain()
+            self.rescan(events)
+            self.batches += 1
+            self.quotes += len(events)
+            # Let quotes accumulate (and conflate) between native scans
+            self._stop_event.wait(self.interval)
+    
+    def rescan(self, events):
+        """Fold (topic, key, quote) events into the latest quotes and rescan them from a clean library"""
+        latest, names = self._latest, self._names
+        for _, key, quote in events:
+            encoded = names.get(key)
+            if encoded is None:
+                encoded = names[key] = (quote.exchange.encode('utf-8'), quote.token_pair.encode('utf-8'))
+            latest[key] = (quote.timestamp, encoded + (quote.bid_price, quote.ask_price, quote.volume))
+        cutoff = time.time() - self.max_quote_age
+        for key in [key for key, (timestamp, _) in latest.items() if timestamp < cutoff]:
+            del latest[key]
+        
+        with self.engine.lock:
+            self.engine.reset()
+            self.engine.add_quotes(row for _, row in latest.values())
+            self.engine.scan_opportunities()
+    
+    def stop(self):
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval * 4 + 1)
+            self._thread = None
+
+
 # Example usage
 if __name__ == "__main__":
     # Initialize the engine
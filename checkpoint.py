@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Engine checkpoints for the Flash Arbitrage Engine
+Atomic snapshots of counters, last quotes and rolling statistics so a
+restarted engine can resume scanning immediately
+"""
+
+import logging
+import os
+import pickle
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINT_FILE = Path(__file__).parent / 'engine_checkpoint.pkl'
+
+# Bumped whenever the layout of the saved state changes
+CHECKPOINT_VERSION = 1
+
+class EngineCheckpoint:
+    """Write-then-rename checkpoint file
+
+    The engine builds the state dict on the event loop (a shallow copy of
+    its quotes plus a few small arrays) and hands it to save() on an executor
+    thread, so pickling and disk I/O stay off the hot loop. A crash mid-write
+    leaves the previous checkpoint intact. The file is a local pickle and
+    must only ever be loaded from a trusted path.
+
+    Saves are serialized, so a final save on shutdown never shares the
+    temporary file with a periodic save still running on the executor, and
+    a save is skipped if a state taken later has already been written: a
+    periodic save that reaches the lock after the final one cannot undo it.
+    """
+
+    def __init__(self, path: Path = CHECKPOINT_FILE):
+        self.path = Path(path)
+        self.saves = 0
+        self.superseded = 0
+        self.last_saved = None
+        self.last_duration = 0.0
+        self._lock = threading.Lock()
+        self._written_taken_at = float('-inf')
+
+    def save(self, state: Dict, taken_at: float = None):
+        """Write state, taken at time.monotonic() taken_at (default: now)"""
+        if taken_at is None:
+            taken_at = time.monotonic()
+        with self._lock:
+            if taken_at < self._written_taken_at:
+                self.superseded += 1
+                return
+            start = time.perf_counter()
+            payload = {'version': CHECKPOINT_VERSION, 'saved_at': time.time(), 'state': state}
+            tmp_path = self.path.with_suffix(self.path.suffix + '.tmp')
+            try:
+                with open(tmp_path, 'wb') as f:
+                    pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(tmp_path, self.path)
+            except Exception as e:
+                logger.error(f"Could not write checkpoint {self.path}: {e}")
+                return
+            self._written_taken_at = taken_at
+            self.saves += 1
+            self.last_saved = payload['saved_at']
+            self.last_duration = time.perf_counter() - start
+
+    def load(self) -> Optional[Dict]:
+        """Saved state with its 'saved_at' time, or None if there is no usable checkpoint"""
+        try:
+            with open(self.path, 'rb') as f:
+                payload = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable checkpoint {self.path}: {e}")
+            return None
+
+        if payload.get('version') != CHECKPOINT_VERSION:
+            logger.warning(f"Ignoring checkpoint {self.path} with version {payload.get('version')}")
+            return None
+        return {**payload['state'], 'saved_at': payload['saved_at']}
+
+    def get_statistics(self) -> Dict:
+        return {
+            'path': str(self.path),
+            'saves': self.saves,
+            'superseded': self.superseded,
+            'last_saved': self.last_saved,
+            'last_duration_ms': self.last_duration * 1000.0,
+        }
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Clocks for the Flash Arbitrage Engine
+The engine reads time and sleeps only through a clock, so the same code
+runs against wall time or against a virtual clock that jumps from event
+to event for backtests
+"""
+
+import asyncio
+import heapq
+import itertools
+import time
+from typing import Callable, Optional
+
+class RealClock:
+    """Wall-clock time and asyncio sleeps"""
+
+    realtime = True
+
+    def time(self) -> float:
+        return time.time()
+
+    async def sleep(self, seconds: float):
+        await asyncio.sleep(seconds)
+
+    def track(self, coro):
+        return coro
+
+class VirtualClock:
+    """Discrete-event clock: time only moves when every tracked task is asleep
+
+    Engine loops are started through track(). Each sleep() parks its task
+    on a timer heap; once the number of parked timers reaches the number of
+    live tracked tasks nothing else can happen before the earliest deadline,
+    so the clock jumps there and wakes that task. Timers with equal deadlines
+    wake in the order they were set, which makes runs fully deterministic.
+    Tracked tasks must not wait on anything but this clock.
+
+    When the next deadline would pass `end`, on_end() is called (typically
+    to clear the engine's running flag) and every sleeper is released so
+    the loops can exit.
+    """
+
+    realtime = False
+
+    def __init__(self, start: float = 0.0, end: float = float('inf'),
+                 on_end: Optional[Callable[[], None]] = None):
+        self.now = start
+        self.end = end
+        self.on_end = on_end
+        self.ended = False
+        self.events = 0
+
+        self._timers = []
+        self._seq = itertools.count()
+        self._active = 0
+        self._advance_pending = False
+
+    def time(self) -> float:
+        return self.now
+
+    async def sleep(self, seconds: float):
+        if self.ended:
+            return
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._timers, (self.now + max(0.0, seconds), next(self._seq), future))
+        self._schedule_advance()
+        await future
+
+    async def _tracked(self, coro):
+        self._active += 1
+        try:
+            return await coro
+        finally:
+            self._active -= 1
+            self._schedule_advance()
+
+    def track(self, coro):
+        """Wrap an engine loop so the clock knows when it is asleep"""
+        return self._tracked(coro)
+
+    def _schedule_advance(self):
+        if not self._advance_pending and self._timers and len(self._timers) >= self._active:
+            self._advance_pending = True
+            asyncio.get_running_loop().call_soon(self._advance)
+
+    def _advance(self):
+        self._advance_pending = False
+        if not self._timers or len(self._timers) < self._active:
+            return
+
+        deadline = self._timers[0][0]
+        if deadline > self.end:
+            self.now = self.end
+            self.ended = True
+            if self.on_end is not None:
+                self.on_end()
+            while self._timers:
+                heapq.heappop(self._timers)[2].set_result(None)
+            return
+
+        self.now = deadline
+        while self._timers and self._timers[0][0] == deadline:
+            heapq.heappop(self._timers)[2].set_result(None)
+            self.events += 1
@@ -5,9 +5,12 @@ Windows-compatible with proper encoding handling
 """
 
 import os
+import copy
 import json
 from pathlib import Path
 
+from config import validate_config as _validate_settings
+
 # Configuration file path
 CONFIG_FILE = Path(__file__).parent / 'bot_config.json'
 
@@ -32,29 +35,56 @@ DEFAULT_CONFIG = {
     }
 }
 
+# In-memory copy of the parsed config file, keyed by its (mtime, size)
+_config_cache = None
+_config_stamp = None
+
+def _file_stamp():
+    """Cheap change detector for the config file"""
+    try:
+        stat = CONFIG_FILE.stat()
+        return (stat.st_mtime_ns, stat.st_size)
+    except OSError:
+        return None
+
 def load_config():
-    """Load configuration from file with proper encoding"""
+    """Load configuration from file with proper encoding
+
+    The parsed file is cached and only re-read when its mtime or size
+    changes. Callers get a deep copy, so editing nested settings such as
+    exchanges never alters the cache.
+    """
+    global _config_cache, _config_stamp
     try:
-        if CONFIG_FILE.exists():
+        stamp = _file_stamp()
+        if stamp is not None and stamp == _config_stamp:
+            return copy.deepcopy(_config_cache)
+        
+        if stamp is not None:
             with open(CONFIG_FILE, 'r', encoding='utf-8') as f:
                 config = json.load(f)
                 # Merge with defaults to ensure all keys exist
-                merged_config = DEFAULT_CONFIG.copy()
+                merged_config = copy.deepcopy(DEFAULT_CONFIG)
                 merged_config.update(config)
-                return merged_config
+                _config_cache, _config_stamp = merged_config, stamp
+                return copy.deepcopy(merged_config)
         else:
             # Create default config file
             save_config(DEFAULT_CONFIG)
-            return DEFAULT_CONFIG.copy()
+            return copy.deepcopy(DEFAULT_CONFIG)
     except Exception as e:
         print(f"Warning: Could not load config file: {e}")
-        return DEFAULT_CONFIG.copy()
+        return copy.deepcopy(DEFAULT_CONFIG)
 
 def save_config(config):
     """Save configuration to file with proper encoding"""
+    global _config_cache, _config_stamp
     try:
         with open(CONFIG_FILE, 'w', encoding='utf-8') as f:
             json.dump(config, f, indent=2, ensure_ascii=False)
+        merged_config = copy.deepcopy(DEFAULT_CONFIG)
+        merged_config.update(copy.deepcopy(config))
+        _config_cache, _config_stamp = merged_config, _file_stamp()
         return True
     except Exception as e:
         print(f"Warning: Could not save config file: {e}")
@@ -106,27 +136,13 @@ def get_exchange_status():
     
     return status
 
-def validate_config():
-    """Validate configuration values"""
-    config = load_config()
-    errors = []
-    
-    # Validate wallet address
-    wallet = config.get('wallet_address', '')
-    if not wallet or len(wallet) < 32:
-        errors.append("Invalid wallet address")
-    
-    # Validate profit threshold
-    profit_threshold = config.get('min_profit_threshold', 0)
-    if profit_threshold <= 0 or profit_threshold > 1:
-        errors.append("Profit threshold must be between 0 and 1")
-    
-    # Validate position size
-    position_size = config.get('max_position_size', 0)
-    if position_size <= 0:
-        errors.append("Position size must be greater than 0")
-    
-    return len(errors) == 0, errors
+def validate_config(config=None):
+    """Validate configuration values (the loaded file when no config is given)
+
+    Uses the validator in config.py, so both configuration modules accept
+    exactly the same settings.
+    """
+    return _validate_settings(load_config() if config is None else config)
 
 if __name__ == "__main__":
     # Test configuration
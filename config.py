@@ -18,11 +18,22 @@ BOT_CONFIG = {
     'max_gas_cost': 0.02,            # 0.02 SOL max gas cost
     'max_slippage': 0.03,            # 3% max slippage
     'max_position_size': 5000.0,     # Increased position size for higher profits
+    'book_depth_levels': 5,          # Order book levels per market (0 = top of book only)
     
     # Risk Management
+    'min_execution_confidence': 0.7, # Only execute above this confidence
+    'max_execution_risk': 0.5,       # Only execute below this risk score
+    'min_execution_profit': 0.01,    # Minimum net profit per trade in SOL
     'max_daily_trades': 1000,        # Maximum trades per day
     'max_daily_loss': 10.0,          # Maximum daily loss in SOL
-    'stop_loss_percentage': 0.05,    # 5% stop loss
+    'stop_loss_percentage': 0.05,    # 5% stop loss (drawdown from peak, halts until reset)
+    'trading_capital': 100.0,        # SOL the stop loss percentage applies to
+    
+    # Further wallets trading off the same market data, each a dict with a
+    # name, a wallet_address and any settings above that differ for it, e.g.
+    # {'name': 'cautious', 'wallet_address': '...', 'min_execution_confidence': 0.85,
+    #  'max_position_size': 500.0, 'trading_capital': 20.0, 'max_daily_loss': 2.0}
+    'wallet_strategies': [],
     
     # Exchange Settings
     'exchanges': {
@@ -52,11 +63,37 @@ BOT_CONFIG = {
     'solana_rpc_url': 'https://api.mainnet-beta.solana.com',
     'solana_ws_url': 'wss://api.mainnet-beta.solana.com',
     
+    # Flash-loan transactions, built from per-route templates
+    'execution_mode': 'simulated',       # 'simulated' (build and sign, never send) or 'rpc' (needs private_key,
+                                         # a local stand-in RPC and every traded pool and mint in solana_addresses)
+    'blockhash_refresh_interval': 10.0,  # Seconds between latest-blockhash fetches in 'rpc' mode
+    'solana_addresses': {},              # Token mints by symbol and pools by "venue:pair"; unset ones are stand-ins
+    'lookup_tables': {},                 # Address lookup tables: table address -> addresses it holds
+    'flash_loan_fee': 0.0009,            # Fraction of the borrowed quote the lending program charges
+    
     # Advanced Settings
     'enable_flash_loans': True,
     'enable_cpp_engine': True,
+    'scanner_backend': 'python',     # 'python', 'numpy', 'native' or 'auto' (benchmark at startup)
+    'scan_workers': 0,               # >0 scans shards of token_pairs in worker processes
     'log_level': 'INFO',
+    'log_queue': True,               # Write log records from a background listener thread
+    'log_throttle_interval': 5.0,    # Seconds between repeats of a hot-loop log message
     'update_interval': 0.1,  # 100ms update interval for maximum speed
+    'event_loop': 'auto',            # 'uvloop', 'asyncio' or 'auto' (uvloop when installed)
+    'loop_lag_interval': 0.05,       # Seconds between event-loop lag probes
+    'profiling_token': None,         # Enables /api/profile for requests sending this X-Profile-Token
+    'max_quote_age': 10.0,           # Seconds before a quote is evicted from scanning
+    'venue_max_quote_age': {},       # Per-exchange overrides, e.g. {'serum': 2.0}
+    'history_length': 256,           # Quotes kept per (exchange, pair)
+    'history_memory_mb': 64,         # Hard cap on quote history memory
+    'stats_halflife_ticks': 20.0,    # Half-life of rolling volatility/spread statistics
+    'volatility_scale': 0.005,       # Per-tick volatility scored as fully unstable
+    'spread_scale': 0.01,            # Mean relative spread scored as fully unstable
+    'active_update_rate': 1.0,       # Quote updates per second scored as fully active
+    'trade_journal_file': None,      # SQLite trade journal (None = trades.db next to the engine)
+    'checkpoint_file': None,         # Warm-restart checkpoint (None = engine_checkpoint.pkl)
+    'checkpoint_interval': 5.0,      # Seconds between checkpoints (0 disables checkpointing)
     
     # Profit Optimization
     'compound_profits': True,
@@ -102,6 +139,161 @@ def get_wallet_address():
     """Get the current wallet address"""
     return BOT_CONFIG['wallet_address']
 
+# Numeric settings: key -> (description, minimum, maximum, minimum itself allowed)
+NUMERIC_RANGES = {
+    'min_profit_threshold': ("Profit threshold", 0, 1, False),
+    'max_gas_cost': ("Max gas cost", 0, None, True),
+    'max_slippage': ("Slippage", 0, 1, True),
+    'max_position_size': ("Position size", 0, None, False),
+    'book_depth_levels': ("Book depth levels", 0, None, True),
+    'min_execution_confidence': ("Execution confidence", 0, 1, True),
+    'max_execution_risk': ("Execution risk", 0, 1, True),
+    'min_execution_profit': ("Minimum execution profit", 0, None, True),
+    'max_daily_trades': ("Max daily trades", 0, None, False),
+    'max_daily_loss': ("Max daily loss", 0, None, True),
+    'stop_loss_percentage': ("Stop loss percentage", 0, 1, True),
+    'trading_capital': ("Trading capital", 0, None, False),
+    'blockhash_refresh_interval': ("Blockhash refresh interval", 0, None, False),
+    'flash_loan_fee': ("Flash loan fee", 0, 1, True),
+    'scan_workers': ("Scan workers", 0, None, True),
+    'log_throttle_interval': ("Log throttle interval", 0, None, True),
+    'update_interval': ("Update interval", 0, None, False),
+    'loop_lag_interval': ("Loop lag interval", 0, None, False),
+    'max_quote_age': ("Max quote age", 0, None, False),
+    'history_length': ("History length", 0, None, False),
+    'history_memory_mb': ("History memory", 0, None, False),
+    'stats_halflife_ticks': ("Statistics half-life", 0, None, False),
+    'volatility_scale': ("Volatility scale", 0, None, False),
+    'spread_scale': ("Spread scale", 0, None, False),
+    'active_update_rate': ("Active update rate", 0, None, False),
+    'checkpoint_interval': ("Checkpoint interval", 0, None, True),
+    'reinvest_percentage': ("Reinvest percentage", 0, 1, True),
+    'reserve_percentage': ("Reserve percentage", 0, 1, True),
+}
+INTEGER_SETTINGS = {'book_depth_levels', 'max_daily_trades', 'scan_workers', 'history_length'}
+REQUIRED_SETTINGS = {'min_profit_threshold', 'max_position_size'}
+
+# Settings limited to a fixed set of values
+CHOICES = {
+    'execution_mode': ('simulated', 'rpc'),
+    'scanner_backend': ('python', 'numpy', 'native', 'auto'),
+    'event_loop': ('uvloop', 'asyncio', 'auto'),
+    'log_level': ('DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL'),
+}
+
+# Hosts 'rpc' execution may send to: tx_builder's instruction layouts are
+# stand-ins, so only the local stand-in RPC (standin_rpc.py) may receive them
+LOCAL_RPC_HOSTS = ('localhost', '127.0.0.1', '::1')
+
+def is_local_rpc(url) -> bool:
+    """Whether an RPC URL points at this machine"""
+    from urllib.parse import urlparse
+
+    return isinstance(url, str) and urlparse(url).hostname in LOCAL_RPC_HOSTS
+
+def _rpc_errors(config):
+    """Errors keeping 'rpc' execution off real clusters and stand-in accounts"""
+    from token_universe import UNIVERSE_FILE, TokenUniverse
+
+    errors = []
+    url = config.get('solana_rpc_url')
+    if not is_local_rpc(url):
+        errors.append(f"Execution mode 'rpc' only sends to a local stand-in RPC until the transaction "
+                      f"layouts match the real programs: {url!r}")
+
+    # Every pool a route can touch and every mint of its pair
+    venues = list(config.get('exchanges') or BOT_CONFIG['exchanges'])
+    try:
+        universe = TokenUniverse.load(config.get('token_universe_file') or UNIVERSE_FILE, venues=venues)
+    except FileNotFoundError:
+        universe = TokenUniverse.default(venues)
+    needed = {key for keys in universe.venue_market_keys for key in keys}
+    needed.update(token for pairs in universe.venue_pair_names for pair in pairs for token in pair.split('/'))
+    missing = sorted(needed - set(config.get('solana_addresses') or {}))
+    if missing:
+        shown = ', '.join(missing[:5]) + (', ...' if len(missing) > 5 else '')
+        errors.append(f"Execution mode 'rpc' needs solana_addresses for every traded pool and mint; "
+                      f"{len(missing)} missing: {shown}")
+    return errors
+
+def _range_errors(key, value, label):
+    """Errors for one numeric setting, or [] when it is in range"""
+    description, low, high, low_allowed = NUMERIC_RANGES[key]
+    description = f"{label}{description}"
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or value != value:
+        return [f"{description} must be a number, got {value!r}"]
+    if key in INTEGER_SETTINGS and value != int(value):
+        return [f"{description} must be a whole number"]
+    too_low = value < low or (value == low and not low_allowed)
+    if high is not None and (too_low or value > high):
+        return [f"{description} must be between {low} and {high}"]
+    if too_low:
+        return [f"{description} cannot be negative" if low_allowed else f"{description} must be greater than {low}"]
+    return []
+
+def _settings_errors(settings, label="", required=()):
+    """Range and choice errors for the settings present in a config or override dict"""
+    errors = []
+    for key in NUMERIC_RANGES:
+        if key in settings:
+            errors.extend(_range_errors(key, settings[key], label))
+        elif key in required:
+            errors.extend(_range_errors(key, None, label))
+    for key, choices in CHOICES.items():
+        if key in settings and settings[key] not in choices:
+            errors.append(f"{label}{key} must be one of {', '.join(choices)}: {settings[key]!r}")
+    return errors
+
+def validate_config(config=None):
+    """Validate configuration values
+
+    The one validator for every configuration source: config-windows-fixed
+    and the config service call it too. Unknown keys pass; every known
+    numeric setting must be a number within its range.
+    """
+    if config is None:
+        config = BOT_CONFIG
+    errors = []
+    
+    # Validate wallet address
+    wallet = config.get('wallet_address', '')
+    if not isinstance(wallet, str) or len(wallet) < 32:
+        errors.append("Invalid wallet address")
+    
+    # Validate numeric ranges and choices
+    errors.extend(_settings_errors(config, required=REQUIRED_SETTINGS))
+    
+    venue_ages = config.get('venue_max_quote_age') or {}
+    if not isinstance(venue_ages, dict):
+        errors.append("venue_max_quote_age must map exchanges to seconds")
+    else:
+        for venue, age in venue_ages.items():
+            if isinstance(age, bool) or not isinstance(age, (int, float)) or not age > 0:
+                errors.append(f"Max quote age for {venue} must be a number greater than 0: {age!r}")
+    
+    # Validate additional wallets and the settings they override
+    names = set()
+    for wallet in config.get('wallet_strategies') or []:
+        name = wallet.get('name')
+        if not name or name in names or name == 'primary':
+            errors.append(f"Wallet strategy needs a unique name other than 'primary': {name!r}")
+        names.add(name)
+        if not wallet.get('wallet_address') or len(wallet['wallet_address']) < 32:
+            errors.append(f"Invalid wallet address for wallet strategy {name!r}")
+        errors.extend(_settings_errors(wallet, label=f"Wallet strategy {name!r}: "))
+    
+    # Validate execution
+    sends = False
+    for wallet in [config] + list(config.get('wallet_strategies') or []):
+        mode = wallet.get('execution_mode', config.get('execution_mode', 'simulated'))
+        if mode == 'rpc' and not wallet.get('private_key'):
+            errors.append(f"Execution mode 'rpc' needs a private key for wallet {wallet.get('name', 'primary')!r}")
+        sends = sends or mode == 'rpc'
+    if sends:
+        errors.extend(_rpc_errors(config))
+    
+    return len(errors) == 0, errors
+
 if __name__ == "__main__":
     print("Flash Arbitrage Bot Configuration")
     print("=================================")
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Configuration service for Flash Arbitrage Bot
+Keeps a validated in-memory copy of bot_config.json, reloads it only when
+the file changes and pushes new settings to subscribers such as the engine
+"""
+
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+from config import get_config, validate_config
+
+logger = logging.getLogger(__name__)
+
+# Overrides file layered on top of config.BOT_CONFIG
+CONFIG_FILE = Path(__file__).parent / 'bot_config.json'
+
+class ConfigService:
+    """Cached, mtime-watched configuration with change notification"""
+
+    def __init__(self, path: Path = CONFIG_FILE, defaults: Dict = None,
+                 poll_interval: float = 1.0):
+        self.path = Path(path)
+        self.defaults = dict(defaults if defaults is not None else get_config())
+        self.poll_interval = poll_interval
+
+        self._lock = threading.Lock()
+        self._subscribers: List[Callable[[Dict], None]] = []
+        self._stamp = None
+        self._config = dict(self.defaults)
+        self._watcher = None
+        self._stop_event = threading.Event()
+
+        self.reload_if_changed()
+
+    def get(self) -> Dict:
+        """Current configuration; never touches the disk"""
+        return self._config
+
+    def subscribe(self, callback: Callable[[Dict], None]):
+        """Call callback(config) whenever a new configuration is accepted"""
+        self._subscribers.append(callback)
+
+    def unsubscribe(self, callback: Callable[[Dict], None]):
+        if callback in self._subscribers:
+            self._subscribers.remove(callback)
+
+    def _file_stamp(self):
+        try:
+            stat = self.path.stat()
+            return (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            return None
+
+    def reload_if_changed(self) -> bool:
+        """Re-read the file if its mtime or size changed
+
+        Returns:
+            True if a new configuration was accepted
+        """
+        stamp = self._file_stamp()
+        if stamp is None or stamp == self._stamp:
+            return False
+
+        with self._lock:
+            self._stamp = stamp
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    overrides = json.load(f)
+            except Exception as e:
+                logger.error(f"Could not load {self.path}: {e}")
+                return False
+
+            # The file is the whole override set, so start from the defaults
+            ok, errors = self._accept(overrides, base=self.defaults)
+        if not ok:
+            logger.error(f"Rejected {self.path}: {errors}")
+        return ok
+
+    def update(self, changes: Dict) -> Tuple[bool, List[str]]:
+        """Validate, persist and publish a partial configuration update"""
+        with self._lock:
+            ok, errors = self._accept(changes)
+            if ok:
+                self._write(changes)
+        return ok, errors
+
+    def _accept(self, changes: Dict, base: Dict = None) -> Tuple[bool, List[str]]:
+        """Validate the merged config and swap it in as one reference"""
+        candidate = dict(self._config if base is None else base)
+        candidate.update(changes)
+        ok, errors = validate_config(candidate)
+        if not ok:
+            return False, errors
+
+        self._config = candidate
+        for callback in list(self._subscribers):
+            try:
+                callback(candidate)
+            except Exception as e:
+                logger.error(f"Config subscriber failed: {e}")
+        return True, []
+
+    def _write(self, changes: Dict):
+        """Atomically merge changes into the overrides file"""
+        try:
+            overrides = {}
+            if self.path.exists():
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    overrides = json.load(f)
+            overrides.update(changes)
+
+            tmp_path = self.path.with_suffix('.json.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(overrides, f, indent=2, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+            # Our own write must not look like an external change
+            self._stamp = self._file_stamp()
+        except Exception as e:
+            logger.error(f"Could not save {self.path}: {e}")
+
+    def start_watching(self):
+        """Poll the file's mtime in a background thread"""
+        if self._watcher is not None:
+            return
+
+        def watch():
+            while not self._stop_event.wait(self.poll_interval):
+                self.reload_if_changed()
+
+        self._stop_event.clear()
+        self._watcher = threading.Thread(target=watch, name='config-watcher', daemon=True)
+        self._watcher.start()
+
+    def stop_watching(self):
+        if self._watcher is not None:
+            self._stop_event.set()
+            self._watcher.join(timeout=self.poll_interval * 2)
+            self._watcher = None
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Logging setup for the Flash Arbitrage Engine
+Records go through a queue to a background listener, repeated hot-path
+messages are rate-limited and structured fields are appended as key=value
+"""
+
+import atexit
+import logging
+import logging.handlers
+import queue
+import time
+from typing import Dict, Optional
+
+LOG_FORMAT = '%(levelname)s:%(name)s:%(message)s'
+
+class LazyQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that leaves formatting to the listener thread
+
+    The stock handler formats every record before enqueueing it, which puts
+    the formatting cost back on the caller. Records here keep their msg and
+    args untouched; callers pass immutable args (numbers, strings), so
+    formatting them later on another thread gives the same text. The queue
+    is bounded and a full queue drops the record instead of blocking.
+    """
+
+    def __init__(self, records: queue.Queue):
+        super().__init__(records)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        if record.exc_info:
+            # Tracebacks reference live frames; render them now
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+class ThrottledLogger:
+    """Logger wrapper that lets each message template through once per interval
+
+    Hot loops log through this so a failure repeating every iteration costs
+    a dict lookup, not a LogRecord. Messages must use %-style args: the
+    template is the key, so 'Error collecting market data from %s: %s' is
+    limited however many distinct errors it carries. The next message let
+    through reports how many were suppressed in between.
+    """
+
+    suppressed_total = 0
+
+    def __init__(self, logger: logging.Logger, interval: float = 5.0):
+        self.logger = logger
+        self.interval = interval
+        self._last: Dict[str, float] = {}
+        self._suppressed: Dict[str, int] = {}
+
+    def log(self, level: int, msg: str, *args, fields: Dict = None, **kwargs):
+        if not self.logger.isEnabledFor(level):
+            return
+        now = time.monotonic()
+        last = self._last.get(msg)
+        if last is not None and now - last < self.interval:
+            self._suppressed[msg] = self._suppressed.get(msg, 0) + 1
+            ThrottledLogger.suppressed_total += 1
+            return
+        self._last[msg] = now
+
+        suppressed = self._suppressed.pop(msg, 0)
+        if suppressed:
+            fields = {**(fields or {}), 'suppressed': suppressed}
+        if fields:
+            kwargs['extra'] = {**kwargs.get('extra', {}), 'fields': fields}
+        self.logger.log(level, msg, *args, **kwargs)
+
+    def debug(self, msg: str, *args, **kwargs):
+        self.log(logging.DEBUG, msg, *args, **kwargs)
+
+    def info(self, msg: str, *args, **kwargs):
+        self.log(logging.INFO, msg, *args, **kwargs)
+
+    def warning(self, msg: str, *args, **kwargs):
+        self.log(logging.WARNING, msg, *args, **kwargs)
+
+    def error(self, msg: str, *args, **kwargs):
+        self.log(logging.ERROR, msg, *args, **kwargs)
+
+class StructuredFormatter(logging.Formatter):
+    """Append record.fields (passed as extra={'fields': {...}}) as key=value pairs"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        text = super().format(record)
+        fields = getattr(record, 'fields', None)
+        if fields:
+            text += ' ' + ' '.join(f"{name}={value}" for name, value in fields.items())
+        return text
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_handler: Optional[logging.Handler] = None
+
+def configure_logging(level='INFO', use_queue: bool = True, max_queue: int = 10000):
+    """Install logging on the root logger, once per process
+
+    With use_queue=False this is logging.basicConfig plus the structured
+    formatter, for scripts and debugging. Later calls only change the level.
+    """
+    global _listener, _handler
+    root = logging.getLogger()
+    root.setLevel(level)
+    if _handler is not None:
+        return
+
+    output = logging.StreamHandler()
+    output.setFormatter(StructuredFormatter(LOG_FORMAT))
+
+    if use_queue:
+        _handler = LazyQueueHandler(queue.Queue(maxsize=max_queue))
+        _listener = logging.handlers.QueueListener(_handler.queue, output, respect_handler_level=True)
+        _listener.start()
+        atexit.register(shutdown_logging)
+    else:
+        _handler = output
+    root.addHandler(_handler)
+
+def shutdown_logging():
+    """Flush queued records and stop the listener thread"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+def get_logging_statistics() -> Dict:
+    return {
+        'queued': _listener is not None,
+        'pending': _listener.queue.qsize() if _listener is not None else 0,
+        'dropped': getattr(_handler, 'dropped', 0),
+        'suppressed': ThrottledLogger.suppressed_total,
+    }
+
+if __name__ == "__main__":
+    configure_logging('INFO')
+    logger = logging.getLogger('demo')
+    hot_logger = ThrottledLogger(logger, interval=1.0)
+
+    start = time.perf_counter()
+    for i in range(5000):
+        logger.info("Executing arbitrage %s (%s -> %s)", 'SOL/USDC', 'orca', 'serum',
+                    extra={'fields': {'attempt': i}})
+    queued = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for i in range(100000):
+        hot_logger.error("Error in hot loop: %s", i)
+    throttled = time.perf_counter() - start
+
+    shutdown_logging()
+    print(f"Queued INFO: {queued / 5000 * 1e6:.2f} us per call, "
+          f"throttled ERROR: {throttled / 100000 * 1e6:.2f} us per call, "
+          f"{get_logging_statistics()}")
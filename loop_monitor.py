@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Event-loop monitoring for the Flash Arbitrage Engine
+Measures how far the loop falls behind its schedule and runs the engine on
+uvloop when it is installed
+"""
+
+import asyncio
+import time
+from typing import Dict, Tuple
+
+import numpy as np
+
+class LoopLagMonitor:
+    """Probe task that measures event-loop lag
+
+    Every interval the probe sleeps and records how much later than
+    requested it woke up. That overshoot is exactly how long ready callbacks
+    (collectors, scans, executions) kept the loop busy, so it is the delay
+    any other task would have seen too. The last `window` samples are kept
+    in a ring for percentiles.
+    """
+
+    def __init__(self, interval: float = 0.05, window: int = 1024):
+        self.interval = interval
+        self._lags = np.zeros(window)
+        self._count = 0
+        self.max_lag = 0.0
+        self.loop_name = None
+        self.running = False
+
+    def record(self, lag: float):
+        self._lags[self._count % len(self._lags)] = lag
+        self._count += 1
+        if lag > self.max_lag:
+            self.max_lag = lag
+
+    async def probe(self):
+        """Sleep one interval and record the overshoot"""
+        if self.loop_name is None:
+            self.loop_name = type(asyncio.get_running_loop()).__module__.split('.')[0]
+        expected = time.perf_counter() + self.interval
+        await asyncio.sleep(self.interval)
+        self.record(max(0.0, time.perf_counter() - expected))
+
+    async def run(self):
+        """Probe until stop()"""
+        self.running = True
+        while self.running:
+            await self.probe()
+
+    def stop(self):
+        self.running = False
+
+    def get_statistics(self) -> Dict:
+        samples = self._lags[:min(self._count, len(self._lags))]
+        if len(samples) == 0:
+            return {'samples': 0}
+        p50, p99 = np.percentile(samples, [50, 99])
+        return {
+            'samples': self._count,
+            'mean_ms': float(samples.mean() * 1000.0),
+            'p50_ms': float(p50 * 1000.0),
+            'p99_ms': float(p99 * 1000.0),
+            'max_ms': self.max_lag * 1000.0,
+            'loop': self.loop_name,
+        }
+
+def new_event_loop_factory(name: str = 'auto') -> Tuple[str, callable]:
+    """Loop implementation to run on: 'uvloop', 'asyncio' or 'auto' (uvloop if installed)"""
+    if name in ('auto', 'uvloop'):
+        try:
+            import uvloop
+            return 'uvloop', uvloop.new_event_loop
+        except ImportError:
+            if name == 'uvloop':
+                raise
+    return 'asyncio', asyncio.new_event_loop
+
+def run(coro, loop: str = 'auto'):
+    """asyncio.run on the chosen loop implementation"""
+    name, factory = new_event_loop_factory(loop)
+    if not hasattr(asyncio, 'Runner'):
+        # Python < 3.11 has no asyncio.Runner: install uvloop's policy instead
+        if name == 'uvloop':
+            import uvloop
+            uvloop.install()
+        return asyncio.run(coro)
+    with asyncio.Runner(loop_factory=factory) as runner:
+        return runner.run(coro)
+
+if __name__ == "__main__":
+    import sys
+    import tempfile
+    from pathlib import Path
+    from arbitrage_engine import FlashArbitrageEngine, get_config
+
+    async def measure(duration: float, workdir: str) -> Dict:
+        """Run the engine for duration seconds and time its scan and execute iterations"""
+        config = {**get_config(), 'checkpoint_interval': 0,
+                  'trade_journal_file': Path(workdir) / 'trades.db'}
+        engine = FlashArbitrageEngine(config)
+        timings = {'scan': [], 'execute': []}
+
+        def timed(name, method):
+            async def wrapper(*args):
+                start = time.perf_counter()
+                result = await method(*args)
+                timings[name].append(time.perf_counter() - start)
+                return result
+            return wrapper
+        engine.scan_opportunities = timed('scan', engine.scan_opportunities)
+        engine.execute_arbitrage = timed('execute', engine.execute_arbitrage)
+
+        task = asyncio.ensure_future(engine.start())
+        await asyncio.sleep(duration)
+        engine.running = False
+        await task
+        engine.trade_journal.stop()
+
+        stats = engine.loop_monitor.get_statistics()
+        for name, samples in timings.items():
+            stats[f"{name}_per_s"] = len(samples) / duration
+            stats[f"{name}_ms"] = float(np.mean(samples) * 1000.0) if samples else 0.0
+        return stats
+
+    duration = float(sys.argv[1]) if len(sys.argv) > 1 else 5.0
+    for name in ('asyncio', 'uvloop'):
+        try:
+            loop_name, _ = new_event_loop_factory(name)
+        except ImportError:
+            print(f"{name}: not installed")
+            continue
+        with tempfile.TemporaryDirectory() as workdir:
+            stats = run(measure(duration, workdir), loop=loop_name)
+        print(f"{loop_name:8s} scan {stats['scan_per_s']:5.1f}/s {stats['scan_ms']:6.3f} ms  "
+              f"execute {stats['execute_per_s']:5.1f}/s {stats['execute_ms']:6.3f} ms  "
+              f"lag mean {stats['mean_ms']:.3f} ms p99 {stats['p99_ms']:.3f} ms max {stats['max_ms']:.3f} ms")
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+In-process market-data bus for the Flash Arbitrage Engine
+Publish/subscribe for quote and opportunity events; every subscriber has a
+bounded, latest-value-per-key queue so a slow consumer never stalls the
+collectors or grows memory
+"""
+
+import threading
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+# Event topics; quote keys are market keys ("exchange:pair"), the
+# opportunities topic carries the whole current list under one key
+TOPICS = ('quote', 'opportunities')
+
+class Subscription:
+    """One consumer's pending events, at most one per (topic, key)
+
+    A new value for a key that is still pending replaces it in place
+    (conflated), so a consumer that falls behind skips intermediate values
+    and always reads the latest. Past maxsize distinct keys the oldest
+    pending event is dropped. Values are shared, never copied, and must
+    not be mutated by consumers.
+
+    Consumers on any thread call drain(), or wait() first to block until
+    something is pending.
+    """
+
+    def __init__(self, name: str, topics: Sequence[str], maxsize: int = 4096):
+        self.name = name
+        self.topics = tuple(topics)
+        self.maxsize = maxsize
+
+        self._lock = threading.Lock()
+        self._ready = threading.Event()
+        self._pending: Dict[Tuple[str, str], object] = {}
+        self.published = 0
+        self.delivered = 0
+        self.conflated = 0
+        self.dropped = 0
+
+    def put_batch(self, topic: str, keys: Iterable[str], values: Iterable):
+        with self._lock:
+            pending = self._pending
+            for key, value in zip(keys, values):
+                slot = (topic, key)
+                if slot in pending:
+                    self.conflated += 1
+                elif len(pending) >= self.maxsize:
+                    del pending[next(iter(pending))]
+                    self.dropped += 1
+                pending[slot] = value
+                self.published += 1
+        self._ready.set()
+
+    def drain(self) -> List[Tuple[str, str, object]]:
+        """Every pending (topic, key, value), oldest first; never blocks on publishers"""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            self._ready.clear()
+            self.delivered += len(pending)
+        return [(topic, key, value) for (topic, key), value in pending.items()]
+
+    def wait(self, timeout: float = None) -> bool:
+        """Block until an event is pending (True) or timeout passes (False)"""
+        return self._ready.wait(timeout)
+
+    def get_statistics(self) -> Dict:
+        return {
+            'topics': list(self.topics),
+            'pending': len(self._pending),
+            'published': self.published,
+            'delivered': self.delivered,
+            'conflated': self.conflated,
+            'dropped': self.dropped,
+        }
+
+class MarketDataBus:
+    """Fan-out of engine events to any number of subscriptions
+
+    Publishing with no subscribers on a topic is a dict lookup. The
+    subscriber tuples are replaced, never mutated, so publishers read them
+    without locking while consumers come and go.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers: Dict[str, Tuple[Subscription, ...]] = {topic: () for topic in TOPICS}
+
+    def subscribe(self, name: str, topics: Sequence[str] = TOPICS, maxsize: int = 4096) -> Subscription:
+        unknown = set(topics) - set(TOPICS)
+        if unknown:
+            raise ValueError(f"Unknown topics {sorted(unknown)}; choose from {', '.join(TOPICS)}")
+        subscription = Subscription(name, topics, maxsize)
+        with self._lock:
+            for topic in subscription.topics:
+                self._subscribers[topic] += (subscription,)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        with self._lock:
+            for topic in subscription.topics:
+                self._subscribers[topic] = tuple(s for s in self._subscribers[topic] if s is not subscription)
+
+    def has_subscribers(self, topic: str) -> bool:
+        return bool(self._subscribers[topic])
+
+    def publish(self, topic: str, key: str, value):
+        for subscription in self._subscribers[topic]:
+            subscription.put_batch(topic, (key,), (value,))
+
+    def publish_batch(self, topic: str, keys: Sequence[str], values: Sequence):
+        for subscription in self._subscribers[topic]:
+            subscription.put_batch(topic, keys, values)
+
+    def get_statistics(self) -> Dict:
+        subscriptions = {s.name: s for subs in self._subscribers.values() for s in subs}
+        return {name: s.get_statistics() for name, s in subscriptions.items()}
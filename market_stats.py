@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Rolling market statistics for the Flash Arbitrage Engine
+EWMA volatility, mean spread and quote update rate per (exchange, pair),
+updated incrementally on every tick so scoring never touches raw history
+"""
+
+from typing import Dict
+
+import numpy as np
+
+# Arrays that fully describe the statistics, e.g. for checkpoints
+STATE_FIELDS = ('last_mid', 'last_timestamp', 'variance', 'mean_spread', 'update_rate', 'count')
+
+class RollingMarketStats:
+    """Per-market exponentially weighted statistics in flat arrays
+
+    With alpha = 1 - 0.5 ** (1 / halflife) each tick updates, in O(1):
+        variance of log mid returns   v <- (1 - alpha) v + alpha r^2
+        relative spread               s <- (1 - alpha) s + alpha (ask - bid) / mid
+        update rate (ticks / second)  u <- (1 - alpha) u + alpha / dt
+    """
+
+    def __init__(self, n_markets: int, halflife: float = 20.0):
+        self.alpha = 1.0 - 0.5 ** (1.0 / halflife)
+        self.last_mid = np.zeros(n_markets)
+        self.last_timestamp = np.zeros(n_markets)
+        self.variance = np.zeros(n_markets)
+        self.mean_spread = np.zeros(n_markets)
+        self.update_rate = np.zeros(n_markets)
+        self.count = np.zeros(n_markets, dtype=np.int64)
+
+    def update_batch(self, market_ids: np.ndarray, timestamp, bids: np.ndarray, asks: np.ndarray):
+        """Fold one tick of several distinct markets into their statistics"""
+        alpha = self.alpha
+        mid = (bids + asks) / 2
+        with np.errstate(divide='ignore', invalid='ignore'):
+            spread = np.where(mid > 0, (asks - bids) / mid, 0.0)
+
+        seen = self.count[market_ids] > 0
+        last_mid = self.last_mid[market_ids]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            returns = np.where(seen & (last_mid > 0) & (mid > 0), np.log(mid / last_mid), 0.0)
+            dt = np.asarray(timestamp) - self.last_timestamp[market_ids]
+            rate = np.where(seen & (dt > 0), 1.0 / dt, self.update_rate[market_ids])
+
+        self.variance[market_ids] = np.where(
+            seen, (1 - alpha) * self.variance[market_ids] + alpha * returns * returns, 0.0
+        )
+        self.mean_spread[market_ids] = np.where(
+            seen, (1 - alpha) * self.mean_spread[market_ids] + alpha * spread, spread
+        )
+        # The first interval seeds the rate instead of blending with zero
+        first_interval = self.count[market_ids] == 1
+        self.update_rate[market_ids] = np.where(
+            first_interval, rate,
+            np.where(seen, (1 - alpha) * self.update_rate[market_ids] + alpha * rate, 0.0)
+        )
+        self.last_mid[market_ids] = mid
+        self.last_timestamp[market_ids] = timestamp
+        self.count[market_ids] += 1
+
+    def volatility(self, market_id: int) -> float:
+        """EWMA standard deviation of per-tick log returns"""
+        return float(np.sqrt(self.variance[market_id]))
+
+    def get_state(self) -> Dict[str, np.ndarray]:
+        return {name: getattr(self, name).copy() for name in STATE_FIELDS}
+
+    def set_state(self, state: Dict[str, np.ndarray]):
+        for name in STATE_FIELDS:
+            getattr(self, name)[:] = state[name]
+
+    def snapshot(self, market_id: int) -> Dict:
+        return {
+            'volatility': self.volatility(market_id),
+            'mean_spread': float(self.mean_spread[market_id]),
+            'update_rate': float(self.update_rate[market_id]),
+            'ticks': int(self.count[market_id]),
+        }
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Monte Carlo execution-risk simulator for the Flash Arbitrage Engine
+Runs thousands of execution paths over a set of opportunities as batched
+array operations and reports the PnL distribution, drawdown and tail risk
+"""
+
+import argparse
+import json
+import time
+from dataclasses import dataclass
+from typing import Dict, List
+
+import numpy as np
+
+# Opportunity fields the simulator needs, as ArbitrageOpportunity / journal names
+FIELDS = ('net_profit', 'volume', 'price_a', 'gas_cost', 'confidence', 'risk_score')
+
+@dataclass
+class ExecutionModel:
+    """How a gated opportunity turns into realized PnL
+
+    Each attempt waits an exponential latency, during which the edge decays
+    with the given half-life. It then succeeds with the engine's own
+    probability confidence * (1 - risk_score). A success earns the decayed
+    net profit minus adverse slippage of |N(0, slippage_std)| of notional.
+    A failure burns the transaction's gas.
+    """
+    latency_mean: float = 0.05       # Seconds from detection to landing
+    edge_halflife: float = 0.5       # Seconds for a dislocation to lose half its edge
+    slippage_std: float = 0.0005     # Adverse price move as a fraction of notional
+    failure_cost: float = 1.0        # Multiple of gas_cost lost on a failed attempt
+
+def opportunity_arrays(opportunities: List) -> Dict[str, np.ndarray]:
+    """Column arrays from ArbitrageOpportunity objects or journal/API dicts"""
+    if opportunities and not isinstance(opportunities[0], dict):
+        opportunities = [vars(opportunity) for opportunity in opportunities]
+    return {name: np.array([row[name] for row in opportunities], dtype=float) for name in FIELDS}
+
+def gate_mask(arrays: Dict[str, np.ndarray], min_confidence: float = 0.7,
+              max_risk: float = 0.5, min_profit: float = 0.01) -> np.ndarray:
+    """Which opportunities the engine's execution gates would trade"""
+    return ((arrays['confidence'] > min_confidence) & (arrays['risk_score'] < max_risk)
+            & (arrays['net_profit'] > min_profit))
+
+def simulate(arrays: Dict[str, np.ndarray], n_paths: int = 10000,
+             model: ExecutionModel = None, gates: Dict = None, seed: int = 0,
+             batch_size: int = 2_000_000) -> Dict:
+    """Simulate n_paths executions of the gated opportunities, in order
+
+    Paths are processed in batches of about batch_size (path, trade) cells
+    so memory stays bounded for long histories.
+
+    Returns:
+        Summary of total PnL, tail risk and max drawdown across paths
+    """
+    model = model or ExecutionModel()
+    mask = gate_mask(arrays, **(gates or {}))
+    profit = arrays['net_profit'][mask]
+    notional = (arrays['volume'] * arrays['price_a'])[mask]
+    gas = arrays['gas_cost'][mask]
+    p_success = (arrays['confidence'] * (1.0 - arrays['risk_score']))[mask]
+    n_trades = len(profit)
+
+    rng = np.random.default_rng(seed)
+    totals = np.empty(n_paths)
+    drawdowns = np.empty(n_paths)
+    wins = np.empty(n_paths)
+    decay_rate = np.log(2.0) / model.edge_halflife
+
+    chunk = max(1, batch_size // max(1, n_trades))
+    for start in range(0, n_paths, chunk):
+        rows = min(chunk, n_paths - start)
+        latency = rng.exponential(model.latency_mean, (rows, n_trades))
+        filled = rng.random((rows, n_trades)) < p_success
+        slippage = np.abs(rng.standard_normal((rows, n_trades))) * model.slippage_std * notional
+
+        pnl = np.where(filled, profit * np.exp(-decay_rate * latency) - slippage,
+                       -model.failure_cost * gas)
+        equity = np.cumsum(pnl, axis=1)
+        peak = np.maximum.accumulate(np.maximum(equity, 0.0), axis=1)
+
+        totals[start:start + rows] = equity[:, -1] if n_trades else 0.0
+        drawdowns[start:start + rows] = (peak - equity).max(axis=1) if n_trades else 0.0
+        wins[start:start + rows] = filled.sum(axis=1)
+
+    p1, p5, p50, p95 = np.percentile(totals, [1, 5, 50, 95])
+    tail = totals[totals <= p5]
+    return {
+        'paths': n_paths,
+        'opportunities': int(len(mask)),
+        'gated_trades': n_trades,
+        'mean_pnl': float(totals.mean()),
+        'std_pnl': float(totals.std()),
+        'p1_pnl': float(p1),
+        'p5_pnl': float(p5),
+        'median_pnl': float(p50),
+        'p95_pnl': float(p95),
+        'prob_loss': float((totals < 0).mean()),
+        'var_95': float(-p5),
+        'cvar_95': float(-tail.mean()) if len(tail) else 0.0,
+        'mean_hit_rate': float(wins.mean() / n_trades) if n_trades else 0.0,
+        'mean_max_drawdown': float(drawdowns.mean()),
+        'p95_max_drawdown': float(np.percentile(drawdowns, 95)),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Monte Carlo PnL distribution for the execution gates")
+    parser.add_argument('--journal', help="Replay journaled attempts from this trade journal")
+    parser.add_argument('--limit', type=int, default=100000, help="Most recent journal rows to use")
+    parser.add_argument('--synthetic', type=int, default=1000, help="Synthetic opportunities when no journal is given")
+    parser.add_argument('--paths', type=int, default=10000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--min-confidence', type=float, default=0.7)
+    parser.add_argument('--max-risk', type=float, default=0.5)
+    parser.add_argument('--min-profit', type=float, default=0.01)
+    parser.add_argument('--latency', type=float, default=ExecutionModel.latency_mean)
+    parser.add_argument('--halflife', type=float, default=ExecutionModel.edge_halflife)
+    parser.add_argument('--slippage', type=float, default=ExecutionModel.slippage_std)
+    args = parser.parse_args()
+
+    if args.journal:
+        from trade_journal import TradeJournal
+        journal = TradeJournal(args.journal)
+        rows, before = [], None
+        while len(rows) < args.limit:
+            page = journal.query(before_id=before, limit=min(500, args.limit - len(rows)))
+            if not page:
+                break
+            rows += page
+            before = page[-1]['id']
+        arrays = opportunity_arrays(rows[::-1])
+    else:
+        rng = np.random.default_rng(args.seed)
+        n = args.synthetic
+        volume = rng.uniform(1, 100, n)
+        price = rng.uniform(1, 200, n)
+        gas = 0.001 + 0.00001 * volume
+        # Net edge of roughly 0.1-0.5% of notional
+        edge = rng.lognormal(np.log(0.002), 0.5, n)
+        arrays = {
+            'net_profit': volume * price * edge - gas,
+            'volume': volume,
+            'price_a': price,
+            'gas_cost': gas,
+            'confidence': rng.uniform(0.5, 1.0, n),
+            'risk_score': rng.uniform(0.0, 0.7, n),
+        }
+
+    model = ExecutionModel(args.latency, args.halflife, args.slippage)
+    gates = {'min_confidence': args.min_confidence, 'max_risk': args.max_risk,
+             'min_profit': args.min_profit}
+    start = time.perf_counter()
+    report = simulate(arrays, args.paths, model, gates, args.seed)
+    report['seconds'] = time.perf_counter() - start
+    print(json.dumps(report, indent=2))
+
+if __name__ == "__main__":
+    main()
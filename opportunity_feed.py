@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+Opportunity change feed for the Flash Arbitrage Engine
+Sequence-numbered adds, updates and removals of the opportunity list, so
+API clients poll with ?since=<seq> and receive only what changed, plus
+pair, token and venue indexes for filtered, paginated queries
+"""
+
+import threading
+import time
+from collections import defaultdict, deque
+from itertools import islice
+from operator import attrgetter, itemgetter
+from typing import Dict, Iterable, List, Optional, Sequence, Set
+
+# Fields of ArbitrageOpportunity whose change is worth sending; the
+# timestamp moves on every scan and is not
+OPPORTUNITY_SIGNATURE = (
+    'price_a', 'price_b', 'price_diff', 'profit_potential', 'volume',
+    'gas_cost', 'net_profit', 'confidence', 'risk_score',
+)
+
+# Fields a query may sort by
+SORT_FIELDS = ('net_profit', 'profit_potential', 'confidence', 'risk_score', 'volume', 'timestamp')
+
+def route_id(token_pair: str, buy_exchange: str, sell_exchange: str) -> str:
+    """Stable opportunity id: the same route keeps its id across scans"""
+    return f"{token_pair}:{buy_exchange}:{sell_exchange}"
+
+class OpportunityFeed:
+    """Change log over successive versions of an opportunity list
+
+    publish() diffs each new list against the previous one: new ids become
+    adds, ids whose signature fields moved become updates, and missing ids
+    become removals, each with the next sequence number. That costs one
+    pass over the published list (the engine keeps 50), paid by the
+    publisher, so reads never walk the list. The log keeps the last
+    max_changes entries.
+
+    changes_since() collapses a client's backlog to the last change per
+    id, and answers with a full snapshot instead when the client is older
+    than the log or the snapshot would be smaller. Sequence numbers start
+    from the wall clock in microseconds, so a seq held from before a
+    restart is always older than the new log.
+
+    The same diff keeps secondary indexes from pair, token and venue (either
+    leg) to live ids, adding ids as they appear and dropping them as they
+    leave the list, so query() reads the indexes as they stand and narrows
+    to a slice of the book through set intersections instead of scanning
+    every opportunity.
+    """
+
+    def __init__(self, signature: Sequence[str] = OPPORTUNITY_SIGNATURE, key: str = 'id',
+                 as_dicts: bool = False, max_changes: int = 4096):
+        getter = itemgetter if as_dicts else attrgetter
+        self._key = getter(key)
+        self._signature = getter(*signature)
+        self._serialize = dict if as_dicts else (lambda item: dict(vars(item)))
+        self._getter = getter
+        self._route = getter('token_pair', 'exchange_a', 'exchange_b')
+
+        self._lock = threading.Lock()
+        self._published = None
+        self._current: Dict[str, tuple] = {}   # id -> (signature, item)
+        self._changes = deque(maxlen=max_changes)   # (seq, op, id, item)
+        self._by_pair: Dict[str, Set[str]] = defaultdict(set)
+        self._by_token: Dict[str, Set[str]] = defaultdict(set)
+        self._by_venue: Dict[str, Set[str]] = defaultdict(set)
+        self.seq = int(time.time() * 1e6)
+        self.snapshots = 0
+
+    def publish(self, items: List):
+        """Make items the current list, logging and indexing what changed
+
+        The items must not be mutated afterwards. Publishing the same list
+        object again is a no-op.
+        """
+        with self._lock:
+            if items is self._published:
+                return
+            self._published = items
+            self._apply(items)
+
+    def _apply(self, items: List):
+        """Fold a new list into the change log and indexes; caller holds the lock"""
+        previous, current = self._current, {}
+        key, signature, changes = self._key, self._signature, self._changes
+        for item in items:
+            item_id = key(item)
+            values = signature(item)
+            current[item_id] = (values, item)
+            old = previous.get(item_id)
+            if old is None:
+                self.seq += 1
+                changes.append((self.seq, 'add', item_id, item))
+                self._index(item_id, item, set.add)
+            elif old[0] != values:
+                self.seq += 1
+                changes.append((self.seq, 'update', item_id, item))
+        for item_id in previous.keys() - current.keys():
+            self.seq += 1
+            changes.append((self.seq, 'remove', item_id, None))
+            self._index(item_id, previous[item_id][1], set.discard)
+        self._current = current
+
+    def _index(self, item_id: str, item, update):
+        """Add item_id to (set.add) or drop it from (set.discard) every index it belongs to
+
+        An id is one route, so its pair and venues never change on update.
+        """
+        pair, buy, sell = self._route(item)
+        update(self._by_pair[pair], item_id)
+        for token in pair.split('/'):
+            update(self._by_token[token], item_id)
+        update(self._by_venue[buy], item_id)
+        update(self._by_venue[sell], item_id)
+
+    def snapshot(self) -> Dict:
+        """The whole current list, in published order, and its seq"""
+        with self._lock:
+            return self._snapshot()
+
+    def _snapshot(self) -> Dict:
+        self.snapshots += 1
+        return {
+            'seq': self.seq,
+            'snapshot': True,
+            'opportunities': [dict(self._serialize(item), id=item_id)
+                              for item_id, (_, item) in self._current.items()],
+        }
+
+    def changes_since(self, since: Optional[int]) -> Dict:
+        """Changes after seq since, or a snapshot when that is smaller or since is too old"""
+        with self._lock:
+            changes = self._changes
+            oldest = changes[0][0] if changes else self.seq + 1
+            if since is None or since > self.seq or since < oldest - 1:
+                return self._snapshot()
+
+            # Entries are contiguous in seq, so the backlog starts at a known offset
+            latest = {}
+            for _, op, item_id, item in islice(changes, since - oldest + 1, None):
+                latest.pop(item_id, None)
+                latest[item_id] = (op, item)
+            if len(latest) > len(self._current):
+                return self._snapshot()
+
+            return {
+                'seq': self.seq,
+                'snapshot': False,
+                'changes': [
+                    {'op': 'remove', 'id': item_id} if op == 'remove' else
+                    {'op': op, 'id': item_id, 'opportunity': dict(self._serialize(item), id=item_id)}
+                    for item_id, (op, item) in latest.items()
+                ],
+            }
+
+    @staticmethod
+    def _lookup(index: Dict[str, Set[str]], values: Iterable[str]) -> Set[str]:
+        """Ids listed under any of values"""
+        ids = set()
+        for value in values:
+            ids |= index.get(value, set())
+        return ids
+
+    def query(self, pairs: Sequence[str] = None, tokens: Sequence[str] = None,
+              venues: Sequence[str] = None, min_net_profit: float = None,
+              min_confidence: float = None, max_risk: float = None,
+              sort: str = 'net_profit', descending: bool = True,
+              offset: int = 0, limit: int = 10) -> Dict:
+        """One page of the current opportunities matching every given filter
+
+        Within pairs, tokens or venues any value matches (a venue matches
+        either leg); across them all must. Index filters are applied first,
+        so thresholds and sorting only see the matching slice.
+
+        Returns:
+            seq of the list the page was cut from, total matches, the page
+            and next_offset (None on the last page)
+        """
+        if sort not in SORT_FIELDS:
+            raise ValueError(f"Cannot sort by {sort}; choose from {', '.join(SORT_FIELDS)}")
+
+        with self._lock:
+            current = self._current
+            ids = None
+            for index, values in ((self._by_pair, pairs), (self._by_token, tokens),
+                                  (self._by_venue, venues)):
+                if values:
+                    matched = self._lookup(index, values)
+                    ids = matched if ids is None else ids & matched
+            items = [current[item_id][1] for item_id in ids] if ids is not None else \
+                [item for _, item in current.values()]
+
+            field = self._getter
+            if min_net_profit is not None:
+                items = [item for item in items if field('net_profit')(item) >= min_net_profit]
+            if min_confidence is not None:
+                items = [item for item in items if field('confidence')(item) >= min_confidence]
+            if max_risk is not None:
+                items = [item for item in items if field('risk_score')(item) <= max_risk]
+            items.sort(key=field(sort), reverse=descending)
+
+            page = items[offset:offset + limit]
+            return {
+                'seq': self.seq,
+                'total': len(items),
+                'opportunities': [dict(self._serialize(item), id=self._key(item)) for item in page],
+                'next_offset': offset + limit if offset + limit < len(items) else None,
+            }
+
+    def get_statistics(self) -> Dict:
+        return {
+            'seq': self.seq,
+            'live': len(self._current),
+            'logged_changes': len(self._changes),
+            'snapshots': self.snapshots,
+        }
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Depth-aware order book model for the Flash Arbitrage Engine
+Multi-level depth per (exchange, pair) and a vectorized solver for the
+profit-maximizing trade size across both books within a slippage limit
+"""
+
+from dataclasses import dataclass
+from typing import Tuple
+
+import numpy as np
+
+# Depth arrays are (2, levels): row 0 prices, row 1 sizes, best level first
+PRICE, SIZE = 0, 1
+
+@dataclass
+class Fill:
+    """Size and volume-weighted prices of a trade walked through both books"""
+    volume: float
+    buy_price: float
+    sell_price: float
+    fees_included: bool = False  # True when prices are already net of venue fees
+
+def make_depth(best_prices: np.ndarray, top_sizes: np.ndarray, tick: np.ndarray,
+               levels: int, side: int, rng=np.random) -> np.ndarray:
+    """Synthesize (n, 2, levels) depth around top-of-book quotes
+
+    Args:
+        best_prices: Best bid (side=-1) or ask (side=+1) per market
+        top_sizes: Size available at the best level
+        tick: Price step between levels per market
+        side: +1 for asks (prices rise), -1 for bids (prices fall)
+    """
+    n = len(best_prices)
+    depth = np.empty((n, 2, levels))
+    steps = np.arange(levels) * (1.0 + rng.uniform(0.0, 0.5, (n, levels)))
+    depth[:, PRICE] = np.maximum(0.0, best_prices[:, None] + side * tick[:, None] * steps)
+    depth[:, SIZE] = top_sizes[:, None] * rng.uniform(0.5, 1.5, (n, levels))
+    depth[:, SIZE, 0] = top_sizes
+    return depth
+
+def _level_at(cum_sizes: np.ndarray, points: np.ndarray) -> np.ndarray:
+    """Index of the level being consumed just after each point, per row"""
+    levels = (cum_sizes[:, None, :] <= points[:, :, None]).sum(axis=2)
+    return np.minimum(levels, cum_sizes.shape[1] - 1)
+
+def solve_optimal_sizes(asks: np.ndarray, bids: np.ndarray,
+                        buy_fee: np.ndarray, sell_fee: np.ndarray,
+                        max_slippage: float, max_size: float,
+                        cost_per_unit: float = 0.0) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Profit-maximizing size for every candidate at once
+
+    Buying walks up the ask book of the buy venue and selling walks down the
+    bid book of the sell venue. Between consecutive cumulative-size breakpoints
+    of either book the marginal profit per unit is constant:
+
+        bid(q) * (1 - sell_fee) - ask(q) * (1 + buy_fee) - cost_per_unit
+
+    and it only decreases with q, so the optimum is the end of the last
+    segment where it is still positive. Levels beyond max_slippage from the
+    best price are treated as empty.
+
+    Args:
+        asks: (n, 2, levels) depth of the buy venue
+        bids: (n, 2, levels) depth of the sell venue
+        buy_fee, sell_fee: (n,) proportional fees per leg
+
+    Returns:
+        Tuple of (sizes, average buy prices, average sell prices), each (n,)
+    """
+    ask_px, ask_sz = asks[:, PRICE], asks[:, SIZE]
+    bid_px, bid_sz = bids[:, PRICE], bids[:, SIZE]
+
+    # Slippage limit: ignore levels too far from the best price
+    ask_sz = np.where(ask_px <= ask_px[:, :1] * (1.0 + max_slippage), ask_sz, 0.0)
+    bid_sz = np.where(bid_px >= bid_px[:, :1] * (1.0 - max_slippage), bid_sz, 0.0)
+
+    cum_ask = np.cumsum(ask_sz, axis=1)
+    cum_bid = np.cumsum(bid_sz, axis=1)
+    cap = np.minimum(np.minimum(cum_ask[:, -1], cum_bid[:, -1]), max_size)
+
+    # Segments between every breakpoint of either book, clipped to the cap
+    ends = np.minimum(np.sort(np.concatenate([cum_ask, cum_bid], axis=1), axis=1), cap[:, None])
+    starts = np.concatenate([np.zeros((len(ends), 1)), ends[:, :-1]], axis=1)
+    lengths = ends - starts
+
+    rows = np.arange(len(ends))[:, None]
+    buy_prices = ask_px[rows, _level_at(cum_ask, starts)]
+    sell_prices = bid_px[rows, _level_at(cum_bid, starts)]
+    marginal = (sell_prices * (1.0 - sell_fee[:, None])
+                - buy_prices * (1.0 + buy_fee[:, None]) - cost_per_unit)
+
+    taken = np.where(marginal > 0, lengths, 0.0)
+    sizes = taken.sum(axis=1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        avg_buy = np.where(sizes > 0, (buy_prices * taken).sum(axis=1) / sizes, ask_px[:, 0])
+        avg_sell = np.where(sizes > 0, (sell_prices * taken).sum(axis=1) / sizes, bid_px[:, 0])
+    return sizes, avg_buy, avg_sell
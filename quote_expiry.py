@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Quote expiry index for the Flash Arbitrage Engine
+Time-ordered per-venue deadlines so stale quotes are evicted before a scan
+"""
+
+from collections import deque
+from typing import Dict, Optional, Sequence
+
+class QuoteExpiryIndex:
+    """Monotonic deques of (deadline, keys, timestamp) per venue
+
+    Each venue's collector stamps its ticks with increasing timestamps and
+    shares one max age, so appending keeps every deque sorted by deadline
+    and eviction only ever looks at the expired head entries. Collectors
+    publish a whole tick at once; a new tick over the same key list replaces
+    the previous entry, so a steady feed holds one entry per key list.
+    """
+
+    def __init__(self, default_max_age: float = 10.0, venue_max_age: Dict[str, float] = None):
+        self.default_max_age = default_max_age
+        self.venue_max_age = dict(venue_max_age or {})
+        self._deadlines: Dict[str, deque] = {}
+        self.evicted = 0
+
+    def max_age(self, venue: str) -> float:
+        return self.venue_max_age.get(venue, self.default_max_age)
+
+    def touch_batch(self, venue: str, keys: Sequence[str], timestamp: float):
+        """Record that every key in keys was quoted by venue at timestamp"""
+        queue = self._deadlines.get(venue)
+        if queue is None:
+            queue = self._deadlines[venue] = deque()
+        elif queue and queue[-1][1] is keys:
+            # The previous tick covered exactly these keys and is now superseded
+            queue.pop()
+        queue.append((timestamp + self.max_age(venue), keys, timestamp))
+
+    def touch(self, venue: str, key: str, timestamp: float):
+        """Record a single quote update"""
+        self.touch_batch(venue, (key,), timestamp)
+
+    def evict(self, market_data: Dict, now: float) -> int:
+        """Drop expired quotes from market_data in O(expired)
+
+        A key is only removed if its stored quote is still the one that expired;
+        quotes refreshed since then carry a later deadline further down the deque.
+        """
+        evicted = 0
+        for queue in self._deadlines.values():
+            while queue and queue[0][0] <= now:
+                _, keys, timestamp = queue.popleft()
+                for key in keys:
+                    quote = market_data.get(key)
+                    if quote is not None and quote.timestamp <= timestamp:
+                        del market_data[key]
+                        evicted += 1
+        self.evicted += evicted
+        return evicted
+
+    def next_deadline(self) -> Optional[float]:
+        """Earliest pending expiry across venues"""
+        heads = [queue[0][0] for queue in self._deadlines.values() if queue]
+        return min(heads) if heads else None
+
+    def clear(self):
+        self._deadlines.clear()
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Quote history for the Flash Arbitrage Engine
+Preallocated per-market ring buffers with O(1) appends and zero-copy windows
+"""
+
+import numpy as np
+
+# Columns of a history row
+TIMESTAMP, BID, ASK, VOLUME = range(4)
+N_FIELDS = 4
+
+class QuoteHistory:
+    """Last N quotes for every (exchange, pair) market in one contiguous array
+
+    Each market owns 2 * capacity rows and every sample is written twice,
+    at pos and pos + capacity. The most recent n samples are then always one
+    contiguous slice, so windows are plain views and never need a copy.
+    Memory is fixed at construction: markets * 2 * capacity * 4 * 8 bytes.
+    """
+
+    def __init__(self, n_markets: int, capacity: int = 256, max_bytes: int = None):
+        row_bytes = 2 * N_FIELDS * 8
+        if max_bytes is not None and n_markets > 0:
+            capacity = min(capacity, max(2, max_bytes // (n_markets * row_bytes)))
+        self.n_markets = n_markets
+        self.capacity = capacity
+
+        self._data = np.zeros((n_markets, 2 * capacity, N_FIELDS))
+        self._pos = np.full(n_markets, -1, dtype=np.int64)  # last written slot
+        self._count = np.zeros(n_markets, dtype=np.int64)
+
+    @property
+    def nbytes(self) -> int:
+        return self._data.nbytes
+
+    def append(self, market_id: int, timestamp: float, bid: float, ask: float, volume: float):
+        """Record one quote"""
+        pos = (self._pos[market_id] + 1) % self.capacity
+        row = (timestamp, bid, ask, volume)
+        self._data[market_id, pos] = row
+        self._data[market_id, pos + self.capacity] = row
+        self._pos[market_id] = pos
+        if self._count[market_id] < self.capacity:
+            self._count[market_id] += 1
+
+    def append_batch(self, market_ids: np.ndarray, timestamp, bids: np.ndarray,
+                     asks: np.ndarray, volumes: np.ndarray):
+        """Record one quote for each of several distinct markets"""
+        pos = (self._pos[market_ids] + 1) % self.capacity
+        rows = np.empty((len(market_ids), N_FIELDS))
+        rows[:, TIMESTAMP] = timestamp
+        rows[:, BID] = bids
+        rows[:, ASK] = asks
+        rows[:, VOLUME] = volumes
+        self._data[market_ids, pos] = rows
+        self._data[market_ids, pos + self.capacity] = rows
+        self._pos[market_ids] = pos
+        self._count[market_ids] = np.minimum(self._count[market_ids] + 1, self.capacity)
+
+    def __len__(self) -> int:
+        return self.n_markets
+
+    def count(self, market_id: int) -> int:
+        return int(self._count[market_id])
+
+    def window(self, market_id: int, n: int = None) -> np.ndarray:
+        """View of the last n quotes (oldest first) as an (n, 4) array
+
+        The view aliases the buffer: copy it if it must outlive later appends.
+        """
+        available = int(self._count[market_id])
+        n = available if n is None else min(n, available)
+        end = int(self._pos[market_id]) + self.capacity + 1
+        return self._data[market_id, end - n:end]
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Rolling risk limits for the Flash Arbitrage Engine
+Daily trade count, daily loss and stop-loss tracked in fixed time buckets
+with O(1) updates, and a precomputed verdict the executor checks per trade
+"""
+
+import time
+from typing import Dict, Optional
+
+class RiskLimits:
+    """Trade count and realized PnL over a rolling window of time buckets
+
+    The window (default one day) is split into buckets (default one
+    minute) kept in a ring with running totals. Moving into a new bucket
+    subtracts the buckets that fell out of the window, so each update is
+    O(1) amortized. After every change the verdict is recomputed, which
+    leaves allowed() a single comparison while time stays in the current
+    bucket.
+
+    Limits:
+        max_trades: Attempts per window; trading resumes as old ones roll off
+        max_loss: Realized loss per window; resumes as losses roll off
+        stop_loss_pct: Drawdown from peak session equity, as a fraction of
+            capital plus that peak; latched until reset_stop_loss()
+    """
+
+    # Counters carried across restarts; the limits themselves come from config
+    STATE_FIELDS = ('_trades', '_pnl', '_index', '_bucket_end', 'trades', 'pnl',
+                    'equity', 'peak_equity', 'stop_loss_hit')
+
+    def __init__(self, max_trades: int = 1000, max_loss: float = 10.0,
+                 stop_loss_pct: float = 0.05, capital: float = 100.0,
+                 window: float = 86400.0, bucket: float = 60.0):
+        self.max_trades = max_trades
+        self.max_loss = max_loss
+        self.stop_loss_pct = stop_loss_pct
+        self.capital = capital
+        self.bucket = bucket
+
+        self.n_buckets = max(1, int(round(window / bucket)))
+        self._trades = [0] * self.n_buckets
+        self._pnl = [0.0] * self.n_buckets
+        self._index = 0
+        self._bucket_end = None
+
+        self.trades = 0
+        self.pnl = 0.0
+        self.equity = 0.0
+        self.peak_equity = 0.0
+        self.stop_loss_hit = False
+        self.halt_reason: Optional[str] = None
+        self._allowed = True
+
+    def _rotate(self, now: float):
+        """Advance the ring to the bucket containing now"""
+        if self._bucket_end is None:
+            self._bucket_end = (now // self.bucket + 1) * self.bucket
+            return
+        steps = int((now - self._bucket_end) // self.bucket) + 1
+        if steps >= self.n_buckets:
+            # The whole window has passed
+            self._trades = [0] * self.n_buckets
+            self._pnl = [0.0] * self.n_buckets
+            self.trades = 0
+            self.pnl = 0.0
+        else:
+            for _ in range(steps):
+                self._index = (self._index + 1) % self.n_buckets
+                self.trades -= self._trades[self._index]
+                self.pnl -= self._pnl[self._index]
+                self._trades[self._index] = 0
+                self._pnl[self._index] = 0.0
+        self._bucket_end += steps * self.bucket
+        self._update_verdict()
+
+    def allowed(self, now: float) -> bool:
+        """Whether another trade may be attempted at time now"""
+        if self._bucket_end is None or now >= self._bucket_end:
+            self._rotate(now)
+        return self._allowed
+
+    def record(self, now: float, pnl: float):
+        """Count one execution attempt and its realized PnL"""
+        if self._bucket_end is None or now >= self._bucket_end:
+            self._rotate(now)
+        self._trades[self._index] += 1
+        self._pnl[self._index] += pnl
+        self.trades += 1
+        self.pnl += pnl
+
+        self.equity += pnl
+        if self.equity > self.peak_equity:
+            self.peak_equity = self.equity
+        elif self.peak_equity - self.equity > self.stop_loss_pct * (self.capital + self.peak_equity):
+            self.stop_loss_hit = True
+        self._update_verdict()
+
+    def _update_verdict(self):
+        if self.stop_loss_hit:
+            self.halt_reason = 'stop_loss'
+        elif self.trades >= self.max_trades:
+            self.halt_reason = 'max_daily_trades'
+        elif -self.pnl >= self.max_loss:
+            self.halt_reason = 'max_daily_loss'
+        else:
+            self.halt_reason = None
+        self._allowed = self.halt_reason is None
+
+    def get_state(self) -> Dict:
+        return {name: list(value) if isinstance(value, list) else value
+                for name, value in ((name, getattr(self, name)) for name in self.STATE_FIELDS)}
+
+    def set_state(self, state: Dict):
+        if len(state['_trades']) != self.n_buckets:
+            return
+        for name in self.STATE_FIELDS:
+            setattr(self, name, state[name])
+        self._update_verdict()
+
+    def reset_stop_loss(self):
+        """Re-arm trading after a stop-loss, measuring drawdown from here"""
+        self.stop_loss_hit = False
+        self.peak_equity = self.equity
+        self._update_verdict()
+
+    def get_statistics(self) -> Dict:
+        drawdown = self.peak_equity - self.equity
+        return {
+            'allowed': self._allowed,
+            'halt_reason': self.halt_reason,
+            'trades': self.trades,
+            'max_trades': self.max_trades,
+            'trades_usage': self.trades / self.max_trades if self.max_trades else 0.0,
+            'pnl': self.pnl,
+            'loss_usage': max(0.0, -self.pnl) / self.max_loss if self.max_loss else 0.0,
+            'drawdown': drawdown,
+            'stop_loss_limit': self.stop_loss_pct * (self.capital + self.peak_equity),
+        }
+
+if __name__ == "__main__":
+    limits = RiskLimits(max_trades=100, max_loss=1.0, capital=10.0)
+    now = 1_700_000_000.0
+
+    n = 1_000_000
+    start = time.perf_counter()
+    for _ in range(n):
+        limits.allowed(now)
+    elapsed = time.perf_counter() - start
+    print(f"allowed(): {elapsed / n * 1e9:.0f} ns per call")
+
+    for i in range(100):
+        limits.record(now + i, 0.01)
+    print(limits.allowed(now + 100), limits.get_statistics()['halt_reason'])
+    # A day later the trades have rolled off
+    print(limits.allowed(now + 86400 + 200), limits.trades)
+    for i in range(20):
+        limits.record(now + 90000 + i, -0.1)
+    print(limits.allowed(now + 90100), limits.get_statistics())
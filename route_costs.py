@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Per-route trading costs for the Flash Arbitrage Engine
+Fee rates and gas per (buy venue, sell venue), precomputed whenever fees
+or sizing limits change, with a closed-form break-even spread used to
+reject candidates before any sizing or valuation runs
+"""
+
+from typing import Dict, List
+
+import numpy as np
+
+class RouteCosts:
+    """Fee and gas matrices over (buy venue, sell venue)
+
+    Buying v units at p_b and selling at p_s = p_b (1 + s) nets
+
+        v p_b (s - f_b - f_s (1 + s) - l (1 + f_b)) - (G0 + g v)
+
+    with venue fee rates f_b, f_s, a flash loan fee l on the buy leg
+    (fee included) and gas G0 + g v. It is positive only if
+
+        s > (f_b + f_s + l (1 + f_b) + (g + G0 / v) / p_b) / (1 - f_s)
+
+    The right side falls as v grows, so at the largest size the engine
+    would ever trade it is the route's break-even spread. Deeper levels and
+    curve movement only make the realized spread worse than top of book,
+    so a candidate whose quoted spread is at or below break-even cannot be
+    profitable at any size and is safe to drop unvalued.
+    """
+
+    def __init__(self, venues: List[str], fees: np.ndarray, fixed_cost: np.ndarray,
+                 unit_cost: np.ndarray, max_volume: float, loan_fee: float = 0.0):
+        self.venues = list(venues)
+        self.fees = np.asarray(fees, dtype=float)             # (venues,)
+        self.fee_by_venue = dict(zip(self.venues, self.fees.tolist()))
+        self.fixed_cost = np.asarray(fixed_cost, dtype=float)  # (buy, sell) gas per transaction
+        self.unit_cost = np.asarray(unit_cost, dtype=float)    # (buy, sell) gas per unit traded
+        self.max_volume = max_volume
+        self.loan_fee = loan_fee
+
+        # Everything but the price-dependent gas term, per route
+        self.fee_rate = self.fees[:, None] * (1.0 + loan_fee) + self.fees[None, :] + loan_fee
+        self.sell_keep = np.broadcast_to(1.0 - self.fees[None, :], self.fee_rate.shape)
+        self.gas_per_unit = self.unit_cost + self.fixed_cost / max(max_volume, 1e-12)
+
+        self.screened = 0
+        self.rejected = 0
+
+    @classmethod
+    def build(cls, exchanges: Dict[str, Dict], venues: List[str], base_gas: float,
+              gas_per_unit: float, max_volume: float, flash_loan_fee: float = 0.0) -> 'RouteCosts':
+        """Tables for the given exchange fees, flash loan fee and the engine's gas model"""
+        n = len(venues)
+        fees = np.array([exchanges[venue]['fee'] for venue in venues])
+        return cls(venues, fees, np.full((n, n), base_gas), np.full((n, n), gas_per_unit), max_volume,
+                   flash_loan_fee)
+
+    def break_even(self, buy_venues: np.ndarray, sell_venues: np.ndarray,
+                   buy_prices: np.ndarray) -> np.ndarray:
+        """Smallest relative spread that can pay for each (buy venue, sell venue, price)"""
+        return ((self.fee_rate[buy_venues, sell_venues]
+                 + self.gas_per_unit[buy_venues, sell_venues] / buy_prices)
+                / self.sell_keep[buy_venues, sell_venues])
+
+    def screen(self, buy_venues: np.ndarray, sell_venues: np.ndarray,
+               buy_prices: np.ndarray, spreads: np.ndarray) -> np.ndarray:
+        """Mask of candidates whose quoted spread clears their route's break-even"""
+        viable = spreads > self.break_even(buy_venues, sell_venues, buy_prices)
+        self.screened += len(viable)
+        self.rejected += len(viable) - int(viable.sum())
+        return viable
+
+    def route_break_even(self, price: float) -> Dict[str, Dict[str, float]]:
+        """Break-even spread of every route for an asset at the given price"""
+        matrix = (self.fee_rate + self.gas_per_unit / price) / self.sell_keep
+        return {buy: dict(zip(self.venues, row)) for buy, row in zip(self.venues, matrix.tolist())}
+
+    def get_statistics(self) -> Dict:
+        return {
+            'screened': self.screened,
+            'rejected': self.rejected,
+            'reject_rate': self.rejected / self.screened if self.screened else 0.0,
+            'max_volume': self.max_volume,
+            'loan_fee': self.loan_fee,
+            'fees': dict(self.fee_by_venue),
+        }
@@ -0,0 +1,417 @@
+#!/usr/bin/env python3
+"""
+Pluggable scanner backends for the Flash Arbitrage Engine
+Python, vectorized NumPy and native (.so) detection behind one interface,
+plus a parity harness and a startup micro-benchmark for backend selection
+"""
+
+import logging
+import statistics
+import time
+from collections import namedtuple
+from dataclasses import dataclass
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Quote shape used by the harness; any object with these attributes
+# (e.g. arbitrage_engine.MarketData) can be scanned. pair_id is the pair's
+# interned TokenUniverse id, which the scanners group quotes by.
+SyntheticQuote = namedtuple(
+    'SyntheticQuote',
+    ['exchange', 'token_pair', 'bid_price', 'ask_price', 'volume', 'timestamp', 'liquidity', 'pair_id']
+)
+
+@dataclass
+class ScanCandidate:
+    """A cross-exchange price dislocation found by a scanner backend"""
+    buy: object
+    sell: object
+    price_diff: float
+    profit_pct: float
+    direction: str
+
+    @property
+    def key(self) -> Tuple[str, str, str]:
+        return (self.buy.token_pair, self.buy.exchange, self.sell.exchange)
+
+class ScannerBackend:
+    """Base class for opportunity detection backends"""
+
+    name = 'base'
+
+    def is_available(self) -> bool:
+        """Whether the backend can run in this environment"""
+        return True
+
+    def configure(self, max_gas_cost: float, max_slippage: float):
+        """Take the engine's cost limits; only backends that filter on them need these"""
+
+    def scan(self, quotes: Sequence, min_profit_threshold: float) -> List[ScanCandidate]:
+        """Return every (buy, sell) dislocation whose profit exceeds the threshold"""
+        raise NotImplementedError
+
+class PythonScanner(ScannerBackend):
+    """Reference implementation: pairwise loop over quotes grouped by pair id"""
+
+    name = 'python'
+
+    def __init__(self):
+        # One reusable bucket per pair id, emptied after every scan
+        self._buckets: List[list] = []
+
+    def scan(self, quotes: Sequence, min_profit_threshold: float) -> List[ScanCandidate]:
+        candidates = []
+
+        # Group market data by pair id, in order of first appearance
+        buckets = self._buckets
+        touched = []
+        for data in quotes:
+            pair_id = data.pair_id
+            if pair_id >= len(buckets):
+                buckets.extend([] for _ in range(pair_id + 1 - len(buckets)))
+            bucket = buckets[pair_id]
+            if not bucket:
+                touched.append(pair_id)
+            bucket.append(data)
+
+        try:
+            # Compare all exchange combinations
+            for pair_id in touched:
+                data_list = buckets[pair_id]
+                if len(data_list) < 2:
+                    continue
+
+                for i in range(len(data_list)):
+                    for j in range(i + 1, len(data_list)):
+                        data_a = data_list[i]
+                        data_b = data_list[j]
+
+                        if data_a.ask_price < data_b.bid_price:
+                            # Buy on A, sell on B
+                            price_diff = data_b.bid_price - data_a.ask_price
+                            profit_pct = price_diff / data_a.ask_price
+                            if profit_pct > min_profit_threshold:
+                                candidates.append(ScanCandidate(
+                                    data_a, data_b, price_diff, profit_pct, 'buy_a_sell_b'
+                                ))
+
+                        elif data_b.ask_price < data_a.bid_price:
+                            # Buy on B, sell on A
+                            price_diff = data_a.bid_price - data_b.ask_price
+                            profit_pct = price_diff / data_b.ask_price
+                            if profit_pct > min_profit_threshold:
+                                candidates.append(ScanCandidate(
+                                    data_b, data_a, price_diff, profit_pct, 'buy_b_sell_a'
+                                ))
+        finally:
+            for pair_id in touched:
+                buckets[pair_id].clear()
+
+        return candidates
+
+class NumpyScanner(ScannerBackend):
+    """Vectorized implementation over a padded (pair x venue) quote matrix"""
+
+    name = 'numpy'
+
+    def scan(self, quotes: Sequence, min_profit_threshold: float) -> List[ScanCandidate]:
+        n = len(quotes)
+        if n < 2:
+            return []
+
+        # Row per pair id and slot per quote within its pair, in arrival order,
+        # from a stable sort of the ids instead of a per-pair lookup
+        pair_ids = np.fromiter((q.pair_id for q in quotes), np.intp, n)
+        order = np.argsort(pair_ids, kind='stable')
+        sorted_ids = pair_ids[order]
+        first = np.empty(n, dtype=bool)
+        first[0] = True
+        np.not_equal(sorted_ids[1:], sorted_ids[:-1], out=first[1:])
+        positions = np.arange(n)
+        rows = np.empty(n, dtype=np.intp)
+        slots = np.empty(n, dtype=np.intp)
+        rows[order] = np.cumsum(first) - 1
+        slots[order] = positions - np.maximum.accumulate(np.where(first, positions, 0))
+
+        width = int(slots.max()) + 1
+        if width < 2:
+            return []
+        n_pairs = int(rows[order[-1]]) + 1
+
+        # Padding can never produce a dislocation: ask=+inf, bid=-inf
+        asks = np.full((n_pairs, width), np.inf)
+        bids = np.full((n_pairs, width), -np.inf)
+        asks[rows, slots] = np.fromiter((q.ask_price for q in quotes), float, n)
+        bids[rows, slots] = np.fromiter((q.bid_price for q in quotes), float, n)
+        index = np.full((n_pairs, width), -1, dtype=np.intp)
+        index[rows, slots] = positions
+
+        # diff[p, a, b] = bid on venue b - ask on venue a
+        with np.errstate(invalid='ignore', divide='ignore'):
+            diff = bids[:, None, :] - asks[:, :, None]
+            pct = diff / asks[:, :, None]
+        crossed = asks[:, :, None] < bids[:, None, :]
+        # As in the reference: never a quote against itself, and a pair crossed
+        # both ways is only bought on its earlier quote
+        earlier = np.triu(np.ones((width, width), dtype=bool), 1)
+        hits = crossed & (earlier | (~crossed.transpose(0, 2, 1) & earlier.T)) & (pct > min_profit_threshold)
+
+        p, a, b = np.nonzero(hits)
+        return [
+            ScanCandidate(quotes[i], quotes[j], d, r, 'buy_a_sell_b' if x < y else 'buy_b_sell_a')
+            for i, j, d, r, x, y in zip(index[p, a].tolist(), index[p, b].tolist(),
+                                        diff[p, a, b].tolist(), pct[p, a, b].tolist(),
+                                        a.tolist(), b.tolist())
+        ]
+
+class NativeScanner(ScannerBackend):
+    """Adapter around scan_for_opportunities in libarbitrage_engine.so
+
+    The library keeps every quote it is given until it is reset, and only
+    prices buying an earlier-added quote against selling a later one, by
+    |sell bid - buy ask| over their mid. It drops a route when its own gas
+    model (LIBRARY_BASE_GAS + LIBRARY_GAS_PER_UNIT per unit of the smaller
+    volume) reaches max_gas, or when net profit at that volume is not
+    positive.
+
+    Each scan therefore starts from a reset library, runs with the quotes
+    forward and reversed, and translates the threshold to the mid basis.
+    Volumes are capped at the largest size max_gas_cost allows, as the
+    engine sizes trades down rather than dropping them. Every hit is
+    re-checked and oriented against the quotes. Below the library's gas
+    floor (about max_gas_cost / that size) it misses small dislocations,
+    which the parity check in select_backend catches.
+    """
+
+    name = 'native'
+
+    # The library's built-in gas model, in SOL
+    LIBRARY_BASE_GAS = 0.001
+    LIBRARY_GAS_PER_UNIT = 0.0001
+
+    def __init__(self, lib_path: str = None, max_gas_cost: float = 0.02, max_slippage: float = 0.03):
+        self.lib_path = lib_path
+        self._engine = None
+        self._load_error = None
+        self._names: Dict[Tuple[str, str], Tuple[bytes, bytes]] = {}   # UTF-8 names per market
+        self.configure(max_gas_cost, max_slippage)
+
+    def configure(self, max_gas_cost: float, max_slippage: float):
+        self.max_gas_cost = max_gas_cost
+        self.max_slippage = max_slippage
+        # Just under the size whose library gas reaches max_gas_cost
+        self.max_volume = max(0.0, (max_gas_cost - self.LIBRARY_BASE_GAS)
+                              / self.LIBRARY_GAS_PER_UNIT * (1 - 1e-9))
+
+    def _get_engine(self):
+        if self._engine is None and self._load_error is None:
+            try:
+                from arbitrage_wrapper import ArbitrageEngine as CppEngine
+                self._engine = CppEngine(self.lib_path)
+            except Exception as e:
+                self._load_error = e
+                logger.warning(f"Native scanner unavailable: {e}")
+        return self._engine
+
+    def is_available(self) -> bool:
+        return self._get_engine() is not None
+
+    def scan(self, quotes: Sequence, min_profit_threshold: float) -> List[ScanCandidate]:
+        engine = self._get_engine()
+        if engine is None:
+            raise RuntimeError(f"Native scanner unavailable: {self._load_error}")
+
+        positions = {}
+        rows = []
+        names, max_volume = self._names, self.max_volume
+        for position, data in enumerate(quotes):
+            key = (data.exchange, data.token_pair)
+            encoded = names.get(key)
+            if encoded is None:
+                encoded = names[key] = (data.exchange.encode('utf-8'), data.token_pair.encode('utf-8'))
+            positions[encoded] = position
+            rows.append((encoded[0], encoded[1], data.bid_price, data.ask_price, min(data.volume, max_volume)))
+
+        # diff / ask > t exactly when diff / mid > t / (1 + t / 2); the slack
+        # absorbs rounding, the exact test is applied below
+        library_threshold = min_profit_threshold / (1 + min_profit_threshold / 2) * (1 - 1e-9)
+        hits = set()
+        for ordered in (rows, rows[::-1]):
+            engine.reset()
+            engine.set_config(min_profit=library_threshold, max_gas=self.max_gas_cost,
+                              max_slippage=self.max_slippage)
+            engine.add_quotes(ordered)
+            engine.scan_opportunities()
+            hits.update(engine.get_opportunity_routes())
+
+        # The library reports names only; re-attach the quotes and keep real dislocations
+        candidates = []
+        for pair, buy_exchange, sell_exchange in hits:
+            i = positions.get((buy_exchange, pair))
+            j = positions.get((sell_exchange, pair))
+            if i is None or j is None or i == j:
+                continue
+            buy, sell = quotes[i], quotes[j]
+            # A pair crossed both ways is only bought on its earlier quote, as in the reference
+            if i > j and sell.ask_price < buy.bid_price:
+                continue
+            if buy.ask_price < sell.bid_price:
+                price_diff = sell.bid_price - buy.ask_price
+                profit_pct = price_diff / buy.ask_price
+                if profit_pct > min_profit_threshold:
+                    candidates.append(ScanCandidate(
+                        buy, sell, price_diff, profit_pct, 'buy_a_sell_b' if i < j else 'buy_b_sell_a'
+                    ))
+        return candidates
+
+# Registry of known backends, in order of preference when timings tie
+BACKENDS = {
+    'python': PythonScanner,
+    'numpy': NumpyScanner,
+    'native': NativeScanner,
+}
+
+def create_backend(name: str, **kwargs) -> ScannerBackend:
+    """Instantiate a scanner backend by name"""
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown scanner backend '{name}'. Available: {list(BACKENDS)}")
+    return BACKENDS[name](**kwargs)
+
+def generate_synthetic_quotes(exchanges: Sequence[str], token_pairs: Sequence[str],
+                              seed: int = 0, timestamp: float = None) -> List[SyntheticQuote]:
+    """Generate one quote per (exchange, pair) with dislocations like the simulated feed"""
+    rng = np.random.default_rng(seed)
+    timestamp = time.time() if timestamp is None else timestamp
+    quotes = []
+    for exchange in exchanges:
+        for i, pair in enumerate(token_pairs):
+            base_price = 0.001 + (i % 97) * 0.5
+            spread = base_price * 0.001
+            bid_price = base_price - (spread / 2) + rng.normal(0, spread * 2)
+            ask_price = base_price + (spread / 2) + rng.normal(0, spread * 2)
+            quotes.append(SyntheticQuote(
+                exchange=exchange,
+                token_pair=pair,
+                bid_price=max(0.0, bid_price),
+                ask_price=max(bid_price, ask_price),
+                volume=rng.uniform(1000, 10000),
+                timestamp=timestamp,
+                liquidity=rng.uniform(50000, 500000),
+                pair_id=i
+            ))
+    return quotes
+
+def diff_candidates(reference: List[ScanCandidate], other: List[ScanCandidate],
+                    tolerance: float = 1e-12) -> Dict[str, list]:
+    """Compare two candidate sets by (pair, buy venue, sell venue), then values and direction"""
+    ref = {c.key: c for c in reference}
+    got = {c.key: c for c in other}
+    mismatched = [
+        key for key in ref.keys() & got.keys()
+        if abs(ref[key].price_diff - got[key].price_diff) > tolerance
+        or abs(ref[key].profit_pct - got[key].profit_pct) > tolerance
+        or ref[key].direction != got[key].direction
+    ]
+    return {
+        'missing': sorted(ref.keys() - got.keys()),
+        'extra': sorted(got.keys() - ref.keys()),
+        'mismatched': sorted(mismatched),
+    }
+
+def run_parity_check(quote_sets: Sequence[Sequence], min_profit_threshold: float,
+                     backends: Dict[str, ScannerBackend] = None) -> Dict[str, Dict]:
+    """Replay the same quotes through every backend and diff against the Python reference
+
+    Returns:
+        Mapping of backend name to {'ok', 'missing', 'extra', 'mismatched'} totals
+    """
+    reference = PythonScanner()
+    if backends is None:
+        backends = {name: create_backend(name) for name in BACKENDS}
+
+    report = {}
+    for name, backend in backends.items():
+        if not backend.is_available():
+            report[name] = {'ok': False, 'available': False}
+            continue
+
+        totals = {'missing': [], 'extra': [], 'mismatched': []}
+        for quotes in quote_sets:
+            diff = diff_candidates(reference.scan(quotes, min_profit_threshold),
+                                   backend.scan(quotes, min_profit_threshold))
+            for field, keys in diff.items():
+                totals[field].extend(keys)
+
+        report[name] = {
+            'ok': not any(totals.values()),
+            'available': True,
+            **{field: len(keys) for field, keys in totals.items()},
+        }
+        if not report[name]['ok']:
+            logger.warning(f"Scanner backend '{name}' diverges from reference: {report[name]}")
+    return report
+
+def benchmark_backends(quotes: Sequence, min_profit_threshold: float,
+                       backends: Dict[str, ScannerBackend], repeats: int = 5) -> Dict[str, float]:
+    """Median scan time in seconds for each backend over the same quotes"""
+    timings = {}
+    for name, backend in backends.items():
+        samples = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            backend.scan(quotes, min_profit_threshold)
+            samples.append(time.perf_counter() - start)
+        timings[name] = statistics.median(samples)
+    return timings
+
+def select_backend(exchanges: Sequence[str], token_pairs: Sequence[str],
+                   min_profit_threshold: float, candidates: Sequence[str] = None,
+                   repeats: int = 5, seed: int = 0, max_gas_cost: float = 0.02,
+                   max_slippage: float = 0.03) -> ScannerBackend:
+    """Pick the fastest backend that matches the reference on this universe size and cost limits"""
+    names = list(candidates or BACKENDS)
+    backends = {name: create_backend(name) for name in names}
+    for backend in backends.values():
+        backend.configure(max_gas_cost, max_slippage)
+    quote_sets = [generate_synthetic_quotes(exchanges, token_pairs, seed=seed + i) for i in range(3)]
+
+    parity = run_parity_check(quote_sets, min_profit_threshold, backends)
+    correct = {name: backends[name] for name in names if parity[name]['ok']}
+    if not correct:
+        logger.warning("No scanner backend passed parity, falling back to python")
+        return PythonScanner()
+
+    timings = benchmark_backends(quote_sets[0], min_profit_threshold, correct, repeats)
+    best = min(timings, key=timings.get)
+    logger.info(f"Selected scanner backend '{best}' for {len(token_pairs)} pairs x "
+                f"{len(exchanges)} exchanges: " +
+                ", ".join(f"{name}={t * 1e3:.3f}ms" for name, t in timings.items()))
+    return correct[best]
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Scanner backend parity harness and benchmark")
+    parser.add_argument('--pairs', type=int, default=12, help='Number of token pairs')
+    parser.add_argument('--exchanges', type=int, default=4, help='Number of exchanges')
+    parser.add_argument('--rounds', type=int, default=10, help='Quote sets to replay')
+    parser.add_argument('--min-profit', type=float, default=0.0005, help='Minimum profit threshold')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    exchanges = [f"venue{i}" for i in range(args.exchanges)]
+    pairs = [f"TKN{i}/SOL" for i in range(args.pairs)]
+    quote_sets = [generate_synthetic_quotes(exchanges, pairs, seed=i) for i in range(args.rounds)]
+
+    backends = {name: create_backend(name) for name in BACKENDS}
+    print("Parity:")
+    for name, result in run_parity_check(quote_sets, args.min_profit, backends).items():
+        print(f"  {name}: {result}")
+
+    available = {name: b for name, b in backends.items() if b.is_available()}
+    print("Median scan time:")
+    for name, seconds in benchmark_backends(quote_sets[0], args.min_profit, available).items():
+        print(f"  {name}: {seconds * 1e3:.3f} ms")
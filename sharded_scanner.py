@@ -0,0 +1,402 @@
+#!/usr/bin/env python3
+"""
+Multi-process sharded scanning for the Flash Arbitrage Engine
+Quotes live in a shared-memory matrix written by one collector per exchange;
+scanner worker processes each own a shard of token pairs and publish their
+candidates back through lock-free single-producer/single-consumer rings
+"""
+
+import logging
+import multiprocessing as mp
+import time
+from multiprocessing import shared_memory
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Quote matrix fields
+BID, ASK, VOLUME, LIQUIDITY, TIMESTAMP = range(5)
+N_FIELDS = 5
+
+# Control block slots
+CTL_RUNNING, CTL_MIN_PROFIT, CTL_INTERVAL = range(3)
+N_CONTROL = 4
+
+# Candidate ring record: pair, buy exchange, sell exchange, price diff, profit pct, generation
+N_RECORD = 6
+END_OF_BATCH = -1.0
+
+# Ring header slots
+HEAD, TAIL, DROPPED, SCANS, OVERSIZED = range(5)
+N_HEADER = 5
+
+class QuoteMatrix:
+    """(exchange x pair x field) float64 quote matrix in shared memory
+
+    Every exchange row is guarded by its own sequence counter (a seqlock):
+    the collector for that exchange is the only writer, so writers never
+    contend and readers simply retry a row that changed under them.
+    """
+
+    def __init__(self, n_exchanges: int, n_pairs: int, name: str = None):
+        self.n_exchanges = n_exchanges
+        self.n_pairs = n_pairs
+        quotes_size = n_exchanges * n_pairs * N_FIELDS * 8
+        size = quotes_size + n_exchanges * 8 + N_CONTROL * 8
+
+        self.owner = name is None
+        if self.owner:
+            self.shm = shared_memory.SharedMemory(create=True, size=size)
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+
+        buf = self.shm.buf
+        self.quotes = np.ndarray((n_exchanges, n_pairs, N_FIELDS), dtype=np.float64, buffer=buf)
+        self.seq = np.ndarray((n_exchanges,), dtype=np.int64, buffer=buf, offset=quotes_size)
+        self.control = np.ndarray((N_CONTROL,), dtype=np.float64, buffer=buf,
+                                  offset=quotes_size + n_exchanges * 8)
+        if self.owner:
+            self.quotes.fill(0.0)
+            self.seq.fill(0)
+            self.control.fill(0.0)
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    def write_row(self, exchange_idx: int, bids, asks, volumes, liquidity, timestamps,
+                  pair_ids=None):
+        """Publish a tick for one exchange (single writer per row)
+
+        Without pair_ids the arrays cover every pair; otherwise only those pairs.
+        """
+        self.seq[exchange_idx] += 1  # odd: write in progress
+        row = self.quotes[exchange_idx]
+        if pair_ids is not None:
+            row = row[pair_ids]
+        row[:, BID] = bids
+        row[:, ASK] = asks
+        row[:, VOLUME] = volumes
+        row[:, LIQUIDITY] = liquidity
+        row[:, TIMESTAMP] = timestamps
+        if pair_ids is not None:
+            self.quotes[exchange_idx, pair_ids] = row
+        self.seq[exchange_idx] += 1  # even: row consistent
+
+    def read_shard(self, lo: int, hi: int, out: np.ndarray = None) -> np.ndarray:
+        """Copy a consistent snapshot of pairs [lo, hi) across all exchanges"""
+        if out is None:
+            out = np.empty((self.n_exchanges, hi - lo, N_FIELDS), dtype=np.float64)
+        for e in range(self.n_exchanges):
+            retries = 0
+            while True:
+                before = self.seq[e]
+                if not before & 1:
+                    out[e] = self.quotes[e, lo:hi]
+                    if self.seq[e] == before:
+                        break
+                # The collector is mid-write: yield, then back off if it stays busy
+                retries += 1
+                time.sleep(0 if retries < 8 else 0.0001)
+        return out
+
+    def close(self):
+        self.quotes = self.seq = self.control = None
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+class CandidateRing:
+    """Lock-free SPSC ring of fixed-size candidate records in shared memory
+
+    The worker process only advances the tail and the engine only advances
+    the head, so neither side ever takes a lock. When the consumer falls
+    behind, whole batches are dropped and counted rather than blocking the
+    scan. A batch larger than the whole ring is streamed through in chunks
+    instead (see push_streamed) and counted as oversized.
+    """
+
+    def __init__(self, capacity: int = 4096, name: str = None):
+        self.capacity = capacity
+        size = N_HEADER * 8 + capacity * N_RECORD * 8
+
+        self.owner = name is None
+        if self.owner:
+            self.shm = shared_memory.SharedMemory(create=True, size=size)
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+
+        self.header = np.ndarray((N_HEADER,), dtype=np.int64, buffer=self.shm.buf)
+        self.records = np.ndarray((capacity, N_RECORD), dtype=np.float64,
+                                  buffer=self.shm.buf, offset=N_HEADER * 8)
+        if self.owner:
+            self.header.fill(0)
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    def push_batch(self, records: np.ndarray) -> int:
+        """Producer side: append a whole batch, or drop it if it does not fit"""
+        head = int(self.header[HEAD])
+        tail = int(self.header[TAIL])
+        n = len(records)
+        if n > self.capacity - (tail - head):
+            # Never publish part of a batch; the consumer keeps the previous one
+            self.header[DROPPED] += n
+            return 0
+        self.records[(tail + np.arange(n)) % self.capacity] = records
+        # Publish only after the records are in place
+        self.header[TAIL] = tail + n
+        return n
+
+    def free(self) -> int:
+        """Records that fit before the consumer has to catch up"""
+        return self.capacity - int(self.header[TAIL] - self.header[HEAD])
+
+    def push_streamed(self, records: np.ndarray, running) -> bool:
+        """Producer side: push a batch larger than the ring in capacity-sized chunks
+
+        Waits for the consumer to make room between chunks, since the batch
+        could never fit whole, and gives up once running() is false. The
+        consumer reassembles the batch from its end-of-batch marker as usual.
+        """
+        self.header[OVERSIZED] += 1
+        for start in range(0, len(records), self.capacity):
+            chunk = records[start:start + self.capacity]
+            while self.free() < len(chunk):
+                if not running():
+                    return False
+                time.sleep(0.001)
+            self.push_batch(chunk)
+        return True
+
+    def pop_all(self) -> np.ndarray:
+        """Consumer side: take every published record"""
+        head = int(self.header[HEAD])
+        tail = int(self.header[TAIL])
+        if tail == head:
+            return np.empty((0, N_RECORD))
+        idx = np.arange(head, tail) % self.capacity
+        out = self.records[idx].copy()
+        self.header[HEAD] = tail
+        return out
+
+    def close(self):
+        self.header = self.records = None
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+def scan_shard(snapshot: np.ndarray, min_profit_threshold: float, pair_offset: int) -> np.ndarray:
+    """Vectorized dislocation scan of one shard snapshot
+
+    Returns:
+        Array of (pair, buy exchange, sell exchange, price diff, profit pct) rows
+    """
+    bids = snapshot[:, :, BID]
+    asks = snapshot[:, :, ASK]
+    live = snapshot[:, :, TIMESTAMP] > 0
+
+    # diff[a, b, p] = bid on exchange b - ask on exchange a
+    with np.errstate(invalid='ignore', divide='ignore'):
+        diff = bids[None, :, :] - asks[:, None, :]
+        pct = diff / asks[:, None, :]
+    hits = (asks[:, None, :] < bids[None, :, :]) & (pct > min_profit_threshold)
+    hits &= live[:, None, :] & live[None, :, :]
+
+    a, b, p = np.nonzero(hits)
+    out = np.empty((len(p), N_RECORD - 1))
+    out[:, 0] = p + pair_offset
+    out[:, 1] = a
+    out[:, 2] = b
+    out[:, 3] = diff[a, b, p]
+    out[:, 4] = pct[a, b, p]
+    return out
+
+def _scan_worker(matrix_name: str, n_exchanges: int, n_pairs: int,
+                 ring_name: str, ring_capacity: int, lo: int, hi: int):
+    """Scanner worker process: scan pairs [lo, hi) until the engine stops"""
+    matrix = QuoteMatrix(n_exchanges, n_pairs, name=matrix_name)
+    ring = CandidateRing(ring_capacity, name=ring_name)
+    snapshot = np.empty((n_exchanges, hi - lo, N_FIELDS))
+    generation = 0
+
+    try:
+        while matrix.control[CTL_RUNNING] > 0:
+            matrix.read_shard(lo, hi, snapshot)
+            hits = scan_shard(snapshot, matrix.control[CTL_MIN_PROFIT], lo)
+
+            generation += 1
+            batch = np.empty((len(hits) + 1, N_RECORD))
+            batch[:-1, :N_RECORD - 1] = hits
+            batch[-1, :N_RECORD - 1] = (END_OF_BATCH, 0, 0, 0, 0)
+            batch[:, N_RECORD - 1] = generation
+            if len(batch) > ring.capacity:
+                ring.push_streamed(batch, lambda: matrix.control[CTL_RUNNING] > 0)
+            else:
+                ring.push_batch(batch)
+            ring.header[SCANS] += 1
+
+            interval = matrix.control[CTL_INTERVAL]
+            if interval > 0:
+                time.sleep(interval)
+    finally:
+        matrix.shm.close()
+        ring.shm.close()
+
+class ShardedScanner:
+    """Owns the shared quote matrix, the scanner workers and their candidate rings"""
+
+    def __init__(self, exchanges: Sequence[str], token_pairs: Sequence[str],
+                 n_workers: int = 2, interval: float = 0.05, ring_capacity: int = 4096):
+        self.exchanges = list(exchanges)
+        self.token_pairs = list(token_pairs)
+        self.exchange_index = {name: i for i, name in enumerate(self.exchanges)}
+        self.pair_index = {pair: i for i, pair in enumerate(self.token_pairs)}
+        self.n_workers = max(1, min(n_workers, len(self.token_pairs)))
+        self.interval = interval
+        self.ring_capacity = ring_capacity
+
+        self.matrix = None
+        self.rings = []
+        self.processes = []
+        self.shards = []
+        # Latest complete batch per worker, plus records of the batch in progress
+        self._current = []
+        self._partial = []
+        self._warned_oversized = False
+
+    def start(self, min_profit_threshold: float):
+        """Allocate shared memory and launch one scanner process per shard"""
+        self.matrix = QuoteMatrix(len(self.exchanges), len(self.token_pairs))
+        self.matrix.control[CTL_RUNNING] = 1.0
+        self.matrix.control[CTL_MIN_PROFIT] = min_profit_threshold
+        self.matrix.control[CTL_INTERVAL] = self.interval
+
+        bounds = np.linspace(0, len(self.token_pairs), self.n_workers + 1).astype(int)
+        self.shards = [(int(bounds[i]), int(bounds[i + 1])) for i in range(self.n_workers)]
+
+        ctx = mp.get_context('spawn')
+        for lo, hi in self.shards:
+            ring = CandidateRing(self.ring_capacity)
+            process = ctx.Process(
+                target=_scan_worker,
+                args=(self.matrix.name, len(self.exchanges), len(self.token_pairs),
+                      ring.name, self.ring_capacity, lo, hi),
+                daemon=True
+            )
+            process.start()
+            self.rings.append(ring)
+            self.processes.append(process)
+            self._current.append(np.empty((0, N_RECORD)))
+            self._partial.append([])
+
+        logger.info(f"Started {self.n_workers} scanner workers over "
+                    f"{len(self.token_pairs)} pairs x {len(self.exchanges)} exchanges")
+        return self
+
+    def set_min_profit_threshold(self, value: float):
+        if self.matrix is not None:
+            self.matrix.control[CTL_MIN_PROFIT] = value
+
+    def publish_row(self, exchange: str, bids, asks, volumes, liquidity, timestamps,
+                    pair_ids=None):
+        """Collector side: write one exchange's tick into the shared matrix"""
+        self.matrix.write_row(self.exchange_index[exchange], bids, asks,
+                              volumes, liquidity, timestamps, pair_ids)
+
+    def drain(self) -> np.ndarray:
+        """Executor side: latest complete candidate batch from every shard"""
+        if not self._warned_oversized and any(ring.header[OVERSIZED] for ring in self.rings):
+            self._warned_oversized = True
+            logger.warning(f"Scanner shards found more candidates than ring_capacity "
+                           f"({self.ring_capacity}); batches are streamed in chunks, "
+                           f"raise ring_capacity to publish them in one step")
+        for w, ring in enumerate(self.rings):
+            records = ring.pop_all()
+            if not len(records):
+                continue
+            ends = np.nonzero(records[:, 0] == END_OF_BATCH)[0]
+            if not len(ends):
+                self._partial[w].append(records)
+                continue
+            # Everything up to the last marker completes the newest batch
+            last = ends[-1]
+            pending = self._partial[w] + [records[:last + 1]]
+            merged = np.concatenate(pending)
+            marks = np.nonzero(merged[:, 0] == END_OF_BATCH)[0]
+            start = marks[-2] + 1 if len(marks) > 1 else 0
+            self._current[w] = merged[start:marks[-1]]
+            self._partial[w] = [records[last + 1:]] if last + 1 < len(records) else []
+
+        return np.concatenate(self._current) if self._current else np.empty((0, N_RECORD))
+
+    def get_statistics(self) -> Dict:
+        return {
+            'workers': self.n_workers,
+            'scans': int(sum(ring.header[SCANS] for ring in self.rings)),
+            'dropped_candidates': int(sum(ring.header[DROPPED] for ring in self.rings)),
+            'oversized_batches': int(sum(ring.header[OVERSIZED] for ring in self.rings)),
+        }
+
+    def stop(self):
+        """Stop the workers and release shared memory"""
+        if self.matrix is None:
+            return
+        self.matrix.control[CTL_RUNNING] = 0.0
+        for process in self.processes:
+            process.join(timeout=2)
+            if process.is_alive():
+                process.terminate()
+        for ring in self.rings:
+            ring.close()
+        self.matrix.close()
+        self.matrix = None
+        self.rings, self.processes = [], []
+        self._current, self._partial = [], []
+
+def benchmark_scaling(n_pairs: int, n_exchanges: int, worker_counts: Sequence[int],
+                      duration: float = 2.0) -> List[Tuple[int, float]]:
+    """Measure pair-scans per second for each worker count"""
+    results = []
+    exchanges = [f"venue{i}" for i in range(n_exchanges)]
+    pairs = [f"TKN{i}/SOL" for i in range(n_pairs)]
+    rng = np.random.default_rng(0)
+
+    for workers in worker_counts:
+        scanner = ShardedScanner(exchanges, pairs, n_workers=workers, interval=0.0)
+        scanner.start(0.0005)
+        for exchange in exchanges:
+            mid = rng.uniform(0.01, 100.0, n_pairs)
+            scanner.publish_row(exchange, mid * 0.999, mid * 1.001,
+                                np.full(n_pairs, 1000.0), np.full(n_pairs, 1e5),
+                                np.full(n_pairs, time.time()))
+        time.sleep(1.0)  # let spawned workers start
+        before = scanner.get_statistics()['scans']
+        # Drain like the engine does, so shards larger than a ring keep flowing
+        deadline = time.perf_counter() + duration
+        while time.perf_counter() < deadline:
+            scanner.drain()
+            time.sleep(0.001)
+        scans = scanner.get_statistics()['scans'] - before
+        scanner.stop()
+        # Each scan covers one shard, i.e. n_pairs / workers pairs
+        results.append((workers, scans * (n_pairs / workers) / duration))
+    return results
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Sharded scanner throughput benchmark")
+    parser.add_argument('--pairs', type=int, default=20000, help='Number of token pairs')
+    parser.add_argument('--exchanges', type=int, default=4, help='Number of exchanges')
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4], help='Worker counts')
+    args = parser.parse_args()
+
+    baseline = None
+    for workers, rate in benchmark_scaling(args.pairs, args.exchanges, args.workers):
+        baseline = baseline or rate
+        print(f"{workers} workers: {rate:,.0f} pair-scans/s ({rate / baseline:.2f}x)")
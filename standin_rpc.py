@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Local stand-in Solana RPC for the Flash Arbitrage Engine
+Answers the JSON-RPC calls execution makes (latest blockhash, block
+height, send, signature status, health), checking every signature it is sent, so the
+transaction path runs end to end without a validator or real funds
+"""
+
+import base64
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+
+from solders.hash import Hash
+from solders.transaction import VersionedTransaction
+
+class RPCError(Exception):
+    """A JSON-RPC error response, shaped like a validator's"""
+
+    def __init__(self, code: int, message: str, data: Dict = None):
+        super().__init__(message)
+        self.error = {'code': code, 'message': message}
+        if data is not None:
+            self.error['data'] = data
+
+class StandInRPC:
+    """JSON-RPC server on localhost holding every transaction it accepts
+
+    The blockhash changes every blockhash_interval seconds and only the
+    last max_blockhashes stay valid, as on a validator, so stale templates
+    are rejected. sendTransaction rejects anything that does not
+    deserialize, carries an invalid signature or an unknown blockhash.
+    Accepted transactions are confirmed immediately, or with confirm=False
+    never land, as when a leader drops them, so callers see them expire.
+    """
+
+    def __init__(self, port: int = 0, blockhash_interval: float = 0.4, max_blockhashes: int = 150,
+                 confirm: bool = True):
+        self.blockhash_interval = blockhash_interval
+        self.confirm = confirm
+        self.blockhashes: List[Hash] = [Hash.new_unique()]
+        self.max_blockhashes = max_blockhashes
+        self._rotated_at = time.monotonic()
+        self.slot = 1
+        self.transactions: Dict[str, VersionedTransaction] = {}
+        self.rejected: List[str] = []
+        self._lock = threading.Lock()
+
+        rpc = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                request = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+                requests = request if isinstance(request, list) else [request]
+                responses = [rpc.handle(r) for r in requests]
+                body = json.dumps(responses if isinstance(request, list) else responses[0]).encode()
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', port), Handler)
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def start(self) -> 'StandInRPC':
+        self._thread = threading.Thread(target=self.server.serve_forever, name='standin-rpc', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def latest_blockhash(self) -> Hash:
+        with self._lock:
+            now = time.monotonic()
+            if now - self._rotated_at >= self.blockhash_interval:
+                self._rotated_at = now
+                self.slot += 1
+                self.blockhashes = (self.blockhashes + [Hash.new_unique()])[-self.max_blockhashes:]
+            return self.blockhashes[-1]
+
+    def handle(self, request: Dict) -> Dict:
+        method, params = request.get('method'), request.get('params') or []
+        handler = getattr(self, f"rpc_{method}", None)
+        if handler is None:
+            return {'jsonrpc': '2.0', 'id': request.get('id'),
+                    'error': {'code': -32601, 'message': f"Method not found: {method}"}}
+        try:
+            return {'jsonrpc': '2.0', 'id': request.get('id'), 'result': handler(*params)}
+        except RPCError as e:
+            return {'jsonrpc': '2.0', 'id': request.get('id'), 'error': e.error}
+
+    def context(self) -> Dict:
+        return {'slot': self.slot, 'apiVersion': '1.17.0'}
+
+    def rpc_getHealth(self, *_):
+        return 'ok'
+
+    def rpc_getLatestBlockhash(self, *_):
+        blockhash = self.latest_blockhash()
+        return {'context': self.context(),
+                'value': {'blockhash': str(blockhash), 'lastValidBlockHeight': self.slot + self.max_blockhashes}}
+
+    def rpc_getBlockHeight(self, *_):
+        self.latest_blockhash()
+        return self.slot
+
+    def rpc_sendTransaction(self, encoded: str, config: Optional[Dict] = None):
+        encoding = (config or {}).get('encoding', 'base58')
+        if encoding != 'base64':
+            raise RPCError(-32602, f"Unsupported encoding {encoding}")
+        try:
+            transaction = VersionedTransaction.from_bytes(base64.b64decode(encoded))
+        except Exception as e:
+            raise RPCError(-32602, f"failed to deserialize transaction: {e}")
+
+        signature = str(transaction.signatures[0])
+        if not all(transaction.verify_with_results()):
+            self.rejected.append(signature)
+            raise RPCError(-32003, "Transaction signature verification failure")
+        self.latest_blockhash()
+        if transaction.message.recent_blockhash not in self.blockhashes:
+            self.rejected.append(signature)
+            raise RPCError(-32002, "Transaction simulation failed: Blockhash not found", {
+                'err': 'BlockhashNotFound', 'logs': [], 'accounts': None,
+                'unitsConsumed': 0, 'returnData': None,
+            })
+        self.transactions[signature] = transaction
+        return signature
+
+    def rpc_getSignatureStatuses(self, signatures: List[str], *_):
+        return {'context': self.context(), 'value': [
+            {'slot': self.slot, 'confirmations': None, 'err': None,
+             'status': {'Ok': None}, 'confirmationStatus': 'confirmed'}
+            if self.confirm and signature in self.transactions else None
+            for signature in signatures
+        ]}
+
+    def get_statistics(self) -> Dict:
+        return {
+            'url': self.url,
+            'slot': self.slot,
+            'accepted': len(self.transactions),
+            'rejected': len(self.rejected),
+        }
+
+if __name__ == "__main__":
+    import asyncio
+    from dataclasses import replace
+    from arbitrage_engine import ArbitrageOpportunity, FlashArbitrageEngine
+    from config import get_config
+    from solders.keypair import Keypair
+
+    async def main():
+        rpc = StandInRPC().start()
+        engine = FlashArbitrageEngine({**get_config(), 'execution_mode': 'rpc', 'solana_rpc_url': rpc.url,
+                                       'private_key': str(Keypair()), 'checkpoint_interval': 0})
+        await engine.refresh_blockhash()
+        opportunity = ArbitrageOpportunity(
+            token_pair='SOL/USDC', exchange_a='orca', exchange_b='raydium', price_a=100.0, price_b=100.8,
+            price_diff=0.8, profit_potential=0.008, volume=10.0, gas_cost=0.001, net_profit=0.05,
+            confidence=0.9, risk_score=0.1, timestamp=time.time())
+        results = [await engine.execute_arbitrage(replace(opportunity, volume=10.0 + i)) for i in range(5)]
+        print(f"Confirmed: {results}")
+        print(f"Stand-in RPC: {rpc.get_statistics()}")
+        print(f"Builder: {engine.transaction_builder.get_statistics()}")
+        print(f"Build stage: {engine.stage_timings.get_statistics().get('build')}")
+        await engine.stop()
+        rpc.stop()
+
+    asyncio.run(main())
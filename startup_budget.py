@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Startup budget for the Flash Arbitrage Bot
+Measures cold import time of the entry points in fresh interpreters,
+reports the slowest imports and checks them against a time budget
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+# Cold-import budget per entry point, in seconds
+STARTUP_BUDGETS = {
+    'app': 0.25,               # Web app without the engine (was ~0.48 s)
+    'arbitrage_engine': 0.15,  # Engine module; numpy loads with the first engine (was ~0.49 s)
+}
+
+# Packages that must stay out of each entry point's import graph
+DEFERRED_IMPORTS = {
+    'app': ('numpy', 'solana', 'aiohttp', 'websockets', 'arbitrage_engine', 'arbitrage_wrapper'),
+    'arbitrage_engine': ('numpy', 'solana', 'solders', 'aiohttp', 'websockets', 'sharded_scanner', 'tx_builder'),
+}
+
+def import_profile(module: str) -> List[Tuple[str, int, int, int]]:
+    """(module, depth, self us, cumulative us) for every import in a fresh `import module`"""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f"import {module}"],
+        capture_output=True, text=True, cwd=Path(__file__).parent, env=os.environ.copy()
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr[-2000:]}")
+
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        rows.append((name.strip(), depth, int(self_us), int(cumulative_us)))
+    return rows
+
+def measure_startup(module: str, runs: int = 3) -> Dict:
+    """Best-of-runs cold import time and the heaviest top-level imports"""
+    best = None
+    for _ in range(runs):
+        rows = import_profile(module)
+        total = next(cumulative for name, _, _, cumulative in rows if name == module)
+        if best is None or total < best[0]:
+            best = (total, rows)
+
+    total, rows = best
+    loaded = {name.split('.')[0] for name, _, _, _ in rows}
+    # Direct imports of the entry point, plus interpreter startup
+    top = sorted((row for row in rows if row[1] <= 1 and row[0] != module), key=lambda row: -row[3])
+    return {
+        'module': module,
+        'seconds': total / 1e6,
+        'budget': STARTUP_BUDGETS.get(module),
+        'heaviest': [(name, cumulative / 1e6) for name, _, _, cumulative in top[:10]],
+        'unexpected_imports': sorted(set(DEFERRED_IMPORTS.get(module, ())) & loaded),
+    }
+
+def check_startup_budget(modules=None, runs: int = 3) -> Tuple[bool, List[Dict]]:
+    """Measure every entry point; ok only if all are within budget and import nothing deferred"""
+    reports = [measure_startup(module, runs) for module in (modules or STARTUP_BUDGETS)]
+    ok = all(report['seconds'] <= report['budget'] and not report['unexpected_imports']
+             for report in reports)
+    return ok, reports
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure cold import time against the startup budget")
+    parser.add_argument('modules', nargs='*', help="Entry points to measure (default: all budgeted)")
+    parser.add_argument('--runs', type=int, default=3)
+    args = parser.parse_args()
+
+    ok, reports = check_startup_budget(args.modules or None, args.runs)
+    for report in reports:
+        verdict = 'ok' if report['seconds'] <= report['budget'] else 'OVER BUDGET'
+        print(f"{report['module']}: {report['seconds'] * 1000:.0f} ms "
+              f"(budget {report['budget'] * 1000:.0f} ms) {verdict}")
+        for name, seconds in report['heaviest']:
+            print(f"    {seconds * 1000:8.1f} ms  {name}")
+        if report['unexpected_imports']:
+            print(f"    deferred imports loaded at startup: {', '.join(report['unexpected_imports'])}")
+    sys.exit(0 if ok else 1)
+
+if __name__ == "__main__":
+    main()
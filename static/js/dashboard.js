@@ -6,6 +6,8 @@ class FlashArbitrageDashboard {
         this.updateInterval = null;
         this.chart = null;
         this.profitHistory = [];
+        this.opportunitySeq = 0;
+        this.opportunityRows = new Map();  // opportunity id -> table row
         this.currentStep = 0;
         this.maxSteps = 3;
         
@@ -285,11 +287,12 @@ class FlashArbitrageDashboard {
     
     async refreshOpportunities() {
         try {
-            const response = await fetch('/api/opportunities');
+            // Only changes since the last poll; the server sends a snapshot when we are too far behind
+            const response = await fetch(`/api/opportunities?since=${this.opportunitySeq}`);
             const data = await response.json();
             
             if (response.ok) {
-                this.updateOpportunitiesTable(data.opportunities);
+                this.applyOpportunityChanges(data);
             }
             
             // Also get C++ engine opportunities
@@ -303,30 +306,74 @@ class FlashArbitrageDashboard {
         }
     }
     
-    updateOpportunitiesTable(opportunities) {
+    applyOpportunityChanges(data) {
         const tbody = document.getElementById('opportunitiesTable');
+        const changes = data.snapshot
+            ? data.opportunities.map(opp => ({op: 'add', id: opp.id, opportunity: opp}))
+            : data.changes;
         
-        if (!opportunities || opportunities.length === 0) {
+        if (data.snapshot) {
+            this.opportunityRows.forEach(row => row.remove());
+            this.opportunityRows.clear();
+        }
+        
+        // Touch only the rows that changed
+        for (const change of changes) {
+            let row = this.opportunityRows.get(change.id);
+            if (change.op === 'remove') {
+                if (row) {
+                    row.remove();
+                    this.opportunityRows.delete(change.id);
+                }
+                continue;
+            }
+            if (!row) {
+                row = document.createElement('tr');
+                this.opportunityRows.set(change.id, row);
+            }
+            row.netProfit = change.opportunity.net_profit;
+            row.innerHTML = this.opportunityRowHtml(change.opportunity);
+        }
+        this.opportunitySeq = data.seq;
+        
+        if (changes.length > 0 || data.snapshot) {
+            this.sortOpportunityRows(tbody);
+        }
+    }
+    
+    sortOpportunityRows(tbody) {
+        const rows = [...this.opportunityRows.values()].sort((a, b) => b.netProfit - a.netProfit);
+        
+        if (rows.length === 0) {
             tbody.innerHTML = '<tr><td colspan="8" class="no-data">No opportunities found</td></tr>';
             return;
         }
+        tbody.querySelector('.no-data')?.parentElement.remove();
         
-        tbody.innerHTML = opportunities.map((opp, index) => `
-            <tr>
-                <td>${opp.token_pair}</td>
-                <td>${opp.exchange_a}</td>
-                <td>${opp.exchange_b}</td>
-                <td>${opp.price_diff?.toFixed(6) || 'N/A'}</td>
-                <td>${(opp.profit_potential * 100)?.toFixed(2) || 'N/A'}%</td>
-                <td>${opp.net_profit?.toFixed(4) || 'N/A'} SOL</td>
-                <td>${(opp.confidence * 100)?.toFixed(0) || 'N/A'}%</td>
-                <td>
-                    <button class="btn btn-primary btn-sm" onclick="dashboard.executeOpportunity(${index})">
-                        Execute
-                    </button>
-                </td>
-            </tr>
-        `).join('');
+        // Move rows only where the order changed
+        rows.forEach((row, index) => {
+            if (tbody.children[index] !== row) {
+                tbody.insertBefore(row, tbody.children[index] || null);
+            }
+            row.querySelector('button').dataset.index = index;
+        });
+    }
+    
+    opportunityRowHtml(opp) {
+        return `
+            <td>${opp.token_pair}</td>
+            <td>${opp.exchange_a}</td>
+            <td>${opp.exchange_b}</td>
+            <td>${opp.price_diff?.toFixed(6) || 'N/A'}</td>
+            <td>${(opp.profit_potential * 100)?.toFixed(2) || 'N/A'}%</td>
+            <td>${opp.net_profit?.toFixed(4) || 'N/A'} SOL</td>
+            <td>${(opp.confidence * 100)?.toFixed(0) || 'N/A'}%</td>
+            <td>
+                <button class="btn btn-primary btn-sm" onclick="dashboard.executeOpportunity(Number(this.dataset.index))">
+                    Execute
+                </button>
+            </td>
+        `;
     }
     
     async executeOpportunity(index) {
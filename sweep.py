@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Parameter sweeps for the Flash Arbitrage Engine
+Fans a grid or random search of engine thresholds across a process pool;
+every worker replays the same memory-mapped tick dataset through backtests
+"""
+
+import argparse
+import itertools
+import json
+import multiprocessing as mp
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+# Parameters a sweep may vary, with the range random search draws from
+SWEEP_SPACE = {
+    'min_profit_threshold': (0.0001, 0.005),
+    'max_gas_cost': (0.005, 0.05),
+    'max_slippage': (0.005, 0.05),
+    'max_position_size': (100.0, 10000.0),
+    'min_execution_confidence': (0.3, 0.9),
+    'max_execution_risk': (0.2, 0.8),
+    'min_execution_profit': (0.0, 0.05),
+}
+
+# Report columns, in order
+RESULT_COLUMNS = ('total_profit', 'trades', 'hit_rate', 'max_drawdown', 'wall_seconds')
+
+def grid(values: Dict[str, List]) -> List[Dict]:
+    """Every combination of the given parameter values"""
+    names = list(values)
+    return [dict(zip(names, combo)) for combo in itertools.product(*(values[name] for name in names))]
+
+def random_search(names: List[str], n: int, seed: int = 0) -> List[Dict]:
+    """n uniform draws from SWEEP_SPACE for the named parameters"""
+    rng = np.random.default_rng(seed)
+    return [{name: float(rng.uniform(*SWEEP_SPACE[name])) for name in names} for _ in range(n)]
+
+# Per-worker dataset, memory-mapped once by the pool initializer
+_dataset = None
+
+def _init_worker(ticks_path: str):
+    global _dataset
+    from backtest import TickDataset
+    _dataset = TickDataset.load(ticks_path, mmap=True)
+
+def _run_one(job: Tuple[int, Dict, int]) -> Tuple[int, Dict]:
+    from backtest import run_backtest
+    index, params, seed = job
+    return index, run_backtest(seed=seed, dataset=_dataset, overrides=params)
+
+def run_sweep(ticks_path, combos: List[Dict], workers: int = None, seed: int = 0) -> List[Dict]:
+    """Backtest every parameter combination over the same dataset
+
+    Workers memory-map the .npy file, so the tick data is shared through
+    the page cache instead of being pickled to each process. Every run
+    uses the same seed, so differences come from the parameters alone.
+
+    Returns:
+        One row per combination: the parameters followed by RESULT_COLUMNS
+    """
+    workers = workers or os.cpu_count() or 1
+    ctx = mp.get_context('spawn')
+    jobs = [(i, params, seed) for i, params in enumerate(combos)]
+    rows = [None] * len(combos)
+    with ProcessPoolExecutor(max_workers=workers, mp_context=ctx,
+                             initializer=_init_worker, initargs=(str(ticks_path),)) as pool:
+        for index, report in pool.map(_run_one, jobs):
+            rows[index] = {**combos[index], **{name: report[name] for name in RESULT_COLUMNS}}
+    return rows
+
+def format_table(rows: List[Dict], sort_by: str = 'total_profit') -> str:
+    """Fixed-width results table, best first"""
+    if not rows:
+        return "(no results)"
+    rows = sorted(rows, key=lambda row: row[sort_by], reverse=True)
+    columns = list(rows[0])
+    widths = {name: max(len(name), 12) for name in columns}
+    lines = ['  '.join(name.rjust(widths[name]) for name in columns)]
+    for row in rows:
+        lines.append('  '.join(
+            (f"{row[name]:.6g}" if isinstance(row[name], float) else str(row[name])).rjust(widths[name])
+            for name in columns
+        ))
+    return '\n'.join(lines)
+
+def _parse_grid(items: List[str]) -> Dict[str, List]:
+    values = {}
+    for item in items:
+        name, options = item.split('=', 1)
+        if name not in SWEEP_SPACE:
+            raise SystemExit(f"Unknown sweep parameter {name}; choose from {', '.join(SWEEP_SPACE)}")
+        values[name] = [json.loads(option) for option in options.split(',')]
+    return values
+
+def main():
+    parser = argparse.ArgumentParser(description="Sweep engine thresholds over a replayed tick dataset")
+    parser.add_argument('--ticks', help="TickDataset (.npy) to replay; recorded from the simulator if omitted")
+    parser.add_argument('--minutes', type=float, default=5.0, help="Length of the recorded dataset")
+    parser.add_argument('--grid', action='append', default=[], metavar='NAME=V1,V2,...',
+                        help="Grid values for one parameter (repeatable)")
+    parser.add_argument('--random', type=int, default=0, metavar='N',
+                        help="Random search with N draws over the --grid names (or all parameters)")
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--json', metavar='PATH', help="Also write the results table as JSON")
+    args = parser.parse_args()
+
+    values = _parse_grid(args.grid)
+    if args.random:
+        combos = random_search(list(values) or list(SWEEP_SPACE), args.random, args.seed)
+    elif values:
+        combos = grid(values)
+    else:
+        parser.error("Give --grid values and/or --random N")
+
+    with tempfile.TemporaryDirectory() as workdir:
+        ticks_path = args.ticks
+        if ticks_path is None:
+            from arbitrage_engine import FlashArbitrageEngine
+            from backtest import TICK_INTERVAL, TickDataset, backtest_config
+            ticks_path = Path(workdir) / 'ticks.npy'
+            n_ticks = int(round(args.minutes * 60.0 / TICK_INTERVAL))
+            engine = FlashArbitrageEngine(backtest_config(workdir=workdir))
+            TickDataset.generate(engine, n_ticks, args.seed).save(ticks_path)
+
+        start = time.perf_counter()
+        rows = run_sweep(ticks_path, combos, args.workers, args.seed)
+        elapsed = time.perf_counter() - start
+
+    print(format_table(rows))
+    print(f"\n{len(rows)} runs in {elapsed:.1f} s")
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(rows, f, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""Closed-form AMM sizing must agree with a brute-force search over the curves"""
+
+import numpy as np
+import pytest
+
+from amm_pricing import optimal_round_trip, slippage_limited_base
+
+# (buy base, buy quote, buy fee, sell base, sell quote, sell fee): SOL/USDC pools 1% apart
+POOLS = (1e4, 1e6, 0.0025, 2e4, 2.02e6, 0.003)
+
+def round_trip(x, buy_base, buy_quote, buy_fee, sell_base, sell_quote, sell_fee):
+    """Base bought for x quote in the first pool and quote received selling it in the second"""
+    y = (1 - buy_fee) * buy_base * x / (buy_quote + (1 - buy_fee) * x)
+    return y, (1 - sell_fee) * sell_quote * y / (sell_base + (1 - sell_fee) * y)
+
+def brute_force(pools, max_base=np.inf, cost_per_unit=0.0):
+    """Best profit over a fine grid of quote inputs"""
+    x = np.linspace(0.0, pools[1] * 0.05, 200_001)
+    y, z = round_trip(x, *pools)
+    profit = np.where(y <= max_base, z - x - cost_per_unit * y, -np.inf)
+    return profit.max()
+
+def solve(pools, max_base=np.inf, cost_per_unit=0.0):
+    arrays = [np.array([value]) for value in pools]
+    quote_in, base, quote_out = optimal_round_trip(*arrays, max_base, cost_per_unit)
+    return quote_in[0], base[0], quote_out[0]
+
+@pytest.mark.parametrize('max_base, cost_per_unit', [(np.inf, 0.0), (10.0, 0.0), (np.inf, 0.2), (10.0, 0.2)])
+def test_matches_brute_force(max_base, cost_per_unit):
+    quote_in, base, quote_out = solve(POOLS, max_base, cost_per_unit)
+    assert (base, quote_out) == pytest.approx(round_trip(quote_in, *POOLS))
+    assert base <= max_base * (1 + 1e-12)
+    profit = quote_out - quote_in - cost_per_unit * base
+    # Never worse than the grid, and only better by what its 0.25-quote step can miss
+    best = brute_force(POOLS, max_base, cost_per_unit)
+    assert best - 1e-9 <= profit <= best + 1e-4
+
+def test_cap_binds_below_the_optimum():
+    assert solve(POOLS)[1] > 10.0
+    assert solve(POOLS, max_base=10.0)[1] == pytest.approx(10.0)
+
+def test_per_unit_cost_shrinks_the_trade():
+    assert 0 < solve(POOLS, cost_per_unit=0.2)[1] < solve(POOLS)[1]
+    # A cost above the whole dislocation leaves nothing worth trading
+    assert solve(POOLS, cost_per_unit=5.0) == (0.0, 0.0, 0.0)
+
+def test_no_profit_without_a_dislocation():
+    # Same price in both pools: fees alone make every size lose
+    flat = (1e4, 1e6, 0.0025, 2e4, 2e6, 0.003)
+    assert solve(flat) == (0.0, 0.0, 0.0)
+    assert brute_force(flat) == 0.0
+
+def test_slippage_bound_is_the_largest_allowed_trade():
+    buy_base, sell_base = np.array([1e4, 3e4]), np.array([2e4, 5e3])
+    limit = slippage_limited_base(buy_base, sell_base, 0.02)
+
+    y = np.linspace(0.0, 500.0, 500_001)
+    for i in range(2):
+        # Buying y scales the buy pool's price by (B / (B - y))^2, selling into the other by (B / (B + y))^2
+        moves = np.maximum((buy_base[i] / (buy_base[i] - y)) ** 2 - 1,
+                           1 - (sell_base[i] / (sell_base[i] + y)) ** 2)
+        assert limit[i] == pytest.approx(y[moves <= 0.02].max(), abs=1e-3)
@@ -0,0 +1,92 @@
+"""The native bridge must scan only the latest quote per market, however often markets re-quote"""
+
+import time
+from collections import namedtuple
+
+import pytest
+
+from arbitrage_wrapper import ArbitrageEngine, MarketDataBridge
+from market_bus import MarketDataBus
+
+Quote = namedtuple('Quote', 'exchange token_pair bid_price ask_price volume timestamp')
+
+EXCHANGES = ('orca', 'raydium', 'serum')
+
+@pytest.fixture
+def native():
+    try:
+        engine = ArbitrageEngine()
+    except OSError:
+        pytest.skip("libarbitrage_engine.so cannot be loaded here")
+    engine.set_config(min_profit=0.001, max_gas=0.005, max_slippage=0.05)
+    yield engine
+    engine.cleanup()
+
+def quote_round(bus, step):
+    """Re-quote SOL/USDC on every venue, each round a little higher and raydium always richest"""
+    now = time.time()
+    keys, quotes = [], []
+    for exchange in EXCHANGES:
+        mid = 100.0 + step * 0.5 + (2.0 if exchange == 'raydium' else 0.0)
+        keys.append(f"{exchange}:SOL/USDC")
+        quotes.append(Quote(exchange, 'SOL/USDC', mid - 0.01, mid + 0.01, 10.0, now))
+    bus.publish_batch('quote', keys, quotes)
+
+def test_requotes_do_not_pile_up(native):
+    bus = MarketDataBus()
+    subscription = bus.subscribe('native-engine', ('quote',))
+    bridge = MarketDataBridge(native, subscription)
+    counts = []
+    for step in range(20):
+        quote_round(bus, step)
+        bridge.rescan(subscription.drain())
+        counts.append(native.get_statistics()[3])
+
+    # Only the three latest quotes are priced: at most one route per ordered venue pair
+    assert max(counts) <= len(EXCHANGES) * (len(EXCHANGES) - 1)
+    assert set(counts) == {2}
+    # Both routes are through raydium, the only venue off the others' price; none is a venue against itself
+    routes = {(o['exchange_a'], o['exchange_b']) for o in native.get_all_opportunities()}
+    assert routes == {('orca', 'raydium'), ('raydium', 'serum')}
+
+def test_stale_markets_leave_the_scan(native):
+    bus = MarketDataBus()
+    subscription = bus.subscribe('native-engine', ('quote',))
+    bridge = MarketDataBridge(native, subscription, max_quote_age=10.0)
+    quote_round(bus, 0)
+    bus.publish('quote', 'raydium:SOL/USDC', Quote('raydium', 'SOL/USDC', 109.99, 110.01, 10.0, time.time() - 60))
+    bridge.rescan(subscription.drain())
+    assert native.get_all_opportunities() == []
+
+def test_reset_keeps_settings_and_results(native):
+    bus = MarketDataBus()
+    subscription = bus.subscribe('native-engine', ('quote',))
+    bridge = MarketDataBridge(native, subscription)
+    quote_round(bus, 0)
+    bridge.rescan(subscription.drain())
+    assert native.execute_trade(0)
+    profit, successful, _, _ = native.get_statistics()
+    assert successful == 1 and profit > 0
+
+    # Above raydium's ~2% edge: nothing is left once the setting outlives the reset
+    native.set_config(min_profit=0.05, max_gas=0.005, max_slippage=0.05)
+    quote_round(bus, 1)
+    bridge.rescan(subscription.drain())
+    assert native.get_statistics() == (profit, 1, 0, 0)
+
+def test_bridge_thread_follows_the_bus(native):
+    bus = MarketDataBus()
+    bridge = MarketDataBridge(native, bus.subscribe('native-engine', ('quote',)), interval=0.01).start()
+    try:
+        for step in range(50):
+            quote_round(bus, step)
+            time.sleep(0.002)
+        deadline = time.time() + 5
+        while bridge.quotes < 3 and time.time() < deadline:
+            time.sleep(0.01)
+        time.sleep(0.05)
+    finally:
+        bridge.stop()
+    assert bridge.batches > 0
+    assert native.get_statistics()[3] <= len(EXCHANGES) * (len(EXCHANGES) - 1)
+    assert all(o['exchange_a'] != o['exchange_b'] for o in native.get_all_opportunities())
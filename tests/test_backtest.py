@@ -0,0 +1,30 @@
+"""Backtest PnL must book every attempt, and shocked recordings must trade"""
+
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from arbitrage_engine import FlashArbitrageEngine
+from backtest import BID, ASK, PnLRecorder, TickDataset, backtest_config, run_backtest
+from clock import VirtualClock
+
+def test_failed_attempts_book_their_gas():
+    recorder = PnLRecorder(VirtualClock(start=0.0))
+    recorder(SimpleNamespace(net_profit=2.0, gas_cost=0.01), True)
+    recorder(SimpleNamespace(net_profit=2.0, gas_cost=0.01), False)
+    assert recorder.pnl == [2.0, -0.01]
+    assert recorder.max_drawdown() == pytest.approx(0.01)
+
+def test_shocked_recording_is_reproducible(tmp_path):
+    engine = FlashArbitrageEngine(backtest_config(workdir=str(tmp_path)))
+    plain = TickDataset.generate(engine, 100, seed=1)
+    shocked = TickDataset.generate(engine, 100, seed=1).shock('serum', 1.01, 7)
+    serum = plain.venues.index('serum')
+    assert np.allclose(shocked.ticks[::7, serum, :, BID:ASK + 1], plain.ticks[::7, serum, :, BID:ASK + 1] * 1.01)
+    assert np.array_equal(shocked.ticks[1::7], plain.ticks[1::7])
+
+    first = run_backtest(seed=0, dataset=shocked)
+    second = run_backtest(seed=0, dataset=shocked)
+    assert first['trades'] > 0
+    assert first['realized_pnl'] == second['realized_pnl']
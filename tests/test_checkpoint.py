@@ -0,0 +1,65 @@
+"""Checkpoint writes must never interleave, whichever thread they come from"""
+
+import asyncio
+import threading
+import time
+
+import checkpoint
+from arbitrage_engine import FlashArbitrageEngine
+from backtest import backtest_config
+from checkpoint import EngineCheckpoint
+
+def test_concurrent_saves_leave_a_loadable_checkpoint(tmp_path):
+    checkpointer = EngineCheckpoint(tmp_path / 'engine_checkpoint.pkl')
+    state = {'total_profit': 1.0, 'market_data': {f"venue:TKN{i}/SOL": [i] * 50 for i in range(2000)}}
+
+    def save_repeatedly():
+        for _ in range(10):
+            checkpointer.save(state)
+
+    threads = [threading.Thread(target=save_repeatedly) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # Every save either wrote or found a state taken later already written
+    assert checkpointer.saves + checkpointer.superseded == 40
+    assert checkpointer.load()['market_data'] == state['market_data']
+    assert not (tmp_path / 'engine_checkpoint.pkl.tmp').exists()
+
+def test_older_state_never_overwrites_a_newer_one(tmp_path):
+    checkpointer = EngineCheckpoint(tmp_path / 'engine_checkpoint.pkl')
+    checkpointer.save({'total_profit': 2.0}, taken_at=2.0)
+    # A periodic snapshot that only reaches the lock after the final save
+    checkpointer.save({'total_profit': 1.0}, taken_at=1.0)
+    assert checkpointer.load()['total_profit'] == 2.0
+    assert (checkpointer.saves, checkpointer.superseded) == (1, 1)
+
+def test_stop_from_another_loop_during_a_periodic_save(tmp_path, monkeypatch):
+    engine = FlashArbitrageEngine(backtest_config({'checkpoint_file': tmp_path / 'engine_checkpoint.pkl'},
+                                                  workdir=str(tmp_path)))
+    engine.checkpoint_interval = 0.01
+    writing, replace = threading.Event(), checkpoint.os.replace
+
+    def slow_replace(src, dst):
+        if threading.current_thread() is not threading.main_thread():
+            writing.set()
+            time.sleep(0.3)
+        replace(src, dst)
+
+    monkeypatch.setattr(checkpoint.os, 'replace', slow_replace)
+    engine.running = True
+    periodic = threading.Thread(target=asyncio.run, args=(engine.checkpoint_loop(),))
+    periodic.start()
+    try:
+        assert writing.wait(10)
+        engine.total_profit = 42.0
+        # As /api/stop does: a fresh loop on another thread
+        asyncio.run(engine.stop())
+    finally:
+        engine.running = False
+        periodic.join(10)
+
+    assert engine.checkpointer.saves == 2
+    assert engine.checkpointer.load()['total_profit'] == 42.0
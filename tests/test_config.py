@@ -0,0 +1,71 @@
+"""Both configuration modules share one validator that range-checks every setting"""
+
+import copy
+import importlib.util
+from pathlib import Path
+
+import pytest
+
+from config import NUMERIC_RANGES, get_config, validate_config
+
+def windows_config(tmp_path):
+    path = Path(__file__).parent.parent / 'config-windows-fixed.py'
+    spec = importlib.util.spec_from_file_location('config_windows_fixed', path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    module.CONFIG_FILE = tmp_path / 'bot_config.json'
+    return module
+
+def test_default_config_is_valid():
+    assert validate_config(copy.deepcopy(get_config())) == (True, [])
+
+@pytest.mark.parametrize('key', sorted(NUMERIC_RANGES))
+@pytest.mark.parametrize('value', [-1, 'abc', None, True])
+def test_numeric_settings_reject_bad_values(key, value):
+    ok, errors = validate_config({**get_config(), key: value})
+    assert not ok and len(errors) == 1
+
+def test_wallet_strategy_overrides_are_checked():
+    strategy = {'name': 'cautious', 'wallet_address': 'A' * 44, 'min_execution_profit': -0.5}
+    ok, errors = validate_config({**get_config(), 'wallet_strategies': [strategy]})
+    assert not ok and "'cautious'" in errors[0]
+
+def test_windows_config_uses_the_same_validator(tmp_path):
+    module = windows_config(tmp_path)
+    assert module.validate_config({**get_config(), 'min_execution_profit': -1}) == \
+        validate_config({**get_config(), 'min_execution_profit': -1})
+    assert module.validate_config()[0]
+
+def test_windows_config_cache_is_not_shared_with_callers(tmp_path):
+    module = windows_config(tmp_path)
+    module.save_config({'exchanges': {'orca': True}})
+    module.load_config()['exchanges']['orca'] = False
+    assert module.load_config()['exchanges']['orca'] is True
+
+def rpc_config(**overrides):
+    return {**get_config(), 'execution_mode': 'rpc', 'private_key': 'key', **overrides}
+
+def test_rpc_mode_only_sends_to_a_local_server():
+    ok, errors = validate_config(rpc_config())
+    assert not ok and any('local stand-in RPC' in error for error in errors)
+
+def test_rpc_mode_needs_every_traded_pool_and_mint():
+    from token_universe import UNIVERSE_FILE, TokenUniverse
+
+    universe = TokenUniverse.load(UNIVERSE_FILE, venues=list(get_config()['exchanges']))
+    addresses = {key: 'address' for keys in universe.venue_market_keys for key in keys}
+    addresses.update({token: 'mint' for pairs in universe.venue_pair_names for pair in pairs
+                      for token in pair.split('/')})
+    local = 'http://127.0.0.1:8899'
+
+    ok, errors = validate_config(rpc_config(solana_rpc_url=local))
+    assert not ok and f"pool and mint; {len(addresses)} missing" in errors[0]
+    missing_pool = {key: value for key, value in addresses.items() if key != 'serum:SOL/USDC'}
+    assert validate_config(rpc_config(solana_rpc_url=local, solana_addresses=missing_pool)) == \
+        (False, ["Execution mode 'rpc' needs solana_addresses for every traded pool and mint; "
+                 "1 missing: serum:SOL/USDC"])
+    assert validate_config(rpc_config(solana_rpc_url=local, solana_addresses=addresses)) == (True, [])
+
+    # A follower sending on its own is held to the same rule
+    follower = {'name': 'sender', 'wallet_address': 'A' * 44, 'execution_mode': 'rpc', 'private_key': 'key'}
+    assert not validate_config({**get_config(), 'wallet_strategies': [follower]})[0]
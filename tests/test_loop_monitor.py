@@ -0,0 +1,21 @@
+"""loop_monitor.run must work with and without asyncio.Runner (Python 3.11+)"""
+
+import asyncio
+
+import pytest
+
+import loop_monitor
+
+async def loop_class_name():
+    await asyncio.sleep(0)
+    return type(asyncio.get_running_loop()).__module__
+
+@pytest.mark.parametrize('runner', [True, False])
+def test_run_on_asyncio_loop(monkeypatch, runner):
+    if not runner:
+        monkeypatch.delattr(asyncio, 'Runner', raising=False)
+    assert loop_monitor.run(loop_class_name(), loop='asyncio').startswith('asyncio')
+
+def test_run_on_uvloop():
+    pytest.importorskip('uvloop')
+    assert loop_monitor.run(loop_class_name(), loop='uvloop').startswith('uvloop')
@@ -0,0 +1,63 @@
+"""Every subscriber must hold at most the latest event per key, bounded, without slowing the others"""
+
+import threading
+
+import pytest
+
+from market_bus import MarketDataBus
+
+def test_pending_values_conflate_to_the_latest_per_key():
+    bus = MarketDataBus()
+    subscription = bus.subscribe('ui')
+    for price in range(5):
+        bus.publish_batch('quote', ['orca:SOL/USDC', 'serum:SOL/USDC'], [price, price + 100])
+    bus.publish('opportunities', 'all', ['route'])
+    # Same key on another topic is a different slot
+    bus.publish('opportunities', 'orca:SOL/USDC', 'other')
+
+    assert subscription.drain() == [('quote', 'orca:SOL/USDC', 4), ('quote', 'serum:SOL/USDC', 104),
+                                    ('opportunities', 'all', ['route']),
+                                    ('opportunities', 'orca:SOL/USDC', 'other')]
+    stats = subscription.get_statistics()
+    assert (stats['published'], stats['delivered'], stats['conflated'], stats['dropped']) == (12, 4, 8, 0)
+    assert subscription.drain() == []
+
+def test_a_full_slow_subscriber_drops_its_oldest_keys_only():
+    bus = MarketDataBus()
+    slow = bus.subscribe('slow', ('quote',), maxsize=3)
+    fast = bus.subscribe('fast', ('quote',))
+    for i in range(5):
+        bus.publish('quote', f'venue{i}:SOL/USDC', i)
+    fast.drain()
+
+    # A re-quote of a pending key fits without dropping anything
+    bus.publish('quote', 'venue4:SOL/USDC', 40)
+    assert slow.drain() == [('quote', 'venue2:SOL/USDC', 2), ('quote', 'venue3:SOL/USDC', 3),
+                            ('quote', 'venue4:SOL/USDC', 40)]
+    assert slow.get_statistics()['dropped'] == 2 and slow.get_statistics()['conflated'] == 1
+    assert fast.get_statistics()['dropped'] == 0 and fast.drain() == [('quote', 'venue4:SOL/USDC', 40)]
+
+def test_wait_wakes_on_publish_and_times_out_when_idle():
+    bus = MarketDataBus()
+    subscription = bus.subscribe('native', ('quote',))
+    assert not subscription.wait(0.01)
+    threading.Timer(0.01, bus.publish, ('quote', 'orca:SOL/USDC', 1)).start()
+    assert subscription.wait(5)
+    subscription.drain()
+    assert not subscription.wait(0.01)
+
+def test_unsubscribed_consumers_stop_receiving():
+    bus = MarketDataBus()
+    kept = bus.subscribe('kept', ('quote',))
+    gone = bus.subscribe('gone')
+    bus.unsubscribe(gone)
+
+    bus.publish('quote', 'orca:SOL/USDC', 1)
+    bus.publish('opportunities', 'all', [])
+    assert gone.drain() == [] and kept.drain() == [('quote', 'orca:SOL/USDC', 1)]
+    assert not bus.has_subscribers('opportunities')
+    assert list(bus.get_statistics()) == ['kept']
+
+def test_unknown_topics_are_refused():
+    with pytest.raises(ValueError):
+        MarketDataBus().subscribe('typo', ('quotes',))
@@ -0,0 +1,48 @@
+"""The opportunity feed indexes on publish, so queries only read the indexes"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from opportunity_feed import OpportunityFeed, route_id
+
+def opportunity(pair, buy, sell, net_profit=1.0, **fields):
+    values = dict(price_a=1.0, price_b=1.01, price_diff=0.01, profit_potential=0.01, volume=10.0,
+                  gas_cost=0.001, confidence=0.9, risk_score=0.1, timestamp=0.0)
+    values.update(fields)
+    return SimpleNamespace(id=route_id(pair, buy, sell), token_pair=pair, exchange_a=buy,
+                           exchange_b=sell, net_profit=net_profit, **values)
+
+@pytest.fixture
+def feed():
+    feed = OpportunityFeed()
+    feed.publish([
+        opportunity('SOL/USDC', 'orca', 'raydium', 3.0),
+        opportunity('RAY/SOL', 'serum', 'orca', 2.0),
+        opportunity('RAY/SOL', 'jupiter', 'raydium', 1.0),
+    ])
+    return feed
+
+def test_queries_read_indexes_without_rediffing(feed, monkeypatch):
+    monkeypatch.setattr(feed, '_apply', lambda items: pytest.fail("query re-diffed the list"))
+    page = feed.query(venues=['orca'])
+    assert [o['id'] for o in page['opportunities']] == ['SOL/USDC:orca:raydium', 'RAY/SOL:serum:orca']
+    assert feed.query(tokens=['RAY'], min_net_profit=1.5)['total'] == 1
+    assert feed.changes_since(None)['snapshot']
+
+def test_publish_drops_departed_routes_from_indexes(feed):
+    seq = feed.seq
+    feed.publish([opportunity('SOL/USDC', 'orca', 'raydium', 3.0),
+                  opportunity('RAY/SOL', 'serum', 'orca', 2.5)])
+    assert feed.query(venues=['jupiter'])['total'] == 0
+    assert feed.query(pairs=['RAY/SOL'])['opportunities'][0]['net_profit'] == 2.5
+    changes = feed.changes_since(seq)['changes']
+    assert sorted((c['op'], c['id']) for c in changes) == [
+        ('remove', 'RAY/SOL:jupiter:raydium'), ('update', 'RAY/SOL:serum:orca')]
+
+def test_republishing_the_same_list_logs_nothing(feed):
+    items = [opportunity('SOL/USDC', 'orca', 'raydium', 3.0)]
+    feed.publish(items)
+    seq = feed.seq
+    feed.publish(items)
+    assert feed.seq == seq
@@ -0,0 +1,72 @@
+"""The depth solver must take exactly the segments of both books that still pay"""
+
+import numpy as np
+import pytest
+
+from order_book import make_depth, solve_optimal_sizes
+
+def book(*levels):
+    """(1, 2, levels) depth from (price, size) levels, best first"""
+    return np.array(levels, dtype=float).T[None]
+
+def solve(asks, bids, fee=0.0, max_slippage=0.03, max_size=1e9, cost_per_unit=0.0):
+    fees = np.full(len(asks), fee)
+    return solve_optimal_sizes(asks, bids, fees, fees, max_slippage, max_size, cost_per_unit)
+
+ASKS = book((100.0, 2.0), (100.5, 3.0), (101.0, 5.0))
+BIDS = book((101.2, 1.0), (100.8, 4.0), (100.2, 5.0))
+
+def walk_profit(asks, bids, q, fee):
+    """Profit of trading q by walking each book level by level"""
+    def cost(depth):
+        remaining, total = q, 0.0
+        for price, size in zip(*depth[0]):
+            take = min(size, remaining)
+            total, remaining = total + take * price, remaining - take
+        return total
+    return cost(bids) * (1 - fee) - cost(asks) * (1 + fee)
+
+def test_single_level_takes_the_smaller_side():
+    sizes, buy, sell = solve(book((100.0, 5.0)), book((101.0, 3.0)))
+    assert sizes.tolist() == [3.0]
+    assert (buy[0], sell[0]) == (100.0, 101.0)
+
+def test_several_levels_stop_where_marginal_profit_turns_negative():
+    sizes, buy, sell = solve(ASKS, BIDS)
+    # Units 0-5 buy at 100 or 100.5 and sell at 101.2 or 100.8; the next ones lose
+    assert sizes[0] == pytest.approx(5.0)
+    assert buy[0] == pytest.approx((100.0 * 2 + 100.5 * 3) / 5)
+    assert sell[0] == pytest.approx((101.2 * 1 + 100.8 * 4) / 5)
+
+def test_fees_and_per_unit_cost_shrink_the_size():
+    # 0.2% per leg makes the 100.5 -> 100.8 segment lose
+    assert solve(ASKS, BIDS, fee=0.002)[0][0] == pytest.approx(2.0)
+    assert solve(ASKS, BIDS, cost_per_unit=0.5)[0][0] == pytest.approx(2.0)
+
+def test_size_and_slippage_caps():
+    assert solve(ASKS, BIDS, max_size=3.0)[0][0] == pytest.approx(3.0)
+    # Asks beyond 100.4 are out of reach, leaving 2 units
+    sizes, buy, _ = solve(ASKS, BIDS, max_slippage=0.004)
+    assert sizes[0] == pytest.approx(2.0) and buy[0] == pytest.approx(100.0)
+
+def test_books_that_never_cross_trade_nothing():
+    sizes, buy, sell = solve(book((101.0, 5.0), (102.0, 5.0)), book((100.0, 5.0), (99.0, 5.0)))
+    assert sizes.tolist() == [0.0]
+    assert (buy[0], sell[0]) == (101.0, 100.0)
+
+def test_matches_brute_force_on_random_books():
+    rng = np.random.default_rng(7)
+    n, levels = 50, 6
+    best_ask = rng.uniform(99.5, 100.5, n)
+    asks = make_depth(best_ask, rng.uniform(1, 10, n), np.full(n, 0.05), levels, +1, rng)
+    bids = make_depth(best_ask + rng.uniform(-0.2, 0.4, n), rng.uniform(1, 10, n), np.full(n, 0.05),
+                      levels, -1, rng)
+    sizes, _, _ = solve(asks, bids, fee=0.0005)
+
+    for row in range(n):
+        a, b = asks[row:row + 1], bids[row:row + 1]
+        # Profit is piecewise linear, so its maximum sits on a breakpoint of either book
+        breakpoints = np.concatenate([[0.0], np.cumsum(a[0, 1]), np.cumsum(b[0, 1])])
+        breakpoints = breakpoints[breakpoints <= min(a[0, 1].sum(), b[0, 1].sum())]
+        best = max(walk_profit(a, b, q, 0.0005) for q in breakpoints)
+        assert walk_profit(a, b, sizes[row], 0.0005) == pytest.approx(best, abs=1e-9)
@@ -0,0 +1,107 @@
+"""Rolling risk limits must block at their limits and recover as the window rolls"""
+
+import pytest
+
+import arbitrage_engine
+from backtest import backtest_config
+from clock import VirtualClock
+from risk_limits import RiskLimits
+
+DAY = 86400.0
+
+@pytest.fixture
+def clock():
+    return VirtualClock(start=1_700_000_000.0)
+
+def test_buckets_keep_running_totals(clock):
+    limits = RiskLimits(max_trades=100, max_loss=10.0, bucket=60.0)
+    for minute in range(5):
+        for _ in range(3):
+            limits.record(clock.time(), -0.1)
+        clock.now += 60.0
+    assert limits.allowed(clock.time())
+    assert limits.trades == 15
+    assert limits.pnl == pytest.approx(-1.5)
+    assert sum(limits._trades) == 15
+
+def test_blocks_at_the_trade_limit_until_trades_roll_off(clock):
+    limits = RiskLimits(max_trades=10, max_loss=100.0, bucket=60.0)
+    start = clock.time()
+    for i in range(10):
+        assert limits.allowed(clock.time())
+        limits.record(clock.time(), 0.01)
+        clock.now += 600.0
+    assert not limits.allowed(clock.time())
+    assert limits.get_statistics()['halt_reason'] == 'max_daily_trades'
+
+    # The first trade leaves the window a day after it was made, the rest stay
+    clock.now = start + DAY + 60.0
+    assert limits.allowed(clock.time())
+    assert limits.trades == 9
+
+def test_blocks_at_the_loss_limit_until_losses_roll_off(clock):
+    limits = RiskLimits(max_trades=1000, max_loss=1.0, stop_loss_pct=1.0, bucket=60.0)
+    for _ in range(7):
+        limits.record(clock.time(), -0.125)
+    assert limits.allowed(clock.time())
+    limits.record(clock.time(), -0.125)
+    assert not limits.allowed(clock.time())
+    assert limits.halt_reason == 'max_daily_loss'
+
+    clock.now += DAY
+    assert limits.allowed(clock.time())
+    assert (limits.trades, limits.pnl) == (0, 0.0)
+
+def test_ring_wraps_around_after_the_window(clock):
+    # A one-hour window of ten six-minute buckets
+    limits = RiskLimits(max_trades=1000, window=3600.0, bucket=360.0)
+    for step in range(25):
+        limits.record(clock.time(), 1.0)
+        clock.now += 360.0
+        limits.allowed(clock.time())
+        # Once the ring has wrapped, exactly the last nine buckets' trades remain
+        assert limits.trades == min(step + 1, 9)
+    assert limits.pnl == pytest.approx(9.0)
+
+    # Skipping well past the window clears everything at once
+    clock.now += 5 * 3600.0
+    limits.allowed(clock.time())
+    assert limits.trades == 0 and limits._trades == [0] * 10
+
+def test_stop_loss_latches_until_reset(clock):
+    limits = RiskLimits(max_trades=1000, max_loss=100.0, stop_loss_pct=0.05, capital=100.0)
+    limits.record(clock.time(), 10.0)
+    limits.record(clock.time(), -6.0)   # 6 from the peak of 10, over 5% of 110
+    assert not limits.allowed(clock.time())
+    assert limits.halt_reason == 'stop_loss'
+
+    # Unlike the rolling limits, a stop-loss outlasts the window
+    clock.now += 2 * DAY
+    assert not limits.allowed(clock.time())
+
+    limits.reset_stop_loss()
+    assert limits.allowed(clock.time())
+    assert limits.get_statistics()['drawdown'] == 0.0
+
+def test_reset_endpoint_rearms_the_wallet(tmp_path, monkeypatch):
+    from app import app
+
+    # create_engine sets the module's globals; put them back afterwards
+    monkeypatch.setattr(arbitrage_engine, 'engine', None)
+    monkeypatch.setattr(arbitrage_engine, 'engines', {})
+    engine = arbitrage_engine.create_engine(backtest_config(workdir=str(tmp_path)))
+    try:
+        client = app.test_client()
+        limits = engine.risk_limits
+        limits.max_loss = float('inf')
+        limits.record(0.0, -limits.stop_loss_pct * limits.capital * 2)
+        assert limits.halt_reason == 'stop_loss'
+
+        response = client.post('/api/risk/reset')
+        assert response.status_code == 200
+        assert response.get_json()['allowed'] and response.get_json()['halt_reason'] is None
+        assert limits.allowed(0.0)
+
+        assert client.post('/api/risk/reset?wallet=missing').status_code == 400
+    finally:
+        engine.trade_journal.stop()
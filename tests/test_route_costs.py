@@ -0,0 +1,56 @@
+"""The break-even screen must keep exactly the routes that create_opportunity finds profitable"""
+
+import asyncio
+
+import numpy as np
+import pytest
+
+from arbitrage_engine import FlashArbitrageEngine, MarketData
+from backtest import backtest_config
+
+PRICE = 100.0
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = FlashArbitrageEngine(backtest_config(workdir=str(tmp_path)))
+    yield engine
+    engine.trade_journal.stop()
+
+def quotes(engine, spread):
+    """orca asks PRICE, raydium bids PRICE (1 + spread), both at the largest size the engine trades"""
+    universe, volume, now = engine.universe, engine.max_trade_size(), engine.clock.time()
+    pair_id = universe.pair_ids['SOL/USDC']
+    buy = MarketData('orca', 'SOL/USDC', PRICE - 0.01, PRICE, volume, now, 1e6,
+                     market_id=universe.venue_ids['orca'] * universe.n_pairs + pair_id, pair_id=pair_id)
+    sell_price = PRICE * (1 + spread)
+    sell = MarketData('raydium', 'SOL/USDC', sell_price, sell_price + 0.01, volume, now, 1e6,
+                      market_id=universe.venue_ids['raydium'] * universe.n_pairs + pair_id, pair_id=pair_id)
+    return buy, sell
+
+def screened_and_created(engine, spread):
+    buy, sell = quotes(engine, spread)
+    costs = engine.route_costs
+    venues = [np.array([engine.universe.venue_ids[venue]]) for venue in ('orca', 'raydium')]
+    kept = bool(costs.screen(*venues, np.array([PRICE]), np.array([spread]))[0])
+    opportunity = asyncio.run(engine.create_opportunity(buy, sell, sell.bid_price - PRICE, spread, 'buy_a_sell_b'))
+    return kept, opportunity
+
+def test_screen_matches_the_opportunity_math_at_break_even(engine):
+    assert engine.flash_loan_fee > 0
+    break_even = engine.route_costs.route_break_even(PRICE)['orca']['raydium']
+
+    kept, opportunity = screened_and_created(engine, break_even * (1 + 1e-6))
+    assert kept and opportunity is not None and opportunity.net_profit > 0
+
+    kept, opportunity = screened_and_created(engine, break_even * (1 - 1e-6))
+    assert not kept and opportunity is None
+
+def test_loan_fee_raises_every_break_even(engine):
+    with_loan, loan_fee = engine.route_costs.route_break_even(PRICE), engine.flash_loan_fee
+    engine.flash_loan_fee = 0.0
+    without_loan = engine.build_route_costs().route_break_even(PRICE)
+    for buy, row in with_loan.items():
+        for sell, spread in row.items():
+            fee = engine.exchanges[buy]['fee']
+            assert spread == pytest.approx(without_loan[buy][sell] + loan_fee * (1 + fee)
+                                           / (1 - engine.exchanges[sell]['fee']))
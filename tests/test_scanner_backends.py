@@ -0,0 +1,82 @@
+"""Every scanner backend must find exactly what the Python reference finds"""
+
+import pytest
+
+from scanner_backends import (BACKENDS, NativeScanner, NumpyScanner, PythonScanner, SyntheticQuote,
+                              create_backend, generate_synthetic_quotes, run_parity_check)
+
+EXCHANGES = [f"venue{i}" for i in range(4)]
+
+def quote_sets(n_pairs: int, rounds: int = 10):
+    pairs = [f"TKN{i}/SOL" for i in range(n_pairs)]
+    return [generate_synthetic_quotes(EXCHANGES, pairs, seed=seed) for seed in range(rounds)]
+
+@pytest.fixture(scope='module')
+def native():
+    scanner = NativeScanner()
+    if not scanner.is_available():
+        pytest.skip("libarbitrage_engine.so cannot be loaded here")
+    return scanner
+
+@pytest.mark.parametrize('n_pairs', [12, 200])
+@pytest.mark.parametrize('threshold', [0.0002, 0.0005, 0.002])
+def test_backends_match_reference(n_pairs, threshold):
+    backends = {name: create_backend(name) for name in BACKENDS}
+    report = run_parity_check(quote_sets(n_pairs), threshold, backends)
+    for name, result in report.items():
+        if result['available']:
+            assert result['ok'], f"{name} diverges from the reference: {result}"
+    assert report['python']['available'] and report['numpy']['available']
+
+def crossed_book():
+    """Venues crossed against each other both ways, plus one quote crossed against itself"""
+    prices = [(1.02, 1.00), (1.03, 1.01), (1.05, 0.99), (1.00, 1.001)]
+    return [SyntheticQuote(exchange, 'TKN0/SOL', bid, ask, 1000.0, 0.0, 1e5, 0)
+            for exchange, (bid, ask) in zip(EXCHANGES, prices)]
+
+def test_backends_match_reference_on_crossed_book():
+    quotes = crossed_book()
+    reference = PythonScanner().scan(quotes, 0.0005)
+    # One candidate per venue pair, none against the same venue
+    assert len({frozenset(c.key[1:]) for c in reference}) == len(reference)
+    assert all(c.buy is not c.sell for c in reference)
+    assert {c.key for c in NumpyScanner().scan(quotes, 0.0005)} == {c.key for c in reference}
+
+    backends = {name: create_backend(name) for name in BACKENDS}
+    for name, result in run_parity_check([quotes, quotes[::-1]], 0.0005, backends).items():
+        if result['available']:
+            assert result['ok'], f"{name} diverges from the reference on a crossed book: {result}"
+
+def test_native_rescans_from_clean_state(native):
+    quotes = quote_sets(12, rounds=1)[0]
+    first = {c.key for c in native.scan(quotes, 0.0005)}
+    for _ in range(3):
+        assert {c.key for c in native.scan(quotes, 0.0005)} == first
+    # A quote set without dislocations leaves nothing behind from earlier scans
+    calm = [q._replace(bid_price=1.0, ask_price=1.001) for q in quotes]
+    assert native.scan(calm, 0.0005) == []
+
+def test_native_reports_buy_and_sell_legs(native):
+    quotes = quote_sets(12, rounds=1)[0]
+    candidates = native.scan(quotes, 0.0005)
+    assert {c.direction for c in candidates} == {'buy_a_sell_b', 'buy_b_sell_a'}
+    for candidate in candidates:
+        assert candidate.buy.ask_price < candidate.sell.bid_price
+
+def test_native_uses_engine_gas_limit(native):
+    quotes = quote_sets(12, rounds=1)[0]
+    # No size stays under a gas limit below the library's base gas
+    native.configure(max_gas_cost=NativeScanner.LIBRARY_BASE_GAS / 2, max_slippage=0.03)
+    try:
+        assert native.scan(quotes, 0.0005) == []
+    finally:
+        native.configure(max_gas_cost=0.02, max_slippage=0.03)
+    assert native.scan(quotes, 0.0005)
+
+def test_parity_check_flags_divergence():
+    class Lossy(PythonScanner):
+        def scan(self, quotes, min_profit_threshold):
+            return super().scan(quotes, min_profit_threshold)[1:]
+
+    report = run_parity_check(quote_sets(12, rounds=2), 0.0005, {'lossy': Lossy()})
+    assert not report['lossy']['ok'] and report['lossy']['missing'] == 2
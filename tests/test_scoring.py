@@ -0,0 +1,39 @@
+"""Confidence and risk must reflect each market's rolling spread and update rate"""
+
+import numpy as np
+import pytest
+
+from arbitrage_engine import FlashArbitrageEngine, MarketData
+from backtest import backtest_config
+
+def feed_ticks(engine, market_ids, interval, spread, noise, n=60, seed=0):
+    """Fold n quote updates of the given markets into the engine's rolling statistics"""
+    rng = np.random.default_rng(seed)
+    ids = np.array(market_ids)
+    for tick in range(n):
+        mid = 100.0 * np.exp(rng.normal(0.0, noise, len(ids)))
+        engine.market_stats.update_batch(ids, tick * interval, mid * (1 - spread / 2), mid * (1 + spread / 2))
+
+def scores(engine, buy_id, sell_id):
+    now = engine.clock.time()
+    buy = MarketData('orca', 'SOL/USDC', 99.9, 100.0, 5000.0, now, 1e5, market_id=buy_id)
+    sell = MarketData('raydium', 'SOL/USDC', 100.5, 100.6, 5000.0, now, 1e5, market_id=sell_id)
+    return engine.calculate_confidence(buy, sell), engine.calculate_risk_score(buy, sell, 10.0)
+
+def test_noisy_slow_markets_score_below_calm_active_ones(tmp_path):
+    engine = FlashArbitrageEngine(backtest_config(workdir=str(tmp_path)))
+    feed_ticks(engine, [0, 1], interval=0.1, spread=0.0005, noise=0.0)
+    feed_ticks(engine, [2, 3], interval=5.0, spread=0.008, noise=0.004)
+    # Same volatility as the calm markets: only spread and update rate differ
+    feed_ticks(engine, [4, 5], interval=5.0, spread=0.008, noise=0.0)
+
+    calm_confidence, calm_risk = scores(engine, 0, 1)
+    noisy_confidence, noisy_risk = scores(engine, 2, 3)
+    quiet_confidence, quiet_risk = scores(engine, 4, 5)
+    assert noisy_confidence < quiet_confidence < calm_confidence
+    assert noisy_risk > quiet_risk > calm_risk
+
+    # One slow, wide leg is enough to mark the route down
+    mixed_confidence, mixed_risk = scores(engine, 0, 5)
+    assert (mixed_confidence, mixed_risk) == pytest.approx((quiet_confidence, quiet_risk))
+    engine.trade_journal.stop()
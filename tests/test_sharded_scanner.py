@@ -0,0 +1,56 @@
+"""Sharded scanner workers must deliver complete candidate batches"""
+
+import time
+
+import numpy as np
+
+from sharded_scanner import END_OF_BATCH, N_RECORD, OVERSIZED, CandidateRing, ShardedScanner
+
+def test_ring_streams_batch_larger_than_capacity():
+    ring = CandidateRing(capacity=4)
+    try:
+        batch = np.zeros((10, N_RECORD))
+        batch[:-1, 0] = np.arange(9)
+        batch[-1, 0] = END_OF_BATCH
+        received = []
+
+        def consume():
+            received.append(ring.pop_all())
+            return True
+
+        assert ring.push_streamed(batch, consume)
+        received.append(ring.pop_all())
+        assert np.array_equal(np.concatenate(received), batch)
+        assert ring.header[OVERSIZED] == 1
+    finally:
+        ring.close()
+
+def test_ring_stops_streaming_when_consumer_stops():
+    ring = CandidateRing(capacity=4)
+    try:
+        assert not ring.push_streamed(np.zeros((10, N_RECORD)), lambda: False)
+    finally:
+        ring.close()
+
+def test_oversized_shard_batches_reach_the_engine():
+    n_pairs = 50
+    scanner = ShardedScanner(['venue0', 'venue1'], [f"TKN{i}/SOL" for i in range(n_pairs)],
+                             n_workers=1, interval=0.01, ring_capacity=16)
+    scanner.start(0.0005)
+    try:
+        ones, now = np.ones(n_pairs), np.full(n_pairs, time.time())
+        # Every pair is buyable on venue0 and sellable 2% higher on venue1
+        scanner.publish_row('venue0', ones * 0.99, ones, ones * 1000, ones * 1e5, now)
+        scanner.publish_row('venue1', ones * 1.02, ones * 1.03, ones * 1000, ones * 1e5, now)
+
+        deadline = time.time() + 20
+        candidates = scanner.drain()
+        while len(candidates) < n_pairs and time.time() < deadline:
+            time.sleep(0.01)
+            candidates = scanner.drain()
+
+        assert len(candidates) == n_pairs
+        assert sorted(candidates[:, 0].astype(int)) == list(range(n_pairs))
+        assert scanner.get_statistics()['oversized_batches'] > 0
+    finally:
+        scanner.stop()
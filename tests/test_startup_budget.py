@@ -0,0 +1,31 @@
+"""Entry points must import within their cold-start budget and without deferred packages"""
+
+import pytest
+
+from startup_budget import STARTUP_BUDGETS, check_startup_budget
+
+@pytest.mark.parametrize('module', sorted(STARTUP_BUDGETS))
+def test_entry_point_within_startup_budget(module):
+    if module == 'app':
+        pytest.importorskip('flask')
+    ok, (report,) = check_startup_budget([module])
+    assert not report['unexpected_imports'], f"{module} imports deferred packages at startup"
+    assert ok, f"{module} imports in {report['seconds'] * 1000:.0f} ms, budget {report['budget'] * 1000:.0f} ms"
+
+def test_every_engine_applies_its_log_settings(tmp_path):
+    import logging
+
+    import arbitrage_engine
+    from backtest import backtest_config
+
+    root = logging.getLogger()
+    level = root.level
+    try:
+        for log_level, interval in (('WARNING', 2.0), ('DEBUG', 7.0)):
+            engine = arbitrage_engine.FlashArbitrageEngine(backtest_config(
+                {'log_level': log_level, 'log_throttle_interval': interval}, workdir=str(tmp_path)))
+            assert root.level == logging.getLevelName(log_level)
+            assert arbitrage_engine.hot_logger.interval == interval
+            engine.trade_journal.stop()
+    finally:
+        root.setLevel(level)
@@ -0,0 +1,78 @@
+"""The trade journal must keep whole opportunities and page stably while it writes"""
+
+import sqlite3
+import time
+
+from arbitrage_engine import ArbitrageOpportunity
+from trade_journal import TradeJournal
+
+def opportunity(i: int) -> ArbitrageOpportunity:
+    return ArbitrageOpportunity('SOL/USDC', 'orca', 'serum', 100.0, 100.2, 0.2, 0.002, 10.0 + i, 0.0011,
+                                0.01, 1000.0 + i, 0.9, 0.2, id='SOL/USDC:orca:serum', buy_cost=1002.5 + i)
+
+def wait_written(journal: TradeJournal, n: int):
+    deadline = time.time() + 10
+    while journal.written < n and time.time() < deadline:
+        time.sleep(0.01)
+    assert journal.written == n
+
+def test_rows_keep_the_route_id_and_buy_cost(tmp_path):
+    journal = TradeJournal(tmp_path / 'trades.db').start()
+    journal.record(opportunity(0), 2000.0, 2000.05, True)
+    journal.stop()
+
+    (trade,) = journal.query()
+    assert trade['route_id'] == 'SOL/USDC:orca:serum'
+    assert trade['buy_cost'] == 1002.5
+    assert trade['detected_at'] == 1000.0 and trade['id'] == 1
+
+def test_older_journals_gain_the_new_columns(tmp_path):
+    path = tmp_path / 'trades.db'
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE trades (id INTEGER PRIMARY KEY, token_pair, exchange_a, exchange_b, price_a, "
+                 "price_b, price_diff, profit_potential, volume, gas_cost, net_profit, detected_at, confidence, "
+                 "risk_score, started_at, finished_at, latency_ms, success)")
+    conn.execute("INSERT INTO trades (token_pair, exchange_a, exchange_b, started_at, success) "
+                 "VALUES ('SOL/USDC', 'orca', 'serum', 1.0, 1)")
+    conn.commit()
+    conn.close()
+
+    journal = TradeJournal(path).start()
+    journal.record(opportunity(1), 2000.0, 2000.05, False)
+    journal.stop()
+
+    new, old = journal.query()
+    assert (old['route_id'], old['buy_cost'], old['success']) == (None, None, True)
+    assert (new['route_id'], new['buy_cost'], new['success']) == ('SOL/USDC:orca:serum', 1003.5, False)
+
+def test_keyset_pages_stay_contiguous_across_a_flush(tmp_path):
+    journal = TradeJournal(tmp_path / 'trades.db', batch_size=10, flush_interval=0.01).start()
+    try:
+        for i in range(25):
+            journal.record(opportunity(i), 2000.0 + i, 2000.05 + i, i % 2 == 0)
+        wait_written(journal, 25)
+
+        first = journal.query(limit=10)
+        assert [trade['id'] for trade in first] == list(range(25, 15, -1))
+
+        # The writer flushes more batches while the reader is between pages
+        for i in range(25, 40):
+            journal.record(opportunity(i), 2000.0 + i, 2000.05 + i, True)
+        wait_written(journal, 40)
+
+        ids = [trade['id'] for trade in first]
+        before = ids[-1]
+        while True:
+            page = journal.query(before_id=before, limit=10)
+            if not page:
+                break
+            ids += [trade['id'] for trade in page]
+            before = page[-1]['id']
+        assert ids == list(range(25, 0, -1))
+
+        # Filters page the same way, and a fresh first page shows the new rows
+        wins = journal.query(success=True, before_id=16, limit=5)
+        assert [trade['id'] for trade in wins] == [15, 13, 11, 9, 7]
+        assert journal.query(limit=1)[0]['id'] == 40
+    finally:
+        journal.stop()
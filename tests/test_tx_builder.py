@@ -0,0 +1,122 @@
+"""Flash-loan transactions must decode to the route and amounts valued, and land before they count"""
+
+import asyncio
+import math
+import struct
+import time
+
+import pytest
+
+pytest.importorskip('solders')
+pytest.importorskip('solana')
+
+from solders.keypair import Keypair
+from solders.transaction import VersionedTransaction
+
+from arbitrage_engine import FlashArbitrageEngine, MarketData
+from backtest import backtest_config
+from standin_rpc import StandInRPC
+from tx_builder import (COMPUTE_BUDGET_PROGRAM, FLASH_BORROW, FLASH_LOAN_PROGRAM, FLASH_REPAY, SWAP,
+                        TOKEN_PROGRAM, VENUE_PROGRAMS)
+
+def rpc_engine(rpc: StandInRPC, tmp_path) -> FlashArbitrageEngine:
+    return FlashArbitrageEngine(backtest_config({
+        'execution_mode': 'rpc', 'solana_rpc_url': rpc.url, 'private_key': str(Keypair()),
+        'flash_loan_fee': 0.0009, 'min_execution_profit': 0.01,
+    }, workdir=str(tmp_path)))
+
+async def sol_usdc_opportunity(engine: FlashArbitrageEngine):
+    now = engine.clock.time()
+    buy = MarketData('orca', 'SOL/USDC', 99.9, 100.0, 50.0, now, 1e6)
+    sell = MarketData('raydium', 'SOL/USDC', 101.0, 101.1, 50.0, now, 1e6)
+    return await engine.create_opportunity(buy, sell, 1.0, 0.01, 'orca->raydium')
+
+def decode(wire: bytes):
+    transaction = VersionedTransaction.from_bytes(wire)
+    message = transaction.message
+    keys = message.account_keys
+    instructions = [(keys[ix.program_id_index], [keys[i] for i in ix.accounts], bytes(ix.data))
+                    for ix in message.instructions]
+    return transaction, message, instructions
+
+def test_built_transaction_decodes_to_consistent_amounts(tmp_path):
+    async def main():
+        rpc = StandInRPC().start()
+        engine = rpc_engine(rpc, tmp_path)
+        try:
+            await engine.refresh_blockhash()
+            opportunity = await sol_usdc_opportunity(engine)
+            assert opportunity is not None and opportunity.buy_cost > opportunity.volume * opportunity.price_a
+
+            builder = engine.transaction_builder
+            wire = builder.build(opportunity, engine.recent_blockhash)
+            transaction, message, instructions = decode(wire)
+            assert all(transaction.verify_with_results())
+            assert message.recent_blockhash == engine.recent_blockhash
+            assert message.account_keys[0] == builder.payer
+            assert message.is_signer(0) and message.header.num_required_signatures == 1
+
+            (budget, _, _), (lender, borrow_accounts, borrow_data), (buy_venue, buy_accounts, buy_data), \
+                (sell_venue, sell_accounts, sell_data), (repayer, repay_accounts, repay_data) = instructions
+            assert (budget, lender, repayer) == (COMPUTE_BUDGET_PROGRAM, FLASH_LOAN_PROGRAM, FLASH_LOAN_PROGRAM)
+            assert (buy_venue, sell_venue) == (VENUE_PROGRAMS['orca'], VENUE_PROGRAMS['raydium'])
+
+            # Borrow and repay move the wallet's quote account; swaps run quote -> base -> quote
+            quote_account = builder.token_account(builder.mint('USDC'))
+            base_account = builder.token_account(builder.mint('SOL'))
+            assert borrow_accounts == repay_accounts
+            assert borrow_accounts[1:] == [quote_account, builder.payer, TOKEN_PROGRAM]
+            assert buy_accounts == [builder.pool('orca', 'SOL/USDC'), quote_account, base_account,
+                                    builder.payer, TOKEN_PROGRAM]
+            assert sell_accounts == [builder.pool('raydium', 'SOL/USDC'), base_account, quote_account,
+                                     builder.payer, TOKEN_PROGRAM]
+
+            assert (borrow_data[0], repay_data[0], buy_data[0], sell_data[0]) == (FLASH_BORROW, FLASH_REPAY,
+                                                                                SWAP, SWAP)
+            (borrow,), (repay,) = struct.unpack('<Q', borrow_data[1:]), struct.unpack('<Q', repay_data[1:])
+            buy_in, buy_min_out = struct.unpack('<QQ', buy_data[1:])
+            sell_in, sell_min_out = struct.unpack('<QQ', sell_data[1:])
+
+            # USDC and SOL atoms: the loan pays the fill cost, the sell spends only guaranteed base
+            # and must return the loan, its fee and the profit floor
+            assert borrow == buy_in == pytest.approx(opportunity.buy_cost * 1e6, abs=1)
+            assert sell_in == buy_min_out <= opportunity.volume * 1e9
+            assert buy_min_out == int(opportunity.volume * 1e9 * (1 - engine.max_slippage))
+            assert repay == borrow + math.ceil(borrow * 0.0009)
+            assert sell_min_out == repay + 10_000
+
+            assert await engine.solana_client.send_raw_transaction(wire) is not None
+            assert rpc.get_statistics()['accepted'] == 1
+        finally:
+            await engine.solana_client.close()
+            engine.trade_journal.stop()
+            rpc.stop()
+
+    asyncio.run(main())
+
+@pytest.mark.parametrize('confirm', [True, False])
+def test_rpc_trades_count_only_once_confirmed(tmp_path, confirm):
+    async def main():
+        rpc = StandInRPC(blockhash_interval=0.05, max_blockhashes=4, confirm=confirm).start()
+        engine = rpc_engine(rpc, tmp_path)
+        try:
+            await engine.refresh_blockhash()
+            opportunity = await sol_usdc_opportunity(engine)
+            start = time.monotonic()
+            assert await engine.execute_arbitrage(opportunity) is confirm
+            assert rpc.get_statistics()['accepted'] == 1
+            assert time.monotonic() - start < 5
+        finally:
+            await engine.solana_client.close()
+            engine.trade_journal.stop()
+            rpc.stop()
+
+    asyncio.run(main())
+
+def test_rpc_mode_refuses_real_clusters(tmp_path):
+    # The instruction layouts are stand-ins; nothing but the local server may receive them
+    with pytest.raises(ValueError, match='local stand-in RPC'):
+        FlashArbitrageEngine(backtest_config({
+            'execution_mode': 'rpc', 'solana_rpc_url': 'https://api.mainnet-beta.solana.com',
+            'private_key': str(Keypair()),
+        }, workdir=str(tmp_path)))
@@ -0,0 +1,97 @@
+"""Wallets trading off one feed must keep their own journal, sizing, limits and results"""
+
+import asyncio
+
+import pytest
+
+import arbitrage_engine
+from arbitrage_engine import ArbitrageOpportunity
+from backtest import backtest_config
+
+SMALL = {'name': 'small', 'wallet_address': 'SmallWallet1111111111111111111111111111111',
+         'max_position_size': 5.0, 'trading_capital': 20.0, 'max_daily_loss': 2.0}
+
+def opportunity(volume: float = 10.0) -> ArbitrageOpportunity:
+    return ArbitrageOpportunity('SOL/USDC', 'orca', 'serum', 100.0, 101.0, 1.0, 0.01, volume, 0.0011, 5.0,
+                                0.0, 0.9, 0.1, id='SOL/USDC:orca:serum', buy_cost=1001.0)
+
+@pytest.fixture
+def engines(tmp_path, monkeypatch):
+    # create_engine sets the module's globals; put them back afterwards
+    monkeypatch.setattr(arbitrage_engine, 'engine', None)
+    monkeypatch.setattr(arbitrage_engine, 'engines', {})
+    feed = arbitrage_engine.create_engine(backtest_config({'wallet_strategies': [SMALL]}, workdir=str(tmp_path)))
+    yield feed, feed.followers[0]
+    for wallet in [feed] + feed.followers:
+        wallet.trade_journal.stop()
+
+def test_each_wallet_journals_to_its_own_file(engines, tmp_path):
+    feed, small = engines
+    assert feed.trade_journal.path == tmp_path / 'backtest_trades.db'
+    assert small.trade_journal.path == tmp_path / 'backtest_trades-small.db'
+    assert small.checkpointer.path.name == 'engine_checkpoint-small.pkl'
+    assert arbitrage_engine.get_engines() == {'primary': feed, 'small': small}
+    # Market state is shared, never copied
+    assert small.market_data is feed.market_data and small.opportunities is feed.opportunities
+
+def test_smaller_wallets_trade_a_scaled_position(engines):
+    feed, small = engines
+    full = opportunity()
+    assert feed.fit_position(full) is full
+
+    fitted = small.fit_position(full)
+    assert fitted.volume == 5.0
+    assert fitted.buy_cost == pytest.approx(500.5)
+    assert fitted.gas_cost == pytest.approx(small.estimate_gas_cost(5.0))
+    assert fitted.net_profit == pytest.approx((5.0 + 0.0011) / 2 - fitted.gas_cost)
+
+def test_risk_and_results_stay_per_wallet(engines, monkeypatch):
+    feed, small = engines
+    feed.opportunities = [opportunity()]
+
+    async def succeed(opportunity):
+        return True
+
+    async def fail(opportunity):
+        return False
+
+    monkeypatch.setattr(feed, 'execute_arbitrage', succeed)
+    monkeypatch.setattr(small, 'execute_arbitrage', fail)
+
+    async def trade_briefly():
+        for wallet in (feed, small):
+            wallet.trade_journal.start()
+            wallet.running = True
+        loops = asyncio.gather(feed.execute_trades_loop(), small.execute_trades_loop())
+        await asyncio.sleep(0.35)
+        feed.running = small.running = False
+        await loops
+
+    asyncio.run(trade_briefly())
+    for wallet in (feed, small):
+        wallet.trade_journal.stop()
+
+    assert feed.successful_trades > 0 and feed.failed_trades == 0
+    assert small.failed_trades > 0 and small.successful_trades == 0
+    assert feed.total_profit == pytest.approx(5.0 * feed.successful_trades)
+    assert small.total_profit == 0.0
+
+    assert feed.risk_limits is not small.risk_limits
+    assert feed.risk_limits.trades == feed.successful_trades
+    assert small.risk_limits.trades == small.failed_trades
+    assert small.risk_limits.pnl == pytest.approx(-small.estimate_gas_cost(5.0) * small.failed_trades)
+    assert (feed.risk_limits.capital, small.risk_limits.capital) == (100.0, 20.0)
+
+    assert {trade['volume'] for trade in feed.trade_journal.query()} == {10.0}
+    assert {trade['volume'] for trade in small.trade_journal.query()} == {5.0}
+
+def test_wallets_endpoint_reports_each_wallet(engines):
+    from app import app
+
+    feed, small = engines
+    small.successful_trades = 3
+    wallets = app.test_client().get('/api/wallets').get_json()['wallets']
+    assert [w['name'] for w in wallets] == ['primary', 'small']
+    assert wallets[1]['feed'] == 'primary' and wallets[1]['successful_trades'] == 3
+    assert wallets[0]['successful_trades'] == 0
+    assert wallets[1]['settings']['max_position_size'] == 5.0
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Token universe for the Flash Arbitrage Engine
+Pairs, venue listings, decimals and reference prices loaded once at startup
+into interned integer ids, with a precomputed pair-to-venue listing index
+"""
+
+import json
+import sys
+from pathlib import Path
+from typing import Dict, List, Sequence
+
+import numpy as np
+
+# Default universe data file shipped with the bot
+UNIVERSE_FILE = Path(__file__).parent / 'data' / 'token_universe.json'
+
+# Built-in fallback when no data file is available
+DEFAULT_REFERENCE_PRICES = {
+    'SOL/USDC': 100.0,
+    'SOL/USDT': 100.0,
+    'RAY/SOL': 0.5,
+    'SRM/SOL': 0.1,
+    'ORCA/SOL': 0.3,
+    'MNGO/SOL': 0.05,
+    'STEP/SOL': 0.02,
+    'COPE/SOL': 0.01,
+    'MEDIA/SOL': 0.15,
+    'ROPE/SOL': 0.001,
+    'TULIP/SOL': 0.08,
+    'SLIM/SOL': 0.003
+}
+
+class TokenUniverse:
+    """Interned pair and venue ids plus a (venue x pair) listing index"""
+
+    def __init__(self, venues: Sequence[str], pairs: Sequence[Dict]):
+        self.venue_names = [sys.intern(v) for v in venues]
+        self.venue_ids = {name: i for i, name in enumerate(self.venue_names)}
+
+        self.pair_names = []
+        self.pair_ids = {}
+        n_pairs = len(pairs)
+        self.reference_prices = np.ones(n_pairs)
+        self.base_decimals = np.zeros(n_pairs, dtype=np.int16)
+        self.quote_decimals = np.zeros(n_pairs, dtype=np.int16)
+        self.listings = np.zeros((len(self.venue_names), n_pairs), dtype=bool)
+
+        for pair_id, entry in enumerate(pairs):
+            name = sys.intern(entry['pair'])
+            if name in self.pair_ids:
+                raise ValueError(f"Duplicate pair in token universe: {name}")
+            self.pair_names.append(name)
+            self.pair_ids[name] = pair_id
+            self.reference_prices[pair_id] = entry.get('reference_price', 1.0)
+            self.base_decimals[pair_id] = entry.get('base_decimals', 9)
+            self.quote_decimals[pair_id] = entry.get('quote_decimals', 9)
+
+            for venue in entry.get('venues', self.venue_names):
+                if venue in self.venue_ids:
+                    self.listings[self.venue_ids[venue], pair_id] = True
+
+        self._build_index()
+
+    def _build_index(self):
+        """Precompute everything the per-tick paths need"""
+        self.venue_counts = self.listings.sum(axis=0)
+        self.multi_venue = self.venue_counts >= 2
+        # Pair ids worth scanning: listed on this venue and at least one other
+        self.venue_scan_pairs = [
+            np.nonzero(self.listings[v] & self.multi_venue)[0]
+            for v in range(len(self.venue_names))
+        ]
+        # Market keys and pair names aligned with venue_scan_pairs
+        self.venue_market_keys = [
+            [f"{venue}:{self.pair_names[p]}" for p in pair_ids]
+            for venue, pair_ids in zip(self.venue_names, self.venue_scan_pairs)
+        ]
+        self.venue_market_ids = [
+            v * len(self.pair_names) + pair_ids for v, pair_ids in enumerate(self.venue_scan_pairs)
+        ]
+        self.venue_pair_names = [
+            [self.pair_names[p] for p in pair_ids] for pair_ids in self.venue_scan_pairs
+        ]
+        self.reference_price_by_name = dict(zip(self.pair_names, self.reference_prices.tolist()))
+
+    @property
+    def n_pairs(self) -> int:
+        return len(self.pair_names)
+
+    def venues_for(self, pair: str) -> List[str]:
+        """Venues that list a pair"""
+        pair_id = self.pair_ids[pair]
+        return [self.venue_names[v] for v in np.nonzero(self.listings[:, pair_id])[0]]
+
+    def reference_price(self, pair: str, default: float = 1.0) -> float:
+        return self.reference_price_by_name.get(pair, default)
+
+    @classmethod
+    def load(cls, path: Path = UNIVERSE_FILE, venues: Sequence[str] = None) -> 'TokenUniverse':
+        """Load a universe from JSON: {"venues": [...], "pairs": [{"pair", "venues", ...}]}
+
+        Passing venues fixes the venue ids to the exchanges the engine runs;
+        listings on any other venue are ignored.
+        """
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        return cls(venues if venues is not None else data['venues'], data['pairs'])
+
+    @classmethod
+    def default(cls, venues: Sequence[str]) -> 'TokenUniverse':
+        """The built-in 12-pair universe listed on every venue"""
+        return cls(venues, [
+            {'pair': pair, 'reference_price': price} for pair, price in DEFAULT_REFERENCE_PRICES.items()
+        ])
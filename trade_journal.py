@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+Trade journal for the Flash Arbitrage Engine
+Append-only SQLite (WAL) record of every execution attempt, written in
+batches by a background thread so the event loop never waits on disk
+"""
+
+import logging
+import queue
+import sqlite3
+import threading
+from pathlib import Path
+from operator import attrgetter
+from typing import Dict, List
+
+logger = logging.getLogger(__name__)
+
+JOURNAL_FILE = Path(__file__).parent / 'trades.db'
+
+# ArbitrageOpportunity fields journaled per attempt; its timestamp is stored as
+# detected_at and its id as route_id, next to the row's own id
+OPPORTUNITY_FIELDS = (
+    'token_pair', 'exchange_a', 'exchange_b', 'price_a', 'price_b', 'price_diff',
+    'profit_potential', 'volume', 'gas_cost', 'net_profit', 'timestamp',
+    'confidence', 'risk_score', 'id', 'buy_cost',
+)
+RENAMED_FIELDS = {'timestamp': 'detected_at', 'id': 'route_id'}
+OPPORTUNITY_COLUMNS = tuple(RENAMED_FIELDS.get(name, name) for name in OPPORTUNITY_FIELDS)
+ATTEMPT_COLUMNS = ('started_at', 'finished_at', 'latency_ms', 'success')
+COLUMNS = OPPORTUNITY_COLUMNS + ATTEMPT_COLUMNS
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS trades (
+    id INTEGER PRIMARY KEY,
+    {', '.join(COLUMNS)}
+);
+CREATE INDEX IF NOT EXISTS trades_time ON trades (started_at);
+CREATE INDEX IF NOT EXISTS trades_pair ON trades (token_pair, id);
+CREATE INDEX IF NOT EXISTS trades_buy_venue ON trades (exchange_a, id);
+CREATE INDEX IF NOT EXISTS trades_sell_venue ON trades (exchange_b, id);
+"""
+
+_opportunity_values = attrgetter(*OPPORTUNITY_FIELDS)
+
+class TradeJournal:
+    """Queue-fed SQLite journal of execution attempts
+
+    record() only appends a tuple to an in-memory queue. A writer thread
+    drains whatever has accumulated, up to batch_size rows, and inserts it
+    in a single transaction. Reads use their own connections, which WAL
+    lets run alongside the writer.
+    """
+
+    def __init__(self, path: Path = JOURNAL_FILE, batch_size: int = 500,
+                 flush_interval: float = 0.5, max_pending: int = 100000):
+        self.path = Path(path)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._writer = None
+        self._stop_event = threading.Event()
+        self.written = 0
+        self.dropped = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=5.0)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        return conn
+
+    def record(self, opportunity, started_at: float, finished_at: float, success: bool):
+        """Queue one execution attempt; never blocks"""
+        row = _opportunity_values(opportunity) + (
+            started_at, finished_at, (finished_at - started_at) * 1000.0, int(success)
+        )
+        try:
+            self._queue.put_nowait(row)
+        except queue.Full:
+            self.dropped += 1
+
+    def start(self):
+        """Create the schema and start the writer thread"""
+        if self._writer is not None:
+            return self
+
+        conn = self._connect()
+        conn.executescript(SCHEMA)
+        self._migrate(conn)
+        conn.close()
+
+        self._stop_event.clear()
+        self._writer = threading.Thread(target=self._write_loop, name='trade-journal', daemon=True)
+        self._writer.start()
+        return self
+
+    def _migrate(self, conn: sqlite3.Connection):
+        """Add columns journals written by earlier versions lack; their old rows read NULL"""
+        existing = {row[1] for row in conn.execute('PRAGMA table_info(trades)')}
+        with conn:
+            for column in COLUMNS:
+                if column not in existing:
+                    conn.execute(f"ALTER TABLE trades ADD COLUMN {column}")
+                    logger.info(f"Added column {column} to trade journal {self.path}")
+
+    def _write_loop(self):
+        conn = self._connect()
+        insert = f"INSERT INTO trades ({', '.join(COLUMNS)}) VALUES ({', '.join('?' * len(COLUMNS))})"
+        try:
+            while not (self._stop_event.is_set() and self._queue.empty()):
+                try:
+                    batch = [self._queue.get(timeout=self.flush_interval)]
+                except queue.Empty:
+                    continue
+                while len(batch) < self.batch_size:
+                    try:
+                        batch.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+                # None is only a wake-up from stop()
+                batch = [row for row in batch if row is not None]
+                if not batch:
+                    continue
+                try:
+                    with conn:
+                        conn.executemany(insert, batch)
+                    self.written += len(batch)
+                except sqlite3.Error as e:
+                    logger.error(f"Could not write {len(batch)} trades to {self.path}: {e}")
+        finally:
+            conn.close()
+
+    def stop(self):
+        """Flush pending rows and stop the writer"""
+        if self._writer is not None:
+            self._stop_event.set()
+            try:
+                self._queue.put_nowait(None)
+            except queue.Full:
+                pass  # The writer is busy draining and will see the event
+            self._writer.join(timeout=self.flush_interval * 4 + 5)
+            self._writer = None
+
+    def query(self, pair: str = None, venue: str = None, success: bool = None,
+              since: float = None, until: float = None, before_id: int = None,
+              limit: int = 50) -> List[Dict]:
+        """Newest-first page of attempts matching every given filter
+
+        Pages are keyset-paginated: pass the smallest id of one page as
+        before_id to get the next, which stays cheap at any depth.
+        """
+        if not self.path.exists():
+            return []
+
+        clauses, params = [], []
+        if pair is not None:
+            clauses.append('token_pair = ?')
+            params.append(pair)
+        if venue is not None:
+            clauses.append('(exchange_a = ? OR exchange_b = ?)')
+            params += [venue, venue]
+        if success is not None:
+            clauses.append('success = ?')
+            params.append(int(success))
+        if since is not None:
+            clauses.append('started_at >= ?')
+            params.append(since)
+        if until is not None:
+            clauses.append('started_at < ?')
+            params.append(until)
+        if before_id is not None:
+            clauses.append('id < ?')
+            params.append(before_id)
+
+        sql = f"SELECT id, {', '.join(COLUMNS)} FROM trades"
+        if clauses:
+            sql += ' WHERE ' + ' AND '.join(clauses)
+        sql += ' ORDER BY id DESC LIMIT ?'
+        params.append(limit)
+
+        conn = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True, timeout=5.0)
+        try:
+            rows = conn.execute(sql, params).fetchall()
+        except sqlite3.OperationalError as e:
+            # The writer has not created the table yet
+            logger.debug(f"Trade journal query failed: {e}")
+            rows = []
+        finally:
+            conn.close()
+
+        trades = []
+        for row in rows:
+            trade = dict(zip(('id',) + COLUMNS, row))
+            trade['success'] = bool(trade['success'])
+            trades.append(trade)
+        return trades
+
+    def get_statistics(self) -> Dict:
+        return {
+            'path': str(self.path),
+            'written': self.written,
+            'pending': self._queue.qsize(),
+            'dropped': self.dropped,
+        }
+
+if __name__ == "__main__":
+    import tempfile
+    import time
+    from arbitrage_engine import ArbitrageOpportunity
+
+    with tempfile.TemporaryDirectory() as tmp:
+        journal = TradeJournal(Path(tmp) / 'trades.db').start()
+        start = time.perf_counter()
+        for i in range(10000):
+            opportunity = ArbitrageOpportunity(
+                'SOL/USDC', 'orca', 'serum', 100.0, 100.2, 0.2, 0.002,
+                10.0, 0.0011, 0.01, time.time(), 0.9, 0.2
+            )
+            journal.record(opportunity, time.time(), time.time() + 0.05, i % 3 != 0)
+        enqueue = time.perf_counter() - start
+        journal.stop()
+        print(f"Queued 10000 attempts in {enqueue * 1000:.1f} ms, wrote {journal.written}")
+        page = journal.query(venue='serum', success=True, limit=3)
+        print([trade['id'] for trade in page])
+        print([trade['id'] for trade in journal.query(venue='serum', success=True,
+                                                      before_id=page[-1]['id'], limit=3)])